@@ -1,3 +1,6 @@
+from .relay_bank import RelayBank, SimulatedRelayBackend, get_default_relay_bank
 from .relay_actuator import RelayActuator
+from .command_queue import ActuatorCommandQueue
 
-__all__ = ['RelayActuator']
+__all__ = ['RelayActuator', 'RelayBank', 'SimulatedRelayBackend', 'get_default_relay_bank',
+           'ActuatorCommandQueue']
@@ -0,0 +1,173 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from config.config import Config
+
+
+class ActuatorCommandQueue:
+    """Serializes relay commands from every thread through one worker.
+
+    - A command that does not change a channel's target state is dropped
+      (voice + gesture + API asking for the same thing hit the relays once).
+    - Switching a channel ON is held until ACTUATOR_MIN_SWITCH_INTERVAL_SEC
+      after its previous switch (minimum off-time before a restart); a newer
+      command for a held channel replaces it. OFF is never held, and
+      force=True (emergency stop) skips the hold for ON too.
+    - Due commands are applied as one bank write, then each is verified by
+      reading the bank's backend back after ACTUATOR_VERIFY_DELAY_SEC, with
+      up to ACTUATOR_VERIFY_RETRIES re-writes. Verification is scheduled, not
+      waited on, so other channels keep moving meanwhile.
+    """
+
+    def __init__(self, bank, min_switch_interval=None, verify_delay=None, max_retries=None):
+        self.bank = bank
+        self.min_switch_interval = (Config.ACTUATOR_MIN_SWITCH_INTERVAL_SEC if min_switch_interval is None
+                                    else min_switch_interval)
+        self.verify_delay = Config.ACTUATOR_VERIFY_DELAY_SEC if verify_delay is None else verify_delay
+        self.max_retries = Config.ACTUATOR_VERIFY_RETRIES if max_retries is None else max_retries
+
+        self._cond = threading.Condition()
+        self._heap = []                 # (due, seq, kind, command)
+        self._seq = itertools.count()
+        self._target = {}               # channel -> last accepted state
+        self._held = {}                 # channel -> command waiting for its switch interval
+        self._last_switch = {}          # channel -> monotonic time of last applied change
+        self.channel_stats = {}
+        self.running = True
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def _stats(self, channel):
+        stats = self.channel_stats.get(channel)
+        if stats is None:
+            stats = self.channel_stats[channel] = {
+                'submitted': 0, 'applied': 0, 'verified': 0, 'retries': 0, 'failed': 0,
+                'dropped': {'no_change': 0, 'superseded': 0}, 'latency': deque(maxlen=200)
+            }
+        return stats
+
+    def target(self, channel):
+        """State the channel is heading to (what callers should treat as current)"""
+        with self._cond:
+            if channel in self._target:
+                return self._target[channel]
+        return self.bank.is_on(channel)
+
+    def submit(self, channel, on, source=None, force=False):
+        """Queue a state change; returns the command dict ('status' is queued/held/dropped)"""
+        self.bank.check_channel(channel)
+        now = time.monotonic()
+        command = {'channel': channel, 'on': bool(on), 'source': source, 'submitted_at': now,
+                   'retries': 0, 'status': 'queued'}
+        with self._cond:
+            stats = self._stats(channel)
+            stats['submitted'] += 1
+            held = self._held.pop(channel, None)
+            if held:
+                # Never applied: the channel is still where the bank has it
+                held['status'] = 'superseded'
+                stats['dropped']['superseded'] += 1
+                self._target[channel] = self.bank.is_on(channel)
+            if command['on'] == self._target.get(channel, self.bank.is_on(channel)) and not force:
+                command['status'] = 'dropped'
+                stats['dropped']['no_change'] += 1
+                return command
+            self._target[channel] = command['on']
+            due = now
+            if command['on'] and not force:
+                due = max(now, self._last_switch.get(channel, float('-inf')) + self.min_switch_interval)
+            if due > now:
+                command['status'] = 'held'
+                self._held[channel] = command
+            heapq.heappush(self._heap, (due, next(self._seq), 'apply', command))
+            self._cond.notify()
+        return command
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self.running and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                if not self.running:
+                    return
+                now = time.monotonic()
+                applies, verifies = [], []
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, kind, command = heapq.heappop(self._heap)
+                    if command['status'] == 'superseded':
+                        continue
+                    (applies if kind == 'apply' else verifies).append(command)
+                for command in applies:
+                    if self._held.get(command['channel']) is command:
+                        del self._held[command['channel']]
+            try:
+                if applies:
+                    self._apply(applies)
+                for command in verifies:
+                    self._verify(command)
+            except Exception as e:
+                print(f"Actuator command queue error: {e}")
+
+    def _apply(self, commands):
+        """Write all due changes as one bank update and schedule their readback"""
+        states = {command['channel']: command['on'] for command in commands}
+        self.bank.set_many(states, immediate=True)
+        now = time.monotonic()
+        with self._cond:
+            for command in commands:
+                command['status'] = 'applied'
+                command['applied_at'] = now
+                self._last_switch[command['channel']] = now
+                self._stats(command['channel'])['applied'] += 1
+                heapq.heappush(self._heap, (now + self.verify_delay, next(self._seq), 'verify', command))
+            self._cond.notify()
+
+    def _verify(self, command):
+        channel = command['channel']
+        actual = bool(self.bank.backend.read() >> channel & 1)
+        with self._cond:
+            stats = self._stats(channel)
+            if actual == command['on']:
+                command['status'] = 'verified'
+                stats['verified'] += 1
+                stats['latency'].append(time.monotonic() - command['submitted_at'])
+                return
+            if self._target.get(channel) != command['on']:
+                # A later command owns this channel now
+                command['status'] = 'superseded'
+                return
+            if command['retries'] >= self.max_retries:
+                command['status'] = 'failed'
+                stats['failed'] += 1
+                print(f"Relay channel {channel} did not switch {'ON' if command['on'] else 'OFF'} "
+                      f"after {command['retries']} retries")
+                return
+            command['retries'] += 1
+            stats['retries'] += 1
+        self.bank.resync()
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + self.verify_delay, next(self._seq), 'verify', command))
+            self._cond.notify()
+
+    def get_stats(self):
+        """Per-channel submitted/applied/verified counts, drops by reason and submit-to-verified latency"""
+        report = {}
+        with self._cond:
+            for channel, stats in self.channel_stats.items():
+                latency = sorted(stats['latency'])
+                entry = {key: value for key, value in stats.items() if key not in ('latency', 'dropped')}
+                entry['dropped'] = dict(stats['dropped'])
+                entry['held'] = channel in self._held
+                if latency:
+                    entry['latency_mean_ms'] = round(sum(latency) / len(latency) * 1000, 1)
+                    entry['latency_p95_ms'] = round(latency[min(len(latency) - 1, int(len(latency) * 0.95))] * 1000, 1)
+                report[channel] = entry
+        return report
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        self._worker.join(timeout=1.0)
@@ -1,20 +1,57 @@
+from actuator.relay_bank import get_default_relay_bank
+
+
 class RelayActuator:
-    def __init__(self):
-        self.state = False
-        print("Relay actuator initialized (simulated)")
+    """Single-relay API as a view onto one channel of a RelayBank.
+
+    With a command_queue, switching goes through ActuatorCommandQueue
+    (deduplicated, rate-limited, verified) and turn_on returns False when the
+    command was dropped as a no-op. turn_off always returns True: a relay
+    that is already off is stopped, which is what the caller asked for.
+    """
+
+    def __init__(self, bank=None, channel=0, name=None, command_queue=None):
+        self.bank = bank or get_default_relay_bank()
+        self.channel = channel
+        self.name = name or f"channel {channel}"
+        self.command_queue = command_queue
+        self.bank.check_channel(channel)
+        print(f"Relay actuator initialized ({self.name})")
+
+    @property
+    def state(self):
+        if self.command_queue:
+            return self.command_queue.target(self.channel)
+        return self.bank.is_on(self.channel)
+
+    def _switch(self, on, source=None, force=False):
+        if self.command_queue:
+            command = self.command_queue.submit(self.channel, on, source=source, force=force)
+            return command['status'] != 'dropped'
+        self.bank.set(self.channel, on, immediate=force)
+        return True
+
+    def turn_on(self, source=None):
+        if not self._switch(True, source):
+            return False
+        print(f"Relay actuator turned ON ({self.name})")
+        return True
 
-    def turn_on(self):
-        self.state = True
-        print("Relay actuator turned ON (simulated)")
+    def turn_off(self, source=None):
+        if not self._switch(False, source):
+            print(f"Relay actuator already OFF ({self.name})")
+            return True
+        print(f"Relay actuator turned OFF ({self.name})")
         return True
 
-    def turn_off(self):
-        self.state = False
-        print("Relay actuator turned OFF (simulated)")
+    def emergency_stop(self):
+        """Switch this channel off without waiting for debounce or switching limits"""
+        self._switch(False, 'emergency', force=True)
+        print(f"Relay actuator EMERGENCY OFF ({self.name})")
         return True
 
     def is_on(self):
         return self.state
 
     def get_status(self):
-        return "ON" if self.state else "OFF"
\ No newline at end of file
+        return "ON" if self.state else "OFF"
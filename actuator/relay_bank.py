@@ -0,0 +1,201 @@
+import threading
+import time
+from config.config import Config
+from logging_module.state_journal import get_state_journal
+
+
+class SimulatedRelayBackend:
+    """Stands in for a GPIO expander / serial relay board; records every mask write"""
+
+    def __init__(self, channels):
+        self.channels = channels
+        self.mask = 0
+        self.writes = []
+
+    def write(self, mask):
+        self.mask = mask
+        self.writes.append((time.monotonic(), mask))
+        if len(self.writes) > 1000:
+            del self.writes[:500]
+
+    def read(self):
+        return self.mask
+
+
+class RelayBank:
+    """Thread-safe bank of 8-64 relay channels driven by whole-bank bitmask writes.
+
+    Channel changes only update the desired mask; a flusher thread writes
+    the mask `debounce_sec` after the first pending change, so a burst of
+    changes from voice, gesture, API and timer threads becomes one write and
+    an on/off flap inside the window never reaches the relays. Safety paths
+    (all_off, immediate=True) write straight through.
+
+    A backend is anything with write(mask) and read(); the default is
+    SimulatedRelayBackend. With a StateJournal every mask written to the
+    backend is journaled under `name`, and a new bank restores the last
+    journaled mask before accepting commands. Channels are only restored ON
+    while a safety timer deadline was journaled with them; otherwise nothing
+    would ever stop them, so the bank boots OFF.
+    """
+
+    def __init__(self, channels=None, backend=None, debounce_sec=None, journal=None, name="default"):
+        self.channels = channels or Config.RELAY_CHANNELS
+        if not 1 <= self.channels <= 64:
+            raise ValueError(f"Relay bank supports 1-64 channels, got {self.channels}")
+        self.backend = backend or SimulatedRelayBackend(self.channels)
+        self.debounce_sec = Config.RELAY_DEBOUNCE_SEC if debounce_sec is None else debounce_sec
+        self.journal = journal
+        self.name = name
+        self._cond = threading.Condition()
+        self._applied = self.backend.read()
+        self._desired = self._applied
+        if journal:
+            self._restore()
+        self._dirty_since = None
+        self._closed = False
+        self.stats = {'requests': 0, 'writes': 0}
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flusher.start()
+        print(f"Relay bank initialized: {self.channels} channels, {self.debounce_sec * 1000:.0f} ms debounce")
+
+    def _restore(self):
+        mask = self.journal.get('relays').get(self.name)
+        if mask is None:
+            return
+        mask &= (1 << self.channels) - 1
+        if mask and not any(deadline is not None for deadline in self.journal.get('timers').values()):
+            print(f"Relay bank '{self.name}': journaled mask {mask:#x} has no safety timer, booting OFF")
+            mask = 0
+            try:
+                self.journal.append('relay', {'bank': self.name, 'mask': mask})
+            except Exception as e:
+                print(f"Relay bank '{self.name}' journal write failed: {e}")
+        if mask != self._applied:
+            self.backend.write(mask)
+            self._applied = self._desired = mask
+        print(f"Relay bank '{self.name}' restored from journal: mask {mask:#x}")
+
+    def check_channel(self, channel):
+        if not 0 <= channel < self.channels:
+            raise ValueError(f"Relay channel {channel} out of range (0-{self.channels - 1})")
+
+    def _request_locked(self, mask, immediate):
+        self.stats['requests'] += 1
+        self._desired = mask
+        if immediate or self.debounce_sec <= 0:
+            self._write_locked()
+        elif self._dirty_since is None:
+            self._dirty_since = time.monotonic()
+            self._cond.notify()
+
+    def _write_locked(self):
+        self._dirty_since = None
+        if self._desired == self._applied:
+            return
+        self.backend.write(self._desired)
+        self._applied = self._desired
+        self.stats['writes'] += 1
+        if self.journal:
+            try:
+                self.journal.append('relay', {'bank': self.name, 'mask': self._applied})
+            except Exception as e:
+                print(f"Relay bank '{self.name}' journal write failed: {e}")
+
+    def _flush_loop(self):
+        with self._cond:
+            while not self._closed:
+                if self._dirty_since is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._dirty_since + self.debounce_sec - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self._write_locked()
+
+    def set(self, channel, on, immediate=False):
+        self.check_channel(channel)
+        bit = 1 << channel
+        with self._cond:
+            self._request_locked(self._desired | bit if on else self._desired & ~bit, immediate)
+        return True
+
+    def set_many(self, states, immediate=False):
+        """Apply {channel: bool} as one change"""
+        with self._cond:
+            mask = self._desired
+            for channel, on in states.items():
+                self.check_channel(channel)
+                mask = mask | (1 << channel) if on else mask & ~(1 << channel)
+            self._request_locked(mask, immediate)
+        return True
+
+    def set_mask(self, mask, immediate=False):
+        with self._cond:
+            self._request_locked(mask & ((1 << self.channels) - 1), immediate)
+        return True
+
+    def all_off(self):
+        """Every channel off, written immediately (emergency stop)"""
+        with self._cond:
+            self._request_locked(0, immediate=True)
+        return True
+
+    def flush(self):
+        """Write any pending change now"""
+        with self._cond:
+            if self._dirty_since is not None:
+                self._write_locked()
+
+    def resync(self):
+        """Re-read the hardware and rewrite the desired mask if it differs (after a failed readback)"""
+        with self._cond:
+            self._applied = self.backend.read()
+            self._write_locked()
+
+    def is_on(self, channel):
+        """Commanded state (may not be written to the relays yet)"""
+        self.check_channel(channel)
+        return bool(self._desired >> channel & 1)
+
+    def get_mask(self):
+        return self._desired
+
+    def get_applied_mask(self):
+        return self._applied
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+            stats['coalesced'] = stats['requests'] - stats['writes']
+            stats['desired_mask'] = self._desired
+            stats['applied_mask'] = self._applied
+            stats['pending'] = self._dirty_since is not None
+        return stats
+
+    def channel(self, index, name=None, command_queue=None):
+        """RelayActuator view onto one channel"""
+        from actuator.relay_actuator import RelayActuator
+        return RelayActuator(bank=self, channel=index, name=name, command_queue=command_queue)
+
+    def close(self):
+        with self._cond:
+            if self._dirty_since is not None:
+                self._write_locked()
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join(timeout=1.0)
+
+
+_default_bank = None
+_default_bank_lock = threading.Lock()
+
+
+def get_default_relay_bank():
+    """Process-wide bank shared by RelayActuator() instances created without one"""
+    global _default_bank
+    with _default_bank_lock:
+        if _default_bank is None:
+            _default_bank = RelayBank(journal=get_state_journal())
+        return _default_bank
@@ -18,10 +18,84 @@ class Config:
     WIND_SPEED_MAX_MPS = 8
     MIN_IRRIGATION_INTERVAL = 60 * 60
     RAIN_FORECAST_SKIP_HOURS = 6  # Skip auto irrigation if rain is predicted in next 6 hours
+    # Command log size, and how many / how old system status snapshots can be
+    # referenced by logged commands (at most one sensor + weather read per
+    # STATUS_SNAPSHOT_MAX_AGE_SEC on the command path)
+    COMMAND_HISTORY_SIZE = 100
+    STATUS_SNAPSHOT_HISTORY = 50
+    STATUS_SNAPSHOT_MAX_AGE_SEC = 30
+    # Fusion engine: stream priorities (higher wins conflicts inside the
+    # window), per-stream confidence and how often auto logic is evaluated
+    FUSION_WINDOW_SEC = 1.5
+    FUSION_PRIORITIES = {'voice': 3, 'api': 3, 'gesture': 2, 'smart_logic': 1}
+    FUSION_CONFIDENCE = {'voice': 0.9, 'api': 1.0, 'gesture': 0.7, 'smart_logic': 0.8}
+    FUSION_AUTO_INTERVAL_SEC = 60
     LOG_LEVEL = "INFO"
     LOG_FILE = "logs/system.log"
     VOICE_SAMPLE_RATE = 16000
     VOICE_CHUNK_SIZE = 4000
+    # Frames held by an audio source's ring buffer before the oldest is dropped
+    AUDIO_RING_CAPACITY = 32
+    # Relay bank: channel count (8-64) and how long rapid changes are
+    # coalesced before one bitmask write
+    RELAY_CHANNELS = 8
+    RELAY_DEBOUNCE_SEC = 0.05
+    # Actuator command queue: minimum time from a channel's last switch before
+    # it may switch ON again (pump protection; OFF is always immediate) and
+    # relay readback verification
+    ACTUATOR_MIN_SWITCH_INTERVAL_SEC = 10
+    ACTUATOR_VERIFY_DELAY_SEC = 0.1
+    ACTUATOR_VERIFY_RETRIES = 3
+    # Durable state journal (relay masks, controller flags, safety timer
+    # deadlines, irrigation events) compacted into a snapshot every
+    # STATE_JOURNAL_COMPACT_EVERY entries, kept under the project root
+    # whatever the working directory
+    STATE_JOURNAL_ENABLED = True
+    STATE_JOURNAL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'state'))
+    STATE_JOURNAL_COMPACT_EVERY = 200
+    STATE_JOURNAL_FSYNC = True
+    STATE_JOURNAL_EVENT_HISTORY = 100
+    # Soil probe ADC: every read is one bulk transaction of SOIL_OVERSAMPLE
+    # samples per channel, median + EMA filtered and calibrated per probe.
+    # SOIL_CALIBRATION: None (backend/nominal curve) or a list of
+    # {'raw': [counts...], 'moisture': [%...]} curves, one per probe
+    SOIL_CHANNELS = 4
+    SOIL_ADC_BITS = 12
+    SOIL_OVERSAMPLE = 16
+    SOIL_MEDIAN_WINDOW = 5
+    SOIL_EMA_ALPHA = 0.3
+    SOIL_READ_INTERVAL_SEC = 1.0
+    SOIL_CALIBRATION = None
+    # Field sensor collection (iot/async_collector.py): sensor specs (None =
+    # simulated field of IOT_SIMULATED_SOIL_SENSORS probes), poll interval,
+    # per-sensor transaction timeout, staleness age and in-flight
+    # transactions per bus
+    IOT_SENSORS = None
+    IOT_SIMULATED_SOIL_SENSORS = 4
+    IOT_POLL_INTERVAL_SEC = 10
+    IOT_SENSOR_TIMEOUT_SEC = 2.0
+    IOT_STALE_AFTER_SEC = 60
+    IOT_BUS_CONCURRENCY = {"default": 8, "http": 4}
+    # Field moisture map from probes with x/y coordinates (metres): 'idw' or
+    # 'kriging' onto a FIELD_GRID_RESOLUTION_M raster, averaged per zone
+    # {name: (x0, y0, x1, y1)} (None = one 'default' zone over the field)
+    FIELD_WIDTH_M = 100
+    FIELD_HEIGHT_M = 100
+    FIELD_GRID_RESOLUTION_M = 2
+    FIELD_MAP_METHOD = "idw"
+    FIELD_IDW_POWER = 2
+    FIELD_KRIGING_VARIOGRAM = {"model": "exponential", "sill": 100.0, "range": 40.0, "nugget": 1.0}
+    FIELD_ZONES = None
+    FIELD_MAP_WEIGHT_CACHE = 8
+
+    # Multi-stream recognition service: one entry per microphone/stream.
+    # "source" is an audio source spec ('mic', 'mic:<device index>', 'stdin',
+    # 'synthetic' or a .wav path); "weight" is its relative decoding load
+    VOICE_STREAMS = [
+        {"stream_id": "mic0", "zone": "default", "source": "mic", "weight": 1.0},
+    ]
+    RECOGNITION_WORKERS = 2
+    RECOGNITION_STATS_INTERVAL_SEC = 5
 
     # Absolute model paths for each language
     BASE_MODEL_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'models'))
@@ -33,6 +107,11 @@ class Config:
     # Default model path (Hindi)
     VOICE_MODEL_PATH = VOICE_MODEL_PATHS["hi"]
 
+    # Shared Vosk model registry: languages to load at startup, and how long an
+    # unreferenced model stays cached before evict_unused() frees it
+    VOICE_MODEL_PRELOAD = []
+    VOICE_MODEL_IDLE_EVICT_SEC = 300
+
     # Supported languages (short codes)
     SUPPORTED_LANGUAGES = ["hi", "gu", "te"]
 
@@ -62,4 +141,109 @@ class Config:
             "start": ["నీరు ప్రారంభించు", "నీరు మొదలు పెట్టు"],
             "stop": ["నీరు ఆపు", "నీరు నిలిపివేయి"]
         }
-    }
\ No newline at end of file
+    }
+    # Keywords for commands that are not one of the fixed phrases above. An
+    # utterance is a command when it has an action word ('start'/'stop') and
+    # an 'object' word, e.g. "pani band" or "stop irrigation".
+    INTENT_KEYWORDS = {
+        "hi": {
+            "start": ["चालू", "शुरू"],
+            "stop": ["बंद", "आपू"],
+            "object": ["पानी", "सिंचाई"]
+        },
+        "gu": {
+            "start": ["ચાલુ", "પ્રારંભ", "શરૂ"],
+            "stop": ["બંધ", "નિલંબિત"],
+            "object": ["પાણી", "સિંચાઈ"]
+        },
+        "te": {
+            "start": ["ప్రారంభించు", "మొదలు"],
+            "stop": ["ఆపు", "నిలిపివేయి"],
+            "object": ["నీరు"]
+        },
+        "en": {
+            "start": ["start", "on", "shuru", "chalu"],
+            "stop": ["stop", "off", "band", "aapu"],
+            "object": ["irrigation", "water", "pani", "paani", "sichai", "neeru"]
+        }
+    }
+
+    # Fall back to fuzzy (ASR-error tolerant) matching when no command matches
+    # exactly; fuzzy hits below this confidence are ignored
+    FUZZY_MATCHING_ENABLED = True
+    FUZZY_MATCH_MIN_CONFIDENCE = 0.75
+
+    # Act on these intents from stable partial hypotheses instead of waiting
+    # for end-of-speech; the final result confirms or retracts them
+    EARLY_INTENT_ENABLED = True
+    EARLY_INTENT_INTENTS = ["stop"]
+    EARLY_INTENT_STABLE_PARTIALS = 2
+
+    # Spoken-language ID (voice/language_id.py): when a trained model exists,
+    # only the most likely language's decoder runs unless its posterior is
+    # below LANGUAGE_ID_MIN_CONFIDENCE. The current language gets a sticky
+    # prior so one noisy chunk doesn't flip languages.
+    LANGUAGE_ID_MODEL_PATH = os.path.join(BASE_MODEL_PATH, "language_id.npz")
+    LANGUAGE_ID_MIN_CONFIDENCE = 0.7
+    LANGUAGE_ID_STICKY_PRIOR = 0.6
+    LANGUAGE_ID_TEMPERATURE = 0.5
+    LANGUAGE_ID_ENERGY_FLOOR_DB = -50
+    LANGUAGE_ID_SCORE_WEIGHT = 2.0
+    LANGUAGE_ID_MAX_BUFFER_SEC = 10
+
+    # Two-stage voice: a grammar-restricted keyword spotter runs on every chunk
+    # and the full recognizers only see audio for a short window after a
+    # command word, starting with the pre-roll. Grammars need "small" Vosk
+    # models (large ones ignore them). Keywords default to the object words
+    # of INTENT_KEYWORDS for each language with a spotter model; languages
+    # without one are skipped with a warning. "en" spots the English and
+    # romanized words ("irrigation", "water", "pani", ...) with the small
+    # English model, which is used for spotting only.
+    KEYWORD_SPOTTING_ENABLED = False
+    KEYWORD_SPOTTER_MODEL_PATHS = dict(
+        VOICE_MODEL_PATHS,
+        en=os.path.join(BASE_MODEL_PATH, "vosk-model-small-en-us-0.15")
+    )
+    KEYWORD_SPOTTER_KEYWORDS = {}
+    KEYWORD_ACTIVE_WINDOW_SEC = 4
+    KEYWORD_PREROLL_SEC = 1.5
+    KEYWORD_ENERGY_FLOOR_DB = -45
+
+    # Adaptive hand inference: crop to the last hand's padded bounding box,
+    # search a downscaled frame when no hand is visible, blur only dark frames
+    # and run MediaPipe less often while the scene is still
+    GESTURE_ADAPTIVE_VISION = True
+    GESTURE_ROI_PADDING = 0.3
+    GESTURE_ROI_MIN_SIZE = 160
+    GESTURE_SEARCH_SCALE = 0.5
+    GESTURE_BLUR_BELOW_BRIGHTNESS = 60
+    GESTURE_MOTION_THRESHOLD = 4.0
+    GESTURE_STATIC_HAND_FPS = 10
+    GESTURE_IDLE_FPS = 4
+
+    # Swipes from the index-tip trajectory: distance and axis thresholds are in
+    # normalized frame units, speed in units per second (frame-rate independent)
+    GESTURE_TRAJECTORY_CAPACITY = 128
+    GESTURE_SWIPE_WINDOW_SEC = 0.6
+    GESTURE_SWIPE_MIN_DISTANCE = 0.15
+    GESTURE_SWIPE_MIN_SPEED = 0.4
+    GESTURE_SWIPE_AXIS_THRESHOLD = 0.08
+    GESTURE_SWIPE_MIN_STRAIGHTNESS = 0.7
+    GESTURE_SWIPE_MAX_GAP_SEC = 0.5
+    # After a swipe, re-arm once the hand is slower than this (or moves back)
+    GESTURE_SWIPE_REARM_SPEED = 0.2
+
+    # Multi-camera gesture service: one capture and one inference process per
+    # camera, crashed processes restarted with exponential backoff
+    GESTURE_CAMERAS = [
+        {"camera_id": "cam0", "zone": "default", "source": 0, "width": 640, "height": 480, "fps": 30},
+    ]
+    GESTURE_STATS_INTERVAL_SEC = 5
+    GESTURE_RESTART_BACKOFF_SEC = 2
+    GESTURE_MAX_RESTARTS = 5
+
+    # Per-stage gesture latency histograms (capture, preprocessing, inference,
+    # classification, queue hand-off); near-zero cost when disabled
+    GESTURE_STAGE_TIMING = False
+    GESTURE_STAGE_WINDOW_SEC = 60
+    GESTURE_STAGE_LOG_INTERVAL_SEC = 30
@@ -1,4 +1,12 @@
 from .gesture_recognizer import GestureRecognizer
 from .gesture_processor import GestureCommandProcessor
+from .frame_mailbox import LatestFrameMailbox
+from .adaptive_vision import AdaptiveVisionPipeline
+from .landmark_features import extract_features, classify_static, classify_batch
+from .replay import GestureReplay
+from .shared_frames import SharedFrameMailbox
+from .gesture_service import MultiCameraGestureService
 
-__all__ = ['GestureRecognizer', 'GestureCommandProcessor']
+__all__ = ['GestureRecognizer', 'GestureCommandProcessor', 'LatestFrameMailbox', 'AdaptiveVisionPipeline',
+           'extract_features', 'classify_static', 'classify_batch', 'GestureReplay',
+           'SharedFrameMailbox', 'MultiCameraGestureService']
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import time
+from collections import deque
+import cv2
+import mediapipe as mp
+import numpy as np
+from config.config import Config
+
+STAGES = ('motion', 'crop', 'blur', 'color', 'inference', 'classify', 'draw', 'total')
+
+
+class AdaptiveVisionPipeline:
+    """Cheaper MediaPipe Hands inference for CPU-only boxes.
+
+    - Once a hand is found, only a padded box around its last landmarks is
+      sent to MediaPipe; landmarks are mapped back to full-frame coordinates.
+    - With no hand visible, the search runs on a downscaled frame.
+    - The Gaussian blur is applied only to dark (noisy) frames.
+    - A tiny grayscale thumbnail measures scene motion: moving scenes are
+      processed every frame, a still hand at GESTURE_STATIC_HAND_FPS and an
+      empty still scene at GESTURE_IDLE_FPS.
+
+    Crops and downscaled search frames change origin and size from call to
+    call, so MediaPipe's frame-to-frame tracking would refer to the wrong
+    image geometry: the pipeline owns a static_image_mode=True Hands
+    instance (pass `hands` only if it is also in static image mode).
+    """
+
+    def __init__(self, hands=None, roi_padding=None, roi_min_size=None, search_scale=None, timer=None):
+        self.hands = hands or mp.solutions.hands.Hands(
+            static_image_mode=True,
+            max_num_hands=1,
+            min_detection_confidence=0.5
+        )
+        self.timer = timer
+        self.roi_padding = Config.GESTURE_ROI_PADDING if roi_padding is None else roi_padding
+        self.roi_min_size = roi_min_size or Config.GESTURE_ROI_MIN_SIZE
+        self.search_scale = search_scale or Config.GESTURE_SEARCH_SCALE
+        self.roi = None
+        self.last_landmarks = None
+        self._last_thumbnail = None
+        self._last_inference = 0.0
+        self.started_at = time.monotonic()
+        self.stage_times = {stage: deque(maxlen=300) for stage in STAGES}
+        self.counters = {'frames': 0, 'inferred': 0, 'skipped': 0, 'roi': 0, 'search': 0, 'blurred': 0}
+
+    def reset(self):
+        """Forget the tracked hand and motion reference"""
+        self.roi = None
+        self.last_landmarks = None
+        self._last_thumbnail = None
+        self._last_inference = float('-inf')
+
+    def record(self, stage, seconds):
+        self.stage_times[stage].append(seconds)
+        if self.timer:
+            self.timer.record(stage, seconds)
+
+    def _should_infer(self, motion, now):
+        if motion >= Config.GESTURE_MOTION_THRESHOLD:
+            return True
+        fps = Config.GESTURE_STATIC_HAND_FPS if self.roi else Config.GESTURE_IDLE_FPS
+        return now - self._last_inference >= 1.0 / fps
+
+    def _update_roi(self, hand_landmarks, width, height):
+        xs = np.fromiter((lm.x for lm in hand_landmarks.landmark), dtype=np.float32) * width
+        ys = np.fromiter((lm.y for lm in hand_landmarks.landmark), dtype=np.float32) * height
+        size = max(xs.max() - xs.min(), ys.max() - ys.min())
+        size = max(size * (1.0 + 2.0 * self.roi_padding), self.roi_min_size)
+        cx, cy = (xs.max() + xs.min()) / 2.0, (ys.max() + ys.min()) / 2.0
+        x0, y0 = int(max(0, cx - size / 2)), int(max(0, cy - size / 2))
+        x1, y1 = int(min(width, cx + size / 2)), int(min(height, cy + size / 2))
+        self.roi = (x0, y0, x1, y1) if x1 - x0 > 1 and y1 - y0 > 1 else None
+
+    def process(self, frame, now=None):
+        """Mirror the frame and find hands.
+
+        Returns (display_frame, hand_landmarks_list or None, inferred). When
+        the frame is skipped by the motion gate, inferred is False and no
+        landmarks are returned. `now` overrides the clock for replayed video.
+        """
+        started = time.perf_counter()
+        self.counters['frames'] += 1
+        frame = cv2.flip(frame, 1)
+        height, width = frame.shape[:2]
+
+        thumbnail = cv2.cvtColor(cv2.resize(frame, (80, 60), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+        if self._last_thumbnail is None:
+            motion = float('inf')
+        else:
+            motion = float(np.mean(cv2.absdiff(thumbnail, self._last_thumbnail)))
+        now = time.monotonic() if now is None else now
+        measured = time.perf_counter()
+        self.record('motion', measured - started)
+        if not self._should_infer(motion, now):
+            self.counters['skipped'] += 1
+            return frame, None, False
+        self._last_thumbnail = thumbnail
+        self._last_inference = now
+
+        if self.roi:
+            x0, y0, x1, y1 = self.roi
+            region = frame[y0:y1, x0:x1]
+            self.counters['roi'] += 1
+        else:
+            region = cv2.resize(frame, None, fx=self.search_scale, fy=self.search_scale,
+                                interpolation=cv2.INTER_AREA)
+            self.counters['search'] += 1
+        cropped = time.perf_counter()
+        self.record('crop', cropped - measured)
+        if float(thumbnail.mean()) < Config.GESTURE_BLUR_BELOW_BRIGHTNESS:
+            region = cv2.GaussianBlur(region, (5, 5), 0)
+            self.counters['blurred'] += 1
+            blurred = time.perf_counter()
+            self.record('blur', blurred - cropped)
+        else:
+            blurred = cropped
+        rgb_region = cv2.cvtColor(region, cv2.COLOR_BGR2RGB)
+        preprocessed = time.perf_counter()
+        self.record('color', preprocessed - blurred)
+
+        results = self.hands.process(rgb_region)
+        self.record('inference', time.perf_counter() - preprocessed)
+        self.counters['inferred'] += 1
+
+        hands = results.multi_hand_landmarks
+        if hands and self.roi:
+            # Crop-normalized -> frame-normalized coordinates
+            x0, y0, x1, y1 = self.roi
+            for hand_landmarks in hands:
+                for lm in hand_landmarks.landmark:
+                    lm.x = (x0 + lm.x * (x1 - x0)) / width
+                    lm.y = (y0 + lm.y * (y1 - y0)) / height
+        if hands:
+            self._update_roi(hands[0], width, height)
+        else:
+            self.roi = None
+        self.last_landmarks = hands
+        return frame, hands, True
+
+    def get_stats(self):
+        """Per-stage mean/p95 ms, achieved inference FPS and how frames were handled"""
+        stats = dict(self.counters)
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        stats['achieved_fps'] = round(self.counters['inferred'] / elapsed, 1)
+        stats['input_fps'] = round(self.counters['frames'] / elapsed, 1)
+        stages = {}
+        for stage, times in self.stage_times.items():
+            ordered = sorted(times)
+            if ordered:
+                stages[stage] = {
+                    'mean_ms': round(sum(ordered) / len(ordered) * 1000, 2),
+                    'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2)
+                }
+        stats['stages'] = stages
+        return stats
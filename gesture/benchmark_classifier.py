@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark: the original scalar static-gesture classifier against the
+vectorized, table-driven one in gesture.landmark_features.
+
+Usage: python -m gesture.benchmark_classifier [--hands 20000] [--repeat 3]
+"""
+import argparse
+import time
+from types import SimpleNamespace
+import numpy as np
+from gesture.landmark_features import classify_static, classify_batch, landmarks_to_array
+
+
+def legacy_landmarks_to_array(hand_landmarks):
+    """The original list-building loop"""
+    landmark_coords = []
+    for lm in hand_landmarks.landmark:
+        landmark_coords.append([lm.x, lm.y])
+    return np.array(landmark_coords)
+
+
+def legacy_classify(landmarks):
+    """The original GestureRecognizer._classify_static_gesture"""
+    finger_tips = [4, 8, 12, 16, 20]
+    finger_pips = [3, 6, 10, 14, 18]
+    finger_mcp = [2, 5, 9, 13, 17]
+    fingers_up = []
+    if landmarks[finger_tips[0]][0] > landmarks[finger_mcp[0]][0]:
+        fingers_up.append(1)
+    else:
+        fingers_up.append(0)
+    for i in range(1, 5):
+        tip_y = landmarks[finger_tips[i]][1]
+        pip_y = landmarks[finger_pips[i]][1]
+        mcp_y = landmarks[finger_mcp[i]][1]
+        if tip_y < pip_y and tip_y < mcp_y:
+            fingers_up.append(1)
+        else:
+            fingers_up.append(0)
+    total_fingers = sum(fingers_up)
+    if total_fingers == 0:
+        return "fist"
+    elif total_fingers == 5:
+        return "palm_up"
+    elif fingers_up == [1, 1, 0, 0, 0]:
+        return "thumb_up"
+    elif fingers_up == [0, 1, 1, 0, 0]:
+        return "peace_sign"
+    elif fingers_up == [0, 1, 0, 0, 0]:
+        return "point"
+    elif total_fingers >= 3:
+        return "open_hand"
+    return None
+
+
+def _fake_hand(points):
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y)) for x, y in points])
+
+
+def _best_of(repeat, fn):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(n_hands=20000, repeat=3, seed=0):
+    rng = np.random.default_rng(seed)
+    hands = rng.random((n_hands, 21, 2)).astype(np.float32)
+    fake_hands = [_fake_hand(h) for h in hands[:min(n_hands, 5000)]]
+
+    timings = {}
+    timings['legacy_to_array'], _ = _best_of(repeat, lambda: [legacy_landmarks_to_array(h) for h in fake_hands])
+    timings['vector_to_array'], _ = _best_of(repeat, lambda: [landmarks_to_array(h) for h in fake_hands])
+    timings['legacy_classify'], legacy = _best_of(repeat, lambda: [legacy_classify(h) for h in hands])
+    timings['table_single'], single = _best_of(repeat, lambda: [classify_static(h) for h in hands])
+    timings['table_batch'], batch = _best_of(repeat, lambda: classify_batch(hands))
+
+    mismatches = sum(1 for a, b, c in zip(legacy, single, batch) if not (a == b == c))
+    print(f"📊 Static gesture classifier benchmark ({n_hands} hands, best of {repeat})")
+    for name, seconds in timings.items():
+        count = len(fake_hands) if name.endswith('to_array') else n_hands
+        print(f"   {name:<16} {seconds * 1e6 / count:8.2f} µs/hand")
+    print(f"   batch speedup vs legacy: {timings['legacy_classify'] / timings['table_batch']:.0f}x")
+    print(f"   agreement: {'✅ identical' if not mismatches else f'❌ {mismatches} mismatches'}")
+    return {'timings': timings, 'mismatches': mismatches}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the static gesture classifiers")
+    parser.add_argument('--hands', type=int, default=20000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.hands, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+
+class LatestFrameMailbox:
+    """Single-slot frame handoff between a capture thread and an inference thread.
+
+    put() overwrites whatever is waiting, so the consumer always gets the
+    newest frame and a slow consumer never makes frames pile up; every
+    overwritten frame is counted as dropped.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._captured_at = None
+        self._sequence = 0
+        self._closed = False
+        self.stats = {'published': 0, 'consumed': 0, 'dropped': 0}
+
+    def put(self, frame, captured_at=None):
+        with self._cond:
+            if self._frame is not None:
+                self.stats['dropped'] += 1
+            self._frame = frame
+            self._captured_at = captured_at if captured_at is not None else time.monotonic()
+            self._sequence += 1
+            self.stats['published'] += 1
+            self._cond.notify()
+
+    def take(self, timeout=None):
+        """Newest frame as (frame, captured_at, sequence), or None on timeout/close"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._frame is not None or self._closed, timeout):
+                return None
+            if self._frame is None:
+                return None
+            item = (self._frame, self._captured_at, self._sequence)
+            self._frame = None
+            self.stats['consumed'] += 1
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+            self._frame = None
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+        stats['drop_rate'] = round(stats['dropped'] / stats['published'], 3) if stats['published'] else 0.0
+        return stats
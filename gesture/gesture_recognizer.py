@@ -4,8 +4,13 @@ import mediapipe as mp
 import threading
 import queue
 import time
-import numpy as np
+from collections import deque
 from config.config import Config
+from gesture.frame_mailbox import LatestFrameMailbox
+from gesture.adaptive_vision import AdaptiveVisionPipeline
+from gesture.landmark_features import landmarks_to_array, classify_static
+from gesture.trajectory import SwipeDetector, MajorityVote
+from gesture.stage_timer import StageTimer
 
 class GestureRecognizer:
     def __init__(self):
@@ -18,23 +23,33 @@ class GestureRecognizer:
             min_tracking_confidence=0.3    # Lowered for better tracking
         )
         self.mp_drawing = mp.solutions.drawing_utils
+        # Per-stage latency histograms (no-op unless GESTURE_STAGE_TIMING)
+        self.stage_timer = StageTimer()
+        # The adaptive pipeline feeds crops of varying geometry, so it runs its own
+        # static-image Hands instead of the tracking one above
+        self.vision = AdaptiveVisionPipeline(timer=self.stage_timer) if Config.GESTURE_ADAPTIVE_VISION else None
         
         self.cap = None
         self.gesture_queue = queue.Queue()
+        self._queued_at = deque()   # perf_counter of each queued gesture, for the hand-off stage
         self.is_detecting = False
         self.detection_thread = None
         
+        # Capture thread -> newest frame -> inference thread
+        self.frame_mailbox = LatestFrameMailbox()
+        self.capture_thread = None
+        self.frame_wait_times = deque(maxlen=300)   # capture -> picked up by inference
+        self.frame_ages = deque(maxlen=300)         # capture -> inference finished
+        self.inference_times = deque(maxlen=300)
+        self.detection_started_at = None
+        self.on_landmarks = None    # optional callback(timestamp, landmark_array), used by replay
+        
         # Enhanced tracking variables
-        self.previous_landmarks = None
-        self.gesture_history = []
+        self.swipe_detector = SwipeDetector()
+        self.gesture_smoother = MajorityVote(size=3, min_count=2)
         self.last_gesture_time = 0
         self.gesture_cooldown = 1.0  # 1 second between gestures
         
-        # Swipe detection variables
-        self.swipe_start_pos = None
-        self.swipe_threshold = 0.08  # Increased for more reliable detection
-        self.min_swipe_distance = 0.15
-        
     def start_detection(self):
         """Start gesture detection"""
         if self.is_detecting:
@@ -49,8 +64,14 @@ class GestureRecognizer:
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
             self.cap.set(cv2.CAP_PROP_FPS, 30)
+            # Keep the driver queue short; the mailbox already holds the newest frame
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
                 
             self.is_detecting = True
+            self.frame_mailbox.reopen()
+            self.detection_started_at = time.monotonic()
+            self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self.capture_thread.start()
             self.detection_thread = threading.Thread(target=self._detection_loop, daemon=True)
             self.detection_thread.start()
             print("👋 Enhanced gesture detection started")
@@ -59,82 +80,158 @@ class GestureRecognizer:
             print(f"❌ Failed to start gesture detection: {e}")
             raise
     
+    def _capture_loop(self):
+        """Read frames as fast as the camera delivers them into the mailbox"""
+        while self.is_detecting:
+            t = self.stage_timer.start()
+            ret, frame = self.cap.read()
+            self.stage_timer.lap('capture', t)
+            if not ret:
+                time.sleep(0.01)
+                continue
+            self.frame_mailbox.put(frame, time.monotonic())
+    
     def _detection_loop(self):
-        """Enhanced gesture detection loop"""
-        frame_count = 0
-        
+        """Inference loop: always works on the newest captured frame"""
         while self.is_detecting:
             try:
-                ret, frame = self.cap.read()
-                if not ret:
-                    continue
-                
-                frame_count += 1
-                
-                # Process every 2nd frame for better performance
-                if frame_count % 2 != 0:
+                item = self.frame_mailbox.take(timeout=0.5)
+                if item is None:
                     continue
+                frame, captured_at, _ = item
+                started = time.monotonic()
+                self.frame_wait_times.append(started - captured_at)
+                self.stage_timer.record('queue_wait', started - captured_at)
                 
-                # Flip frame horizontally for mirror effect
-                frame = cv2.flip(frame, 1)
+                frame = self._process_frame(frame)
                 
-                # Improve image quality
-                frame = cv2.GaussianBlur(frame, (5, 5), 0)
-                rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                
-                # Process frame with MediaPipe
-                results = self.hands.process(rgb_frame)
-                
-                current_time = time.time()
-                
-                if results.multi_hand_landmarks:
-                    for hand_landmarks in results.multi_hand_landmarks:
-                        # Detect gesture with improved algorithm
-                        gesture = self._enhanced_gesture_classification(hand_landmarks, current_time)
-                        
-                        if gesture and self._is_gesture_valid(gesture, current_time):
-                            self.gesture_queue.put(gesture)
-                            print(f"👋 Detected gesture: {gesture}")
-                            self.last_gesture_time = current_time
-                        
-                        # Draw enhanced landmarks
-                        self._draw_enhanced_landmarks(frame, hand_landmarks)
-                
-                # Add instruction text on frame
-                self._add_instruction_text(frame)
+                finished = time.monotonic()
+                self.inference_times.append(finished - started)
+                self.frame_ages.append(finished - captured_at)
                 
                 # Display frame
+                t = self.stage_timer.start()
                 cv2.imshow('Enhanced Gesture Recognition', frame)
-                if cv2.waitKey(1) & 0xFF == ord('q'):
+                key = cv2.waitKey(1)
+                self.stage_timer.lap('display', t)
+                self.stage_timer.tick()
+                if key & 0xFF == ord('q'):
+                    self.is_detecting = False
                     break
-                    
-                time.sleep(0.03)  # ~30 FPS
                 
             except Exception as e:
                 print(f"❌ Gesture detection error: {e}")
                 time.sleep(0.1)
     
+    def _process_frame(self, frame, timestamp=None):
+        """Run hand detection and gesture classification on one BGR frame"""
+        if self.vision:
+            return self._process_frame_adaptive(frame, timestamp)
+        
+        timer = self.stage_timer
+        t = timer.start()
+        # Flip frame horizontally for mirror effect
+        frame = cv2.flip(frame, 1)
+        t = timer.lap('flip', t)
+        
+        # Improve image quality
+        frame = cv2.GaussianBlur(frame, (5, 5), 0)
+        t = timer.lap('blur', t)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        t = timer.lap('color', t)
+        
+        # Process frame with MediaPipe
+        results = self.hands.process(rgb_frame)
+        timer.lap('inference', t)
+        
+        current_time = timestamp if timestamp is not None else time.time()
+        
+        if results.multi_hand_landmarks:
+            for hand_landmarks in results.multi_hand_landmarks:
+                # Detect gesture with improved algorithm
+                self.process_landmarks(landmarks_to_array(hand_landmarks), current_time)
+                
+                # Draw enhanced landmarks
+                t = timer.start()
+                self._draw_enhanced_landmarks(frame, hand_landmarks)
+                timer.lap('draw', t)
+        
+        # Add instruction text on frame
+        self._add_instruction_text(frame)
+        return frame
+    
+    def _process_frame_adaptive(self, frame, timestamp=None):
+        """Same as _process_frame, with ROI cropping and motion-gated inference"""
+        started = time.perf_counter()
+        frame, hands, inferred = self.vision.process(frame, timestamp)
+        
+        classify_started = time.perf_counter()
+        if hands:
+            current_time = timestamp if timestamp is not None else time.time()
+            for hand_landmarks in hands:
+                self.process_landmarks(landmarks_to_array(hand_landmarks), current_time)
+            self.vision.record('classify', time.perf_counter() - classify_started)
+        
+        draw_started = time.perf_counter()
+        # Skipped frames still show the last known hand
+        for hand_landmarks in (hands if inferred else self.vision.last_landmarks) or []:
+            self._draw_enhanced_landmarks(frame, hand_landmarks)
+        self._add_instruction_text(frame)
+        finished = time.perf_counter()
+        self.vision.record('draw', finished - draw_started)
+        self.vision.record('total', finished - started)
+        return frame
+    
+    def process_landmarks(self, landmark_array, timestamp=None):
+        """Classify one hand's (21, 2) landmarks and publish the gesture if accepted.
+        
+        This is the entry point for replayed landmark recordings; timestamp is
+        the frame time in seconds (defaults to now).
+        """
+        current_time = timestamp if timestamp is not None else time.time()
+        if self.on_landmarks:
+            self.on_landmarks(current_time, landmark_array)
+        gesture = self._classify_landmark_array(landmark_array, current_time)
+        if gesture and self._is_gesture_valid(gesture, current_time):
+            self._queued_at.append(time.perf_counter())
+            self.gesture_queue.put(gesture)
+            print(f"👋 Detected gesture: {gesture}")
+            self.last_gesture_time = current_time
+            return gesture
+        return None
+    
+    def reset_tracking(self):
+        """Forget swipe, smoothing and cooldown state (e.g. between replayed clips)"""
+        self.swipe_detector.reset()
+        self.gesture_smoother.reset()
+        self.last_gesture_time = float('-inf')
+        if self.vision:
+            self.vision.reset()
+    
     def _enhanced_gesture_classification(self, landmarks, current_time):
         """Enhanced gesture classification with multiple methods"""
+        return self._classify_landmark_array(landmarks_to_array(landmarks), current_time)
+    
+    def _classify_landmark_array(self, landmark_array, current_time):
+        """Swipe and static classification of a (21, 2) landmark array"""
         try:
-            # Extract landmark coordinates
-            landmark_coords = []
-            for lm in landmarks.landmark:
-                landmark_coords.append([lm.x, lm.y])
-            
-            landmark_array = np.array(landmark_coords)
-            
+            timer = self.stage_timer
+            t = timer.start()
             # Method 1: Static gesture classification
             static_gesture = self._classify_static_gesture(landmark_array)
+            t = timer.lap('static', t)
             
             # Method 2: Dynamic swipe detection
             swipe_gesture = self._enhanced_swipe_detection(landmark_array, current_time)
+            t = timer.lap('swipe', t)
             
             # Priority: Swipe gestures > Static gestures
             if swipe_gesture:
                 return swipe_gesture
             elif static_gesture:
-                return self._smooth_gesture(static_gesture)
+                gesture = self._smooth_gesture(static_gesture)
+                timer.lap('smooth', t)
+                return gesture
             
             return None
             
@@ -143,132 +240,25 @@ class GestureRecognizer:
             return None
     
     def _classify_static_gesture(self, landmarks):
-        """Improved static gesture classification"""
+        """Static gesture from the finger-state lookup table"""
         try:
-            # Finger tip and PIP joint indices
-            finger_tips = [4, 8, 12, 16, 20]  # Thumb, Index, Middle, Ring, Pinky
-            finger_pips = [3, 6, 10, 14, 18]
-            finger_mcp = [2, 5, 9, 13, 17]   # MCP joints for better accuracy
-            
-            # Check which fingers are extended
-            fingers_up = []
-            
-            # Thumb (check x coordinate relative to MCP)
-            if landmarks[finger_tips[0]][0] > landmarks[finger_mcp[0]][0]:
-                fingers_up.append(1)
-            else:
-                fingers_up.append(0)
-            
-            # Other fingers (check y coordinate with improved threshold)
-            for i in range(1, 5):
-                tip_y = landmarks[finger_tips[i]][1]
-                pip_y = landmarks[finger_pips[i]][1]
-                mcp_y = landmarks[finger_mcp[i]][1]
-                
-                # More robust finger detection
-                if tip_y < pip_y and tip_y < mcp_y:
-                    fingers_up.append(1)
-                else:
-                    fingers_up.append(0)
-            
-            # Enhanced gesture classification
-            total_fingers = sum(fingers_up)
-            
-            if total_fingers == 0:
-                return "fist"
-            elif total_fingers == 5:
-                return "palm_up"
-            elif fingers_up == [1, 1, 0, 0, 0]:  # Thumb + Index
-                return "thumb_up"
-            elif fingers_up == [0, 1, 1, 0, 0]:  # Index + Middle
-                return "peace_sign"
-            elif fingers_up == [0, 1, 0, 0, 0]:  # Only Index
-                return "point"
-            elif total_fingers >= 3:
-                return "open_hand"
-            
-            return None
-            
+            return classify_static(landmarks)
         except Exception as e:
             print(f"❌ Static gesture classification error: {e}")
             return None
     
     def _enhanced_swipe_detection(self, curr_landmarks, current_time):
-        """Enhanced swipe detection with better accuracy"""
+        """Swipe from the index fingertip's recent trajectory"""
         try:
-            if self.previous_landmarks is None:
-                self.previous_landmarks = curr_landmarks
-                return None
-            
-            # Use index finger tip for swipe detection
-            prev_index = self.previous_landmarks[8]
-            curr_index = curr_landmarks[8]
-            
-            # Calculate movement
-            dx = curr_index[0] - prev_index[0]
-            dy = curr_index[1] - prev_index[1]
-            distance = np.sqrt(dx**2 + dy**2)
-            
-            # Detect swipe start
-            if self.swipe_start_pos is None and distance > 0.02:
-                self.swipe_start_pos = prev_index
-                self.swipe_start_time = current_time
-                self.previous_landmarks = curr_landmarks
-                return None
-            
-            # Detect swipe completion
-            if self.swipe_start_pos is not None:
-                total_dx = curr_index[0] - self.swipe_start_pos[0]
-                total_dy = curr_index[1] - self.swipe_start_pos[1]
-                total_distance = np.sqrt(total_dx**2 + total_dy**2)
-                
-                # Check if swipe is complete
-                if total_distance > self.min_swipe_distance:
-                    gesture = None
-                    
-                    # Determine swipe direction
-                    if abs(total_dx) > abs(total_dy):
-                        if total_dx > self.swipe_threshold:
-                            gesture = "swipe_right"
-                        elif total_dx < -self.swipe_threshold:
-                            gesture = "swipe_left"
-                    else:
-                        if total_dy < -self.swipe_threshold:
-                            gesture = "swipe_up"
-                        elif total_dy > self.swipe_threshold:
-                            gesture = "swipe_down"
-                    
-                    # Reset swipe tracking
-                    self.swipe_start_pos = None
-                    self.previous_landmarks = curr_landmarks
-                    return gesture
-                
-                # Reset if swipe takes too long
-                if current_time - self.swipe_start_time > 2.0:
-                    self.swipe_start_pos = None
-            
-            self.previous_landmarks = curr_landmarks
-            return None
-            
+            index_x, index_y = curr_landmarks[8].tolist()
+            return self.swipe_detector.update(current_time, index_x, index_y)
         except Exception as e:
             print(f"❌ Enhanced swipe detection error: {e}")
             return None
     
     def _smooth_gesture(self, gesture):
-        """Smooth gesture detection to reduce noise"""
-        self.gesture_history.append(gesture)
-        
-        # Keep only last 5 detections
-        if len(self.gesture_history) > 5:
-            self.gesture_history = self.gesture_history[-5:]
-        
-        # Return gesture only if detected consistently
-        if len(self.gesture_history) >= 3:
-            recent_gestures = self.gesture_history[-3:]
-            if recent_gestures.count(gesture) >= 2:
-                return gesture
-        
-        return None
+        """Smooth gesture detection to reduce noise (2 of the last 3 static results)"""
+        return self.gesture_smoother.push(gesture)
     
     def _is_gesture_valid(self, gesture, current_time):
         """Check if gesture is valid (not too frequent)"""
@@ -286,10 +276,10 @@ class GestureRecognizer:
         )
         
         # Draw swipe indicator
-        if self.swipe_start_pos is not None:
+        if self.swipe_detector.origin is not None:
             h, w, _ = frame.shape
-            start_x = int(self.swipe_start_pos[0] * w)
-            start_y = int(self.swipe_start_pos[1] * h)
+            start_x = int(self.swipe_detector.origin[0] * w)
+            start_y = int(self.swipe_detector.origin[1] * h)
             cv2.circle(frame, (start_x, start_y), 10, (0, 255, 255), -1)
     
     def _add_instruction_text(self, frame):
@@ -313,13 +303,46 @@ class GestureRecognizer:
     def get_gesture(self):
         """Get the latest detected gesture"""
         try:
-            return self.gesture_queue.get_nowait()
+            gesture = self.gesture_queue.get_nowait()
         except queue.Empty:
             return None
+        if self._queued_at:
+            self.stage_timer.record('handoff', time.perf_counter() - self._queued_at.popleft())
+        return gesture
+    
+    def get_stage_latency(self):
+        """Rolling per-stage latency percentiles in ms (empty unless GESTURE_STAGE_TIMING)"""
+        return self.stage_timer.summary()
+    
+    def get_pipeline_stats(self):
+        """Dropped frames, inference rate and frame-age percentiles in ms"""
+        def percentiles(values):
+            ordered = sorted(values)
+            if not ordered:
+                return {}
+            pick = lambda q: round(ordered[min(len(ordered) - 1, int(len(ordered) * q))] * 1000, 1)
+            return {'p50_ms': pick(0.5), 'p95_ms': pick(0.95), 'max_ms': round(ordered[-1] * 1000, 1)}
+        
+        stats = self.frame_mailbox.get_stats()
+        if self.detection_started_at:
+            elapsed = max(time.monotonic() - self.detection_started_at, 1e-6)
+            stats['capture_fps'] = round(stats['published'] / elapsed, 1)
+            stats['inference_fps'] = round(stats['consumed'] / elapsed, 1)
+        stats['inference'] = percentiles(self.inference_times)
+        stats['mailbox_wait'] = percentiles(self.frame_wait_times)
+        stats['frame_age'] = percentiles(self.frame_ages)
+        if self.vision:
+            stats['vision'] = self.vision.get_stats()
+        if self.stage_timer.enabled:
+            stats['stages'] = self.stage_timer.summary()
+        return stats
     
     def stop_detection(self):
         """Stop gesture detection"""
         self.is_detecting = False
+        self.frame_mailbox.close()
+        if self.capture_thread and self.capture_thread is not threading.current_thread():
+            self.capture_thread.join(timeout=1.0)
         if self.cap:
             self.cap.release()
         cv2.destroyAllWindows()
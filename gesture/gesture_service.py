@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-camera gesture recognition with per-camera worker processes.
+
+Every camera gets two processes: a capture process that copies frames into
+a SharedFrameMailbox (shared memory, newest frame wins) and an inference
+process that runs a GestureRecognizer on whatever frame is newest. MediaPipe
+therefore never competes with voice decoding or the control loop for the
+main process's GIL, and cameras spread across cores.
+
+Gestures come back as dicts tagged with camera_id and zone. A supervisor
+thread restarts a crashed capture or inference process (with backoff)
+without touching the other cameras.
+
+Camera specs (Config.GESTURE_CAMERAS):
+
+    {"camera_id": "gate", "zone": "north", "source": 0, "width": 640, "height": 480, "fps": 30}
+"""
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
+from config.config import Config
+from gesture.shared_frames import SharedFrameMailbox
+
+ROLES = ('capture', 'inference')
+
+
+def _capture_worker(spec, mailbox, stop_event):
+    """Capture process: camera -> shared-memory mailbox"""
+    import cv2
+
+    cap = cv2.VideoCapture(spec.get('source', 0))
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open camera {spec.get('source', 0)}")
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, spec.get('width', 640))
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, spec.get('height', 480))
+    cap.set(cv2.CAP_PROP_FPS, spec.get('fps', 30))
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    failures = 0
+    try:
+        while not stop_event.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                failures += 1
+                if failures > 100:
+                    raise RuntimeError(f"Camera {spec['camera_id']} stopped delivering frames")
+                time.sleep(0.01)
+                continue
+            failures = 0
+            mailbox.put(frame, time.time())
+    finally:
+        cap.release()
+
+
+def _inference_worker(spec, mailbox, gesture_queue, stats_queue, stop_event, stats_interval):
+    """Inference process: newest shared frame -> GestureRecognizer -> tagged gestures"""
+    from gesture.gesture_recognizer import GestureRecognizer
+
+    recognizer = GestureRecognizer()
+    inference_times = deque(maxlen=300)
+    frame_ages = deque(maxlen=300)
+    counts = {'frames': 0, 'gestures': 0}
+
+    def report():
+        stats = {
+            'camera_id': spec['camera_id'],
+            'timestamp': time.time(),
+            'process_cpu_seconds': time.process_time(),
+            'frames': counts['frames'],
+            'gestures': counts['gestures'],
+            'inference_mean_ms': round(sum(inference_times) / len(inference_times) * 1000, 2) if inference_times else None,
+            'frame_age_mean_ms': round(sum(frame_ages) / len(frame_ages) * 1000, 2) if frame_ages else None
+        }
+        if recognizer.vision:
+            stats['vision'] = recognizer.vision.get_stats()
+        if recognizer.stage_timer.enabled:
+            stats['stages'] = recognizer.get_stage_latency()
+        stats_queue.put(stats)
+
+    last_report = time.monotonic()
+    while not stop_event.is_set():
+        item = mailbox.take(timeout=0.5)
+        if item is not None:
+            frame, captured_at, _ = item
+            started = time.time()
+            recognizer._process_frame(frame)
+            recognizer.stage_timer.tick()
+            finished = time.time()
+            inference_times.append(finished - started)
+            frame_ages.append(finished - captured_at)
+            counts['frames'] += 1
+
+            gesture = recognizer.get_gesture()
+            while gesture:
+                counts['gestures'] += 1
+                gesture_queue.put({
+                    'gesture': gesture,
+                    'camera_id': spec['camera_id'],
+                    'zone': spec.get('zone'),
+                    'timestamp': captured_at
+                })
+                gesture = recognizer.get_gesture()
+
+        if time.monotonic() - last_report >= stats_interval:
+            report()
+            last_report = time.monotonic()
+    report()
+
+
+class MultiCameraGestureService:
+    """Supervised capture + inference processes for each configured camera"""
+
+    def __init__(self, cameras=None, stats_interval=None, restart_backoff=None, max_restarts=None):
+        self.cameras = list(cameras if cameras is not None else Config.GESTURE_CAMERAS)
+        self.stats_interval = stats_interval or Config.GESTURE_STATS_INTERVAL_SEC
+        self.restart_backoff = restart_backoff or Config.GESTURE_RESTART_BACKOFF_SEC
+        self.max_restarts = Config.GESTURE_MAX_RESTARTS if max_restarts is None else max_restarts
+
+        self.gesture_queue = multiprocessing.Queue()
+        self.stats_queue = multiprocessing.Queue()
+        self.stop_event = multiprocessing.Event()
+        self.pipelines = {}
+        self.camera_stats = {}
+        self.delivery_latency = {spec['camera_id']: deque(maxlen=200) for spec in self.cameras}
+        self.is_running = False
+        self.supervisor_thread = None
+        self._lock = threading.Lock()
+
+    def _spawn(self, camera_id, role):
+        pipeline = self.pipelines[camera_id]
+        spec, mailbox = pipeline['spec'], pipeline['mailbox']
+        if role == 'capture':
+            target, args = _capture_worker, (spec, mailbox, self.stop_event)
+        else:
+            mailbox.reopen()
+            target, args = _inference_worker, (spec, mailbox, self.gesture_queue, self.stats_queue,
+                                               self.stop_event, self.stats_interval)
+        process = multiprocessing.Process(target=target, args=args, daemon=True,
+                                          name=f"gesture-{role}-{camera_id}")
+        process.start()
+        pipeline['processes'][role] = process
+
+    def start(self):
+        if self.is_running:
+            return
+        self.stop_event.clear()
+        for spec in self.cameras:
+            camera_id = spec['camera_id']
+            shape = (spec.get('height', 480), spec.get('width', 640), 3)
+            self.pipelines[camera_id] = {
+                'spec': spec,
+                'mailbox': SharedFrameMailbox(shape),
+                'processes': {},
+                'restarts': {role: 0 for role in ROLES},
+                'restart_at': {role: None for role in ROLES},
+                'last_exitcode': {role: None for role in ROLES},
+                'gestures': 0
+            }
+            for role in ROLES:
+                self._spawn(camera_id, role)
+        self.is_running = True
+        self.supervisor_thread = threading.Thread(target=self._supervise, daemon=True)
+        self.supervisor_thread.start()
+        print(f"👋 Gesture service started: {len(self.cameras)} cameras, {2 * len(self.cameras)} worker processes")
+
+    def _supervise(self):
+        """Restart crashed worker processes, one camera at a time"""
+        while not self.stop_event.wait(1.0):
+            now = time.monotonic()
+            with self._lock:
+                for camera_id, pipeline in self.pipelines.items():
+                    for role, process in pipeline['processes'].items():
+                        if process.is_alive():
+                            continue
+                        if pipeline['restart_at'][role] is None:
+                            pipeline['last_exitcode'][role] = process.exitcode
+                            restarts = pipeline['restarts'][role]
+                            if restarts >= self.max_restarts:
+                                pipeline['restart_at'][role] = float('inf')
+                                print(f"❌ Camera '{camera_id}' {role} process failed {restarts + 1} times, giving up")
+                                continue
+                            delay = min(self.restart_backoff * 2 ** restarts, 60)
+                            pipeline['restart_at'][role] = now + delay
+                            print(f"⚠️ Camera '{camera_id}' {role} process exited ({process.exitcode}), "
+                                  f"restarting in {delay:.1f}s")
+                        elif now >= pipeline['restart_at'][role]:
+                            pipeline['restart_at'][role] = None
+                            pipeline['restarts'][role] += 1
+                            self._spawn(camera_id, role)
+                            print(f"🔄 Camera '{camera_id}' {role} process restarted")
+
+    def get_gesture(self, timeout=None):
+        """Next gesture dict ({'gesture', 'camera_id', 'zone', 'timestamp', 'delivery_ms'}), or None"""
+        self._drain_stats()
+        try:
+            gesture = self.gesture_queue.get(timeout=timeout) if timeout else self.gesture_queue.get_nowait()
+        except queue.Empty:
+            return None
+        camera_id = gesture['camera_id']
+        delivery_ms = (time.time() - gesture['timestamp']) * 1000.0
+        gesture['delivery_ms'] = round(delivery_ms, 1)
+        if camera_id in self.pipelines:
+            self.delivery_latency[camera_id].append(delivery_ms)
+            self.pipelines[camera_id]['gestures'] += 1
+        return gesture
+
+    def _drain_stats(self):
+        while True:
+            try:
+                report = self.stats_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.camera_stats[report['camera_id']] = report
+
+    def get_camera_stats(self):
+        """Per-camera process health, frame drops, inference time and capture-to-delivery latency"""
+        self._drain_stats()
+        report = {}
+        with self._lock:
+            for camera_id, pipeline in self.pipelines.items():
+                stats = dict(self.camera_stats.get(camera_id, {}))
+                stats['zone'] = pipeline['spec'].get('zone')
+                stats['alive'] = {role: p.is_alive() for role, p in pipeline['processes'].items()}
+                stats['restarts'] = dict(pipeline['restarts'])
+                stats['last_exitcode'] = dict(pipeline['last_exitcode'])
+                stats['mailbox'] = pipeline['mailbox'].get_stats()
+                stats['delivered'] = pipeline['gestures']
+                latencies = sorted(self.delivery_latency[camera_id])
+                if latencies:
+                    stats['delivery_mean_ms'] = round(sum(latencies) / len(latencies), 1)
+                    stats['delivery_p95_ms'] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1)
+                report[camera_id] = stats
+        return report
+
+    def stop(self, timeout=5):
+        if not self.is_running:
+            return
+        self.stop_event.set()
+        if self.supervisor_thread:
+            self.supervisor_thread.join(timeout)
+        with self._lock:
+            for pipeline in self.pipelines.values():
+                pipeline['mailbox'].close()
+                for process in pipeline['processes'].values():
+                    process.join(timeout)
+                    if process.is_alive():
+                        process.terminate()
+                pipeline['mailbox'].release()
+        self._drain_stats()
+        self.is_running = False
+        print("🛑 Gesture service stopped")
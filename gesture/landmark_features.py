@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Vectorized hand-landmark features and a table-driven static gesture classifier.
+
+Landmarks are MediaPipe's 21 hand points as an (..., 21, 2) array of
+normalized (x, y). Every function accepts a single hand (21, 2) or a batch
+(N, 21, 2) and computes all fingers in one NumPy pass.
+
+Finger states pack into a 5-bit mask (bit 0 = thumb ... bit 4 = pinky) that
+indexes GESTURE_TABLE, a precomputed 32-entry lookup of gesture names.
+"""
+from itertools import chain
+import numpy as np
+
+WRIST = 0
+FINGER_TIPS = np.array([4, 8, 12, 16, 20])     # Thumb, Index, Middle, Ring, Pinky
+FINGER_PIPS = np.array([3, 6, 10, 14, 18])
+FINGER_MCPS = np.array([2, 5, 9, 13, 17])
+FINGER_BITS = 1 << np.arange(5)
+_FINGER_JOINTS = tuple(zip(FINGER_TIPS[1:].tolist(), FINGER_PIPS[1:].tolist(), FINGER_MCPS[1:].tolist()))
+
+
+def _gesture_for_fingers(fingers):
+    """The original rule chain, used once to fill the lookup table"""
+    total = sum(fingers)
+    if total == 0:
+        return "fist"
+    elif total == 5:
+        return "palm_up"
+    elif fingers == [1, 1, 0, 0, 0]:  # Thumb + Index
+        return "thumb_up"
+    elif fingers == [0, 1, 1, 0, 0]:  # Index + Middle
+        return "peace_sign"
+    elif fingers == [0, 1, 0, 0, 0]:  # Only Index
+        return "point"
+    elif total >= 3:
+        return "open_hand"
+    return None
+
+
+GESTURE_TABLE = np.array(
+    [_gesture_for_fingers([(mask >> bit) & 1 for bit in range(5)]) for mask in range(32)],
+    dtype=object
+)
+
+
+def landmarks_to_array(hand_landmarks):
+    """(21, 2) float32 array from a MediaPipe NormalizedLandmarkList"""
+    points = hand_landmarks.landmark
+    return np.fromiter(chain.from_iterable((lm.x, lm.y) for lm in points),
+                       dtype=np.float32, count=2 * len(points)).reshape(-1, 2)
+
+
+def finger_states(landmarks):
+    """(..., 5) bool: thumb by x against its MCP, other fingers by tip above PIP and MCP"""
+    landmarks = np.asarray(landmarks)
+    tips = landmarks[..., FINGER_TIPS, :]
+    pips = landmarks[..., FINGER_PIPS, :]
+    mcps = landmarks[..., FINGER_MCPS, :]
+    states = (tips[..., 1] < pips[..., 1]) & (tips[..., 1] < mcps[..., 1])
+    states[..., 0] = tips[..., 0, 0] > mcps[..., 0, 0]
+    return states
+
+
+def finger_mask(landmarks):
+    """(...,) int bitmask of extended fingers, thumb in bit 0"""
+    return finger_states(landmarks).astype(np.int64) @ FINGER_BITS
+
+
+def extract_features(landmarks):
+    """All per-hand features in one pass.
+
+    Returns a dict of arrays with leading batch dims:
+        fingers        (..., 5) extended-finger booleans
+        mask           (...,)   5-bit finger mask
+        bend_angles    (..., 5) PIP joint angle in degrees (180 = straight)
+        tip_distances  (..., 5) fingertip-to-wrist distance / palm size
+        pinch          (...,)   thumb-to-index tip distance / palm size
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    fingers = finger_states(landmarks)
+    tips = landmarks[..., FINGER_TIPS, :]
+    pips = landmarks[..., FINGER_PIPS, :]
+    mcps = landmarks[..., FINGER_MCPS, :]
+    wrist = landmarks[..., WRIST:WRIST + 1, :]
+
+    a = mcps - pips
+    b = tips - pips
+    cosine = np.sum(a * b, axis=-1) / (np.linalg.norm(a, axis=-1) * np.linalg.norm(b, axis=-1) + 1e-9)
+    bend_angles = np.degrees(np.arccos(np.clip(cosine, -1.0, 1.0)))
+
+    palm = np.linalg.norm(landmarks[..., 9, :] - landmarks[..., WRIST, :], axis=-1) + 1e-9
+    tip_distances = np.linalg.norm(tips - wrist, axis=-1) / palm[..., None]
+    pinch = np.linalg.norm(tips[..., 0, :] - tips[..., 1, :], axis=-1) / palm
+
+    return {
+        'fingers': fingers,
+        'mask': fingers.astype(np.int64) @ FINGER_BITS,
+        'bend_angles': bend_angles,
+        'tip_distances': tip_distances,
+        'pinch': pinch
+    }
+
+
+def classify_static(landmarks):
+    """Gesture name (or None) for one (21, 2) hand.
+
+    For a single hand NumPy's per-call overhead outweighs the work, so the
+    mask is built from plain floats; same bits as finger_mask().
+    """
+    x = landmarks[:, 0].tolist()
+    y = landmarks[:, 1].tolist()
+    mask = int(x[FINGER_TIPS[0]] > x[FINGER_MCPS[0]])
+    for bit, (tip, pip, mcp) in enumerate(_FINGER_JOINTS, 1):
+        if y[tip] < y[pip] and y[tip] < y[mcp]:
+            mask |= 1 << bit
+    return GESTURE_TABLE[mask]
+
+
+def classify_batch(landmarks):
+    """Gesture names (object array, None where no gesture) for (N, 21, 2) hands"""
+    return GESTURE_TABLE[finger_mask(landmarks)]
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+Offline gesture replay and benchmarking.
+
+Feeds GestureRecognizer from a video file or a recorded landmark sequence
+as fast as possible (timestamps come from the recording, not the wall
+clock) and scores detections against labelled ground truth.
+
+Inputs:
+    clip.npz     landmarks (N, 21, 2|3) float, NaN rows for frames with no hand
+                 timestamps (N,) seconds (optional, else --fps)
+                 labels (N,) per-frame gesture name, '' for none (optional)
+    clip.mp4     any video OpenCV can read, with labels in clip.labels.json:
+                 [{"start": 1.2, "end": 2.0, "gesture": "swipe_right"}, ...]
+
+A detection counts as a true positive when it falls inside a labelled
+segment of the same gesture (or up to --tolerance seconds after it, to
+allow for smoothing lag); each segment matches at most one detection.
+
+Usage: python -m gesture.replay <clip.npz|clip.mp4> [...] [--dump-landmarks out.npz] [--output report.json]
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+
+DEFAULT_TOLERANCE_SEC = 0.5
+
+
+def labels_to_segments(timestamps, labels):
+    """Per-frame labels -> [(start, end, gesture)] for each run of one gesture"""
+    segments = []
+    current = None
+    for t, label in zip(timestamps, labels):
+        label = str(label)
+        if current and label == current[2]:
+            current[1] = float(t)
+            continue
+        if current:
+            segments.append(tuple(current))
+        current = [float(t), float(t), label] if label else None
+    if current:
+        segments.append(tuple(current))
+    return segments
+
+
+def load_landmark_recording(path, fps=30.0):
+    """(timestamps, landmarks (N, 21, 2), segments) from an NPZ recording"""
+    data = np.load(path, allow_pickle=False)
+    landmarks = np.asarray(data['landmarks'], dtype=np.float32)[..., :2]
+    if 'timestamps' in data:
+        timestamps = np.asarray(data['timestamps'], dtype=np.float64)
+    else:
+        timestamps = np.arange(len(landmarks)) / float(fps)
+    segments = labels_to_segments(timestamps, data['labels']) if 'labels' in data else []
+    return timestamps, landmarks, segments
+
+
+def load_video_labels(video_path, labels_path=None):
+    labels_path = labels_path or os.path.splitext(video_path)[0] + '.labels.json'
+    if not os.path.exists(labels_path):
+        return []
+    with open(labels_path, encoding='utf-8') as f:
+        return [(float(s['start']), float(s['end']), s['gesture']) for s in json.load(f)]
+
+
+def _add_rates(per_gesture):
+    for counts in per_gesture.values():
+        detected = counts['tp'] + counts['fp']
+        relevant = counts['tp'] + counts['fn']
+        counts['precision'] = round(counts['tp'] / detected, 3) if detected else None
+        counts['recall'] = round(counts['tp'] / relevant, 3) if relevant else None
+    return per_gesture
+
+
+def score_detections(detections, segments, tolerance=DEFAULT_TOLERANCE_SEC):
+    """Per-gesture tp/fp/fn, precision and recall for [(t, gesture)] against segments"""
+    matched = set()
+    per_gesture = {}
+    for t, gesture in detections:
+        hit = None
+        for i, (start, end, label) in enumerate(segments):
+            if i not in matched and label == gesture and start <= t <= end + tolerance:
+                hit = i
+                break
+        counts = per_gesture.setdefault(gesture, {'tp': 0, 'fp': 0, 'fn': 0})
+        if hit is None:
+            counts['fp'] += 1
+        else:
+            matched.add(hit)
+            counts['tp'] += 1
+    for i, (_, _, label) in enumerate(segments):
+        if i not in matched:
+            per_gesture.setdefault(label, {'tp': 0, 'fp': 0, 'fn': 0})['fn'] += 1
+
+    return _add_rates(per_gesture)
+
+
+class GestureReplay:
+    """Runs recordings through a GestureRecognizer without a camera or window"""
+
+    def __init__(self, recognizer=None, tolerance=DEFAULT_TOLERANCE_SEC):
+        if recognizer is None:
+            from gesture.gesture_recognizer import GestureRecognizer
+            recognizer = GestureRecognizer()
+        self.recognizer = recognizer
+        self.tolerance = tolerance
+
+    def _drain(self):
+        while self.recognizer.get_gesture() is not None:
+            pass
+
+    def replay_landmarks(self, path, fps=30.0):
+        """Replay an NPZ landmark recording through the classification stages"""
+        timestamps, landmarks, segments = load_landmark_recording(path, fps)
+        self.recognizer.reset_tracking()
+        self._drain()
+        detections = []
+        classify_seconds = 0.0
+        hand_frames = 0
+        for t, hand in zip(timestamps, landmarks):
+            if np.isnan(hand).any():
+                continue
+            hand_frames += 1
+            start = time.perf_counter()
+            gesture = self.recognizer.process_landmarks(hand, float(t))
+            classify_seconds += time.perf_counter() - start
+            if gesture:
+                detections.append((float(t), gesture))
+        self._drain()
+        return {
+            'source': os.path.basename(path),
+            'frames': len(landmarks),
+            'hand_frames': hand_frames,
+            'detections': detections,
+            'segments': len(segments),
+            'per_gesture': score_detections(detections, segments, self.tolerance),
+            'classify_fps': round(hand_frames / classify_seconds, 1) if classify_seconds else None
+        }
+
+    def replay_video(self, path, labels_path=None, dump_landmarks=None):
+        """Replay a video file through the full vision + classification pipeline"""
+        import cv2
+
+        segments = load_video_labels(path, labels_path)
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            raise ValueError(f"Cannot open video: {path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+        self.recognizer.reset_tracking()
+        self._drain()
+        captured = []
+        if dump_landmarks:
+            self.recognizer.on_landmarks = lambda t, hand: captured.append((t, hand.copy()))
+
+        detections = []
+        frames = 0
+        decode_seconds = process_seconds = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                ret, frame = cap.read()
+                decoded = time.perf_counter()
+                if not ret:
+                    break
+                decode_seconds += decoded - start
+                t = frames / fps
+                frames += 1
+                self.recognizer._process_frame(frame, t)
+                process_seconds += time.perf_counter() - decoded
+                gesture = self.recognizer.get_gesture()
+                while gesture:
+                    detections.append((t, gesture))
+                    gesture = self.recognizer.get_gesture()
+        finally:
+            cap.release()
+            self.recognizer.on_landmarks = None
+
+        if dump_landmarks:
+            self._dump(dump_landmarks, captured, segments)
+
+        report = {
+            'source': os.path.basename(path),
+            'frames': frames,
+            'detections': detections,
+            'segments': len(segments),
+            'per_gesture': score_detections(detections, segments, self.tolerance),
+            'decode_fps': round(frames / decode_seconds, 1) if decode_seconds else None,
+            'process_fps': round(frames / process_seconds, 1) if process_seconds else None,
+            'overall_fps': round(frames / (decode_seconds + process_seconds), 1) if frames else None
+        }
+        if self.recognizer.vision:
+            report['vision'] = self.recognizer.vision.get_stats()
+        if self.recognizer.stage_timer.enabled:
+            report['stages'] = self.recognizer.get_stage_latency()
+        return report
+
+    def _dump(self, path, captured, segments):
+        """Save detected landmarks as an NPZ recording labelled from the video's segments"""
+        timestamps = np.array([t for t, _ in captured], dtype=np.float64)
+        labels = np.array([
+            next((label for start, end, label in segments if start <= t <= end), '') for t in timestamps
+        ])
+        landmarks = np.stack([hand for _, hand in captured]) if captured else np.empty((0, 21, 2), np.float32)
+        np.savez(path, landmarks=landmarks, timestamps=timestamps, labels=labels)
+        print(f"💾 {len(captured)} landmark frames written to {path}")
+
+    def replay(self, path, **kwargs):
+        if path.lower().endswith('.npz'):
+            return self.replay_landmarks(path, kwargs.get('fps', 30.0))
+        return self.replay_video(path, kwargs.get('labels_path'), kwargs.get('dump_landmarks'))
+
+
+def summarize(reports):
+    """Per-gesture precision/recall pooled over several replays"""
+    totals = {}
+    for report in reports:
+        for gesture, counts in report['per_gesture'].items():
+            pooled = totals.setdefault(gesture, {'tp': 0, 'fp': 0, 'fn': 0})
+            for key in ('tp', 'fp', 'fn'):
+                pooled[key] += counts[key]
+    return _add_rates(totals)
+
+
+def _print_report(reports, totals):
+    print("=" * 60)
+    print("📊 GESTURE REPLAY")
+    print("=" * 60)
+    for report in reports:
+        rates = [f"{key}={report[key]}" for key in ('classify_fps', 'decode_fps', 'process_fps', 'overall_fps')
+                 if report.get(key) is not None]
+        print(f"{report['source']}: {report['frames']} frames, {len(report['detections'])} detections, "
+              f"{report['segments']} labelled  {' '.join(rates)}")
+    for gesture, counts in sorted(totals.items()):
+        precision = f"{counts['precision']:.2f}" if counts['precision'] is not None else "-"
+        recall = f"{counts['recall']:.2f}" if counts['recall'] is not None else "-"
+        print(f"  {gesture:<12} P={precision} R={recall}  (tp={counts['tp']} fp={counts['fp']} fn={counts['fn']})")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay gesture recordings and score them")
+    parser.add_argument('paths', nargs='+', help=".npz landmark recordings or video files")
+    parser.add_argument('--labels', default=None, help="Labels JSON for a single video")
+    parser.add_argument('--fps', type=float, default=30.0, help="Frame rate for NPZ files without timestamps")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE_SEC)
+    parser.add_argument('--dump-landmarks', default=None, help="Save a single video's landmarks as NPZ")
+    parser.add_argument('--output', default=None, help="Write the full JSON report here")
+    args = parser.parse_args()
+
+    replay = GestureReplay(tolerance=args.tolerance)
+    reports = [
+        replay.replay(path, fps=args.fps, labels_path=args.labels, dump_landmarks=args.dump_landmarks)
+        for path in args.paths
+    ]
+    totals = summarize(reports)
+    _print_report(reports, totals)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'replays': reports, 'per_gesture': totals}, f, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+import cv2
+import numpy as np
+
+SLOTS = 3
+# Indices into the shared header
+_SEQUENCE, _TAKEN, _LATEST, _READING, _PUBLISHED, _CONSUMED, _DROPPED = range(7)
+
+
+class SharedFrameMailbox:
+    """LatestFrameMailbox across processes, backed by multiprocessing.shared_memory.
+
+    Three fixed-shape frame slots (triple buffering): the writer always fills
+    a slot that is neither the newest published one nor the one the reader
+    is holding, so frames are copied once into shared memory and the reader
+    gets a NumPy view without another copy. take() returns the newest frame;
+    any frame overwritten before it was taken counts as dropped.
+
+    The object is picklable and can be passed to worker processes; each
+    process attaches to the shared block on first use.
+    """
+
+    def __init__(self, shape, dtype=np.uint8, name=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=SLOTS * frame_bytes, name=name)
+        self.name = self._shm.name
+        self._owner_pid = os.getpid()
+        self._cond = multiprocessing.Condition()
+        self._header = multiprocessing.Array('q', [0, 0, -1, -1, 0, 0, 0], lock=False)
+        self._timestamps = multiprocessing.Array('d', SLOTS, lock=False)
+        self._closed = multiprocessing.Value('b', 0, lock=False)
+        self._frames = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_shm'] = None
+        state['_frames'] = None
+        return state
+
+    def _slots(self):
+        if self._frames is None:
+            if self._shm is None:
+                self._shm = shared_memory.SharedMemory(name=self.name)
+            self._frames = np.ndarray((SLOTS,) + self.shape, dtype=self.dtype, buffer=self._shm.buf)
+        return self._frames
+
+    def put(self, frame, captured_at=None):
+        """Copy a frame into a free slot and publish it"""
+        slots = self._slots()
+        header = self._header
+        with self._cond:
+            slot = next(i for i in range(SLOTS) if i != header[_LATEST] and i != header[_READING])
+        if frame.shape == self.shape:
+            slots[slot][...] = frame
+        else:
+            slots[slot][...] = cv2.resize(frame, (self.shape[1], self.shape[0]))
+        with self._cond:
+            if header[_SEQUENCE] > header[_TAKEN]:
+                header[_DROPPED] += 1
+            self._timestamps[slot] = captured_at if captured_at is not None else time.time()
+            header[_LATEST] = slot
+            header[_SEQUENCE] += 1
+            header[_PUBLISHED] += 1
+            self._cond.notify_all()
+
+    def take(self, timeout=None):
+        """Newest frame as (view, captured_at, sequence), or None on timeout/close.
+
+        The view stays valid until the next take(); there is a single reader.
+        """
+        slots = self._slots()
+        header = self._header
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: header[_SEQUENCE] > header[_TAKEN] or self._closed.value, timeout)
+            if not ready or header[_SEQUENCE] <= header[_TAKEN]:
+                return None
+            slot = header[_LATEST]
+            header[_READING] = slot
+            header[_TAKEN] = sequence = header[_SEQUENCE]
+            header[_CONSUMED] += 1
+            captured_at = self._timestamps[slot]
+        return slots[slot], captured_at, sequence
+
+    def close(self):
+        with self._cond:
+            self._closed.value = 1
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed.value = 0
+            self._header[_READING] = -1
+
+    def get_stats(self):
+        with self._cond:
+            stats = {
+                'published': self._header[_PUBLISHED],
+                'consumed': self._header[_CONSUMED],
+                'dropped': self._header[_DROPPED]
+            }
+        stats['drop_rate'] = round(stats['dropped'] / stats['published'], 3) if stats['published'] else 0.0
+        return stats
+
+    def release(self):
+        """Detach; the creating process also frees the shared block"""
+        self._frames = None
+        if self._shm is not None:
+            self._shm.close()
+            if os.getpid() == self._owner_pid:
+                self._shm.unlink()
+            self._shm = None
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Per-stage latency timers backed by rolling log-bucketed histograms.
+
+Buckets follow the HDR histogram layout: each power of two (in µs) is split
+into SUB_BUCKETS linear sub-buckets, so every recorded value keeps ~3%
+relative precision from 1 µs up to hours with a fixed 640-slot table.
+Recording is one frexp() and one list increment. The histogram keeps
+`windows` sub-histograms and rotates them so percentiles cover roughly the
+last `window_sec` seconds.
+
+When the timer is disabled, start() and lap() return immediately without
+reading the clock, so instrumentation can stay in the hot path.
+
+    t = timer.start()
+    frame = cv2.flip(frame, 1)
+    t = timer.lap('flip', t)
+"""
+import math
+import time
+import numpy as np
+from config.config import Config
+
+SUB_BUCKETS = 16
+EXPONENTS = 40
+BUCKETS = SUB_BUCKETS * EXPONENTS
+
+
+def _bucket_index(seconds):
+    mantissa, exponent = math.frexp(seconds * 1e6)
+    if exponent <= 0:
+        return 0
+    return min((exponent - 1) * SUB_BUCKETS + int((mantissa - 0.5) * 2 * SUB_BUCKETS), BUCKETS - 1)
+
+
+# Midpoint of each bucket in seconds, for percentile reporting
+_BUCKET_VALUES = np.array([
+    2.0 ** (i // SUB_BUCKETS) * (1.0 + (i % SUB_BUCKETS + 0.5) / SUB_BUCKETS) * 1e-6
+    for i in range(BUCKETS)
+])
+
+
+class LatencyHistogram:
+    """Rolling log-bucketed histogram of durations in seconds"""
+
+    def __init__(self, windows=6):
+        self.windows = [[0] * BUCKETS for _ in range(windows)]
+        self.totals = [[0, 0.0, 0.0] for _ in range(windows)]    # count, sum, max
+        self.current = 0
+
+    def record(self, seconds):
+        self.windows[self.current][_bucket_index(seconds)] += 1
+        totals = self.totals[self.current]
+        totals[0] += 1
+        totals[1] += seconds
+        if seconds > totals[2]:
+            totals[2] = seconds
+
+    def rotate(self):
+        """Start a new sub-window, dropping the oldest"""
+        self.current = (self.current + 1) % len(self.windows)
+        self.windows[self.current] = [0] * BUCKETS
+        self.totals[self.current] = [0, 0.0, 0.0]
+
+    def summary(self, percentiles=(50, 95, 99)):
+        count = sum(t[0] for t in self.totals)
+        if not count:
+            return {'count': 0}
+        counts = np.sum(self.windows, axis=0)
+        cumulative = np.cumsum(counts)
+        summary = {
+            'count': count,
+            'mean_ms': round(sum(t[1] for t in self.totals) / count * 1000, 3),
+            'max_ms': round(max(t[2] for t in self.totals) * 1000, 3)
+        }
+        for p in percentiles:
+            index = int(np.searchsorted(cumulative, math.ceil(count * p / 100.0)))
+            summary[f'p{p}_ms'] = round(min(float(_BUCKET_VALUES[index]) * 1000, summary['max_ms']), 3)
+        return summary
+
+
+class StageTimer:
+    """Named stage histograms with a periodic summary log"""
+
+    def __init__(self, enabled=None, window_sec=None, log_interval=None, name="Gesture", windows=6):
+        self.enabled = Config.GESTURE_STAGE_TIMING if enabled is None else enabled
+        self.window_sec = window_sec or Config.GESTURE_STAGE_WINDOW_SEC
+        self.log_interval = Config.GESTURE_STAGE_LOG_INTERVAL_SEC if log_interval is None else log_interval
+        self.name = name
+        self.windows = windows
+        self.histograms = {}
+        self._next_rotate = time.monotonic() + self.window_sec / windows
+        self._next_log = time.monotonic() + (self.log_interval or 0)
+
+    def start(self):
+        return time.perf_counter() if self.enabled else 0.0
+
+    def lap(self, stage, since):
+        """Record the time since `since` under `stage`; returns the new start"""
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        self.record(stage, now - since)
+        return now
+
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram(self.windows)
+        histogram.record(seconds)
+
+    def tick(self):
+        """Rotate windows and print the summary when due; call once per frame"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        if now >= self._next_rotate:
+            for histogram in self.histograms.values():
+                histogram.rotate()
+            self._next_rotate = now + self.window_sec / self.windows
+        if self.log_interval and now >= self._next_log:
+            self._next_log = now + self.log_interval
+            self.log_summary()
+
+    def summary(self):
+        """{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} over the rolling window"""
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+    def log_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print(f"⏱️ {self.name} stage latency (last {self.window_sec:.0f}s, ms)")
+        print(f"   {'stage':<12}{'count':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+        for stage, stats in summary.items():
+            if stats['count']:
+                print(f"   {stage:<12}{stats['count']:>7}{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}"
+                      f"{stats['p99_ms']:>9.2f}{stats['max_ms']:>9.2f}")
+
+    def reset(self):
+        self.histograms = {}
@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Timestamped fingertip trajectory and frame-rate independent swipe detection.
+
+TrajectoryBuffer keeps the last `capacity` (t, x, y) samples in a NumPy ring
+written twice (at i and i + capacity), so the samples in time order are
+always one contiguous slice and no copy or sort is needed per frame.
+
+SwipeDetector looks at the samples inside a sliding time window: the sample
+farthest from the current position is the swipe origin, and a swipe fires
+when the displacement from it is long enough, fast enough (normalized
+units per second, so frame rate does not matter) and straight enough.
+After a swipe fires the history is cleared and the detector stays disarmed
+until the hand slows below GESTURE_SWIPE_REARM_SPEED or moves back against
+the swipe, so the rest of one movement cannot fire it again.
+
+MajorityVote replaces list-slicing smoothing with a fixed ring of labels and
+running counts.
+"""
+import numpy as np
+from config.config import Config
+
+
+class TrajectoryBuffer:
+    """Fixed-size ring of (t, x, y) samples"""
+
+    def __init__(self, capacity=None):
+        self.capacity = capacity or Config.GESTURE_TRAJECTORY_CAPACITY
+        self._t = np.full(2 * self.capacity, -np.inf)
+        self._xy = np.zeros((2 * self.capacity, 2), dtype=np.float32)
+        self._head = 0
+        self.count = 0
+
+    def append(self, t, x, y):
+        i = self._head
+        self._t[i] = self._t[i + self.capacity] = t
+        self._xy[i] = self._xy[i + self.capacity] = (x, y)
+        self._head = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def clear(self):
+        self._t.fill(-np.inf)
+        self._head = 0
+        self.count = 0
+
+    def latest(self):
+        """(t, xy) of the newest sample, or None"""
+        if not self.count:
+            return None
+        i = self._head - 1 + self.capacity
+        return self._t[i], self._xy[i]
+
+    def window(self, seconds, now=None):
+        """Views (t, xy) of samples with t >= now - seconds, oldest first"""
+        end = self._head + self.capacity
+        t = self._t[end - self.count:end]
+        xy = self._xy[end - self.count:end]
+        if now is None:
+            now = t[-1] if self.count else 0.0
+        start = np.searchsorted(t, now - seconds, side='left')
+        return t[start:], xy[start:]
+
+
+class SwipeDetector:
+    """Swipe direction from the index-tip trajectory over a sliding time window"""
+
+    REARM_WINDOW_SEC = 0.1
+
+    def __init__(self, window_sec=None, min_distance=None, min_speed=None,
+                 axis_threshold=None, min_straightness=None, max_gap_sec=None, capacity=None,
+                 rearm_speed=None):
+        self.window_sec = window_sec or Config.GESTURE_SWIPE_WINDOW_SEC
+        self.min_distance = min_distance or Config.GESTURE_SWIPE_MIN_DISTANCE
+        self.min_speed = min_speed or Config.GESTURE_SWIPE_MIN_SPEED
+        self.axis_threshold = axis_threshold or Config.GESTURE_SWIPE_AXIS_THRESHOLD
+        self.min_straightness = min_straightness or Config.GESTURE_SWIPE_MIN_STRAIGHTNESS
+        self.max_gap_sec = max_gap_sec or Config.GESTURE_SWIPE_MAX_GAP_SEC
+        self.rearm_speed = rearm_speed or Config.GESTURE_SWIPE_REARM_SPEED
+        self.trajectory = TrajectoryBuffer(capacity)
+        self.origin = None      # (x, y) where the swipe in progress started, for drawing
+        self._fired = None      # unit direction of the last swipe while disarmed
+
+    def reset(self):
+        self.trajectory.clear()
+        self.origin = None
+        self._fired = None
+
+    def _rearmed(self, t):
+        """True once the hand has slowed down or turned back after a swipe"""
+        # Velocity over at least REARM_WINDOW_SEC since the swipe, so landmark
+        # jitter between two close frames does not fake a slow-down or reversal
+        times, points = self.trajectory.window(np.inf, t)
+        reference = int(np.searchsorted(times, t - self.REARM_WINDOW_SEC, side='right')) - 1
+        if reference < 0:
+            return False
+        velocity = (points[-1] - points[reference]) / (times[-1] - times[reference])
+        return (float(np.hypot(*velocity)) < self.rearm_speed
+                or float(velocity @ self._fired) < -self.rearm_speed)
+
+    def update(self, t, x, y):
+        """Add a sample; returns 'swipe_left/right/up/down' or None"""
+        last = self.trajectory.latest()
+        if last is not None and t - last[0] > self.max_gap_sec:
+            # Hand was lost or frames were dropped for too long; start over
+            self.trajectory.clear()
+            self._fired = None
+        self.trajectory.append(t, x, y)
+        if self._fired is not None:
+            if not self._rearmed(t):
+                # Still the movement that fired
+                return None
+            self._fired = None
+            self.trajectory.clear()
+            self.trajectory.append(t, x, y)
+
+        times, points = self.trajectory.window(self.window_sec, t)
+        if len(times) < 2:
+            self.origin = None
+            return None
+
+        offsets = points[-1] - points
+        distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        start = int(np.argmax(distances))
+        distance = float(distances[start])
+        self.origin = tuple(points[start]) if distance > 0.02 else None
+        if distance < self.min_distance:
+            return None
+
+        duration = float(times[-1] - times[start])
+        if duration <= 0 or distance / duration < self.min_speed:
+            return None
+        steps = np.diff(points[start:], axis=0)
+        path = float(np.hypot(steps[:, 0], steps[:, 1]).sum())
+        if distance / path < self.min_straightness:
+            return None
+
+        dx, dy = offsets[start]
+        gesture = None
+        if abs(dx) > abs(dy):
+            if dx > self.axis_threshold:
+                gesture = "swipe_right"
+            elif dx < -self.axis_threshold:
+                gesture = "swipe_left"
+        else:
+            if dy < -self.axis_threshold:
+                gesture = "swipe_up"
+            elif dy > self.axis_threshold:
+                gesture = "swipe_down"
+
+        if gesture:
+            # Disarm until the hand slows or reverses; keep only the end point
+            self._fired = offsets[start] / distance
+            self.trajectory.clear()
+            self.trajectory.append(t, x, y)
+            self.origin = None
+        return gesture
+
+
+class MajorityVote:
+    """Label accepted once it fills min_count of the last `size` pushes"""
+
+    def __init__(self, size=3, min_count=2):
+        self.size = size
+        self.min_count = min_count
+        self._labels = [None] * size
+        self._counts = {}
+        self._next = 0
+        self._filled = 0
+
+    def reset(self):
+        self._labels = [None] * self.size
+        self._counts.clear()
+        self._next = 0
+        self._filled = 0
+
+    def push(self, label):
+        evicted = self._labels[self._next]
+        if self._filled == self.size:
+            self._counts[evicted] -= 1
+        else:
+            self._filled += 1
+        self._labels[self._next] = label
+        self._counts[label] = self._counts.get(label, 0) + 1
+        self._next = (self._next + 1) % self.size
+        if self._filled == self.size and self._counts[label] >= self.min_count:
+            return label
+        return None
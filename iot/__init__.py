@@ -1,2 +1,6 @@
 from .real_sensor_manager import RealSensorManager, HardwareInterface
-__all__ = ["RealSensorManager", "HardwareInterface"]
\ No newline at end of file
+from .async_collector import AsyncSensorCollector, SimulatedGateway, register_driver
+from .running_stats import RunningStats
+from .field_mapping import FieldMapper
+__all__ = ["RealSensorManager", "HardwareInterface", "AsyncSensorCollector", "SimulatedGateway", "register_driver",
+           "RunningStats", "FieldMapper"]
@@ -0,0 +1,265 @@
+"""
+Asyncio collection engine for large field sensor deployments.
+
+Sensors are plain dicts:
+
+    {"sensor_id": "soil_17", "kind": "soil", "driver": "modbus_soil",
+     "bus": "rs485-2", "address": 17, "location": "field_section_17",
+     "x": 35.0, "y": 60.0,              # optional, metres (field map)
+     "timeout": 1.5}                    # optional, else IOT_SENSOR_TIMEOUT_SEC
+
+Each cycle polls every sensor concurrently through its driver plugin; a
+bus never has more than IOT_BUS_CONCURRENCY[bus] (or ['default'])
+transactions in flight, and the timeout only covers the transaction, not
+the wait for the bus. A sensor that fails or times out keeps its last good
+reading marked stale (readings older than IOT_STALE_AFTER_SEC are stale
+too). The finished cycle is handed to the sink as one new dict, so readers
+never see a half-updated cache.
+
+Benchmark against the simulated gateway:
+
+    python -m iot.async_collector --sensors 1000 --cycles 5
+"""
+import argparse
+import asyncio
+import math
+import random
+import threading
+import time
+from datetime import datetime
+from config.config import Config
+
+SENSOR_DRIVERS = {}
+
+
+def register_driver(name):
+    """Class decorator adding a driver plugin under `name`"""
+    def decorator(cls):
+        SENSOR_DRIVERS[name] = cls
+        return cls
+    return decorator
+
+
+class SimulatedGateway:
+    """Local stand-in for Modbus/serial/HTTP gateways with latency, errors and hangs"""
+
+    def __init__(self, latency_ms=(5, 40), error_rate=0.01, hang_rate=0.005, seed=None):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.hang_rate = hang_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+
+    async def _transaction(self):
+        self.requests += 1
+        roll = self.rng.random()
+        if roll < self.hang_rate:
+            await asyncio.sleep(3600)
+        await asyncio.sleep(self.rng.uniform(*self.latency_ms) / 1000.0)
+        if roll < self.hang_rate + self.error_rate:
+            raise IOError("gateway CRC error")
+
+    async def read_registers(self, bus, address, count):
+        """Modbus-style holding registers: moisture and temperature x10"""
+        await self._transaction()
+        rng = random.Random(hash((bus, address)) ^ int(time.time() // 60))
+        return [int(rng.uniform(200, 800)), int(rng.uniform(180, 320))][:count]
+
+    async def get_json(self, bus, path):
+        await self._transaction()
+        return {"temp_c": round(self.rng.uniform(20, 35), 1), "rh": round(self.rng.uniform(40, 90), 1)}
+
+
+@register_driver("modbus_soil")
+class ModbusSoilDriver:
+    """Soil probe on a Modbus RTU bus behind the gateway"""
+
+    def __init__(self, gateway):
+        self.gateway = gateway
+
+    async def read(self, sensor):
+        moisture, temperature = await self.gateway.read_registers(sensor["bus"], sensor["address"], 2)
+        return {"moisture_percentage": moisture / 10.0, "temperature": temperature / 10.0}
+
+
+@register_driver("http_weather")
+class HttpWeatherDriver:
+    """Weather station exposing JSON over HTTP"""
+
+    def __init__(self, gateway):
+        self.gateway = gateway
+
+    async def read(self, sensor):
+        data = await self.gateway.get_json(sensor["bus"], sensor.get("path", "/current"))
+        return {"temperature": data["temp_c"], "humidity": data["rh"]}
+
+
+def simulated_field(soil_sensors=None, buses=8):
+    """Sensor specs for a simulated field: soil probes on a grid over RS-485 buses plus one weather station"""
+    soil_sensors = soil_sensors or Config.IOT_SIMULATED_SOIL_SENSORS
+    columns = math.ceil(math.sqrt(soil_sensors))
+    rows = math.ceil(soil_sensors / columns)
+    sensors = [
+        {"sensor_id": f"soil_{i + 1}", "kind": "soil", "driver": "modbus_soil", "bus": f"rs485-{i % buses + 1}",
+         "address": i // buses + 1, "location": f"field_section_{i + 1}",
+         "x": (i % columns + 0.5) * Config.FIELD_WIDTH_M / columns,
+         "y": (i // columns + 0.5) * Config.FIELD_HEIGHT_M / rows}
+        for i in range(soil_sensors)
+    ]
+    sensors.append({"sensor_id": "weather_1", "kind": "weather", "driver": "http_weather", "bus": "http",
+                    "address": 0, "location": "field_station"})
+    return sensors
+
+
+class AsyncSensorCollector:
+    """Polls all sensors once per interval on its own event loop thread"""
+
+    def __init__(self, sensors=None, gateway=None, sink=None, interval=None, timeout=None, stale_after=None,
+                 bus_concurrency=None):
+        self.sensors = sensors or Config.IOT_SENSORS or simulated_field()
+        self.gateway = gateway or SimulatedGateway()
+        self.sink = sink
+        self.interval = interval or Config.IOT_POLL_INTERVAL_SEC
+        self.timeout = timeout or Config.IOT_SENSOR_TIMEOUT_SEC
+        self.stale_after = stale_after or Config.IOT_STALE_AFTER_SEC
+        self.bus_concurrency = bus_concurrency or Config.IOT_BUS_CONCURRENCY
+
+        self.drivers = {}
+        for sensor in self.sensors:
+            name = sensor["driver"]
+            if name not in SENSOR_DRIVERS:
+                raise ValueError(f"Unknown sensor driver '{name}' for {sensor['sensor_id']}")
+            if name not in self.drivers:
+                self.drivers[name] = SENSOR_DRIVERS[name](self.gateway)
+
+        self.last_good = {}         # sensor_id -> (reading, monotonic time)
+        self.last_cycle = {}
+        self.running = False
+        self.thread = None
+        self._stop_event = None
+        self._loop = None
+
+    def _bus_limits(self):
+        # Semaphores belong to the loop they are used on, so build them per run
+        return {
+            bus: asyncio.Semaphore(self.bus_concurrency.get(bus, self.bus_concurrency.get("default", 16)))
+            for bus in {sensor["bus"] for sensor in self.sensors}
+        }
+
+    async def _poll(self, sensor, limits):
+        async with limits[sensor["bus"]]:
+            started = time.monotonic()
+            try:
+                values = await asyncio.wait_for(self.drivers[sensor["driver"]].read(sensor),
+                                                sensor.get("timeout", self.timeout))
+                return sensor, values, "ok", time.monotonic() - started
+            except asyncio.TimeoutError:
+                return sensor, None, "timeout", time.monotonic() - started
+            except Exception:
+                return sensor, None, "error", time.monotonic() - started
+
+    async def poll_cycle(self, limits=None):
+        """Poll every sensor once; returns the new cache dict"""
+        limits = limits or self._bus_limits()
+        started = time.monotonic()
+        results = await asyncio.gather(*(self._poll(sensor, limits) for sensor in self.sensors))
+        now = time.monotonic()
+        timestamp = datetime.now()
+
+        data = {"soil_moisture": [], "weather": {}, "last_update": timestamp}
+        counts = {"ok": 0, "timeout": 0, "error": 0, "stale": 0, "missing": 0}
+        slowest = 0.0
+        for sensor, values, outcome, elapsed in results:
+            counts[outcome] += 1
+            slowest = max(slowest, elapsed)
+            sensor_id = sensor["sensor_id"]
+            if values is not None:
+                reading = dict(values, sensor_id=sensor_id, location=sensor.get("location"),
+                               timestamp=timestamp.isoformat())
+                self.last_good[sensor_id] = (reading, now)
+            elif sensor_id in self.last_good:
+                reading = dict(self.last_good[sensor_id][0])
+            else:
+                counts["missing"] += 1
+                continue
+            age = now - self.last_good[sensor_id][1]
+            reading["stale"] = values is None or age > self.stale_after
+            reading["age_sec"] = round(age, 1)
+            if reading["stale"]:
+                counts["stale"] += 1
+            if sensor["kind"] == "weather":
+                data["weather"] = reading
+            else:
+                data["soil_moisture"].append(reading)
+
+        self.last_cycle = dict(counts, sensors=len(self.sensors), duration_sec=round(now - started, 3),
+                               slowest_sec=round(slowest, 3))
+        data["collection"] = self.last_cycle
+        if self.sink:
+            self.sink(data)
+        return data
+
+    async def _run(self):
+        self._stop_event = asyncio.Event()
+        limits = self._bus_limits()
+        while self.running:
+            try:
+                await self.poll_cycle(limits)
+            except Exception as e:
+                print(f"Data collection error: {e}")
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._run())
+        finally:
+            self._loop.close()
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._thread_main, daemon=True)
+        self.thread.start()
+        print(f"Async sensor collection started: {len(self.sensors)} sensors every {self.interval}s")
+
+    def stop(self):
+        self.running = False
+        if self._loop and self._stop_event:
+            try:
+                self._loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass    # loop already closed
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark async sensor polling against the simulated gateway")
+    parser.add_argument("--sensors", type=int, default=1000)
+    parser.add_argument("--buses", type=int, default=16)
+    parser.add_argument("--per-bus", type=int, default=8, help="concurrent transactions per bus")
+    parser.add_argument("--cycles", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    collector = AsyncSensorCollector(simulated_field(args.sensors, args.buses), SimulatedGateway(seed=1),
+                                     timeout=args.timeout, bus_concurrency={"default": args.per_bus})
+
+    async def bench():
+        limits = collector._bus_limits()
+        for cycle in range(args.cycles):
+            await collector.poll_cycle(limits)
+            stats = collector.last_cycle
+            print(f"cycle {cycle + 1}: {stats['sensors']} sensors in {stats['duration_sec'] * 1000:.0f} ms "
+                  f"(ok {stats['ok']}, timeout {stats['timeout']}, error {stats['error']}, stale {stats['stale']})")
+
+    asyncio.run(bench())
+
+
+if __name__ == "__main__":
+    main()
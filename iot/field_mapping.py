@@ -0,0 +1,138 @@
+"""
+Moisture raster of the field interpolated from point probes.
+
+For a given set of probes the interpolation is linear in the readings:
+grid = W @ values, with W (cells x probes) depending only on where the
+probes are. W, and the zone-averaging matrix folded into it, are built once
+per probe layout and cached, so a refresh is one matrix-vector product.
+The layout is the set of probes in the readings, so a probe appearing or
+disappearing switches to (or builds) another cached layout.
+
+Methods:
+    idw       inverse-distance weighting, weights 1 / d**power
+    kriging   ordinary kriging with an exponential or spherical variogram
+
+Coordinates are metres from the field's south-west corner; zones are
+rectangles {name: (x0, y0, x1, y1)}.
+"""
+from collections import OrderedDict
+import numpy as np
+from config.config import Config
+
+
+def _variogram(h, model, sill, range_, nugget):
+    if model == "spherical":
+        r = np.minimum(h / range_, 1.0)
+        gamma = nugget + sill * (1.5 * r - 0.5 * r ** 3)
+    else:
+        gamma = nugget + sill * (1.0 - np.exp(-3.0 * h / range_))
+    return np.where(h > 0, gamma, 0.0)
+
+
+class FieldMapper:
+    """Cached-weight interpolation of probe readings onto a raster grid"""
+
+    def __init__(self, coordinates, width=None, height=None, resolution=None, method=None, zones=None,
+                 power=None, variogram=None, cache_size=None):
+        self.coordinates = {sensor_id: (float(x), float(y)) for sensor_id, (x, y) in coordinates.items()}
+        self.width = width or Config.FIELD_WIDTH_M
+        self.height = height or Config.FIELD_HEIGHT_M
+        self.resolution = resolution or Config.FIELD_GRID_RESOLUTION_M
+        self.method = method or Config.FIELD_MAP_METHOD
+        if self.method not in ("idw", "kriging"):
+            raise ValueError(f"Unknown field mapping method '{self.method}'")
+        self.power = power or Config.FIELD_IDW_POWER
+        self.variogram = dict(Config.FIELD_KRIGING_VARIOGRAM, **(variogram or {}))
+        self.cache_size = cache_size or Config.FIELD_MAP_WEIGHT_CACHE
+
+        self.cols = max(1, int(np.ceil(self.width / self.resolution)))
+        self.rows = max(1, int(np.ceil(self.height / self.resolution)))
+        xs = (np.arange(self.cols) + 0.5) * self.resolution
+        ys = (np.arange(self.rows) + 0.5) * self.resolution
+        grid_x, grid_y = np.meshgrid(xs, ys)
+        self.cells = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+
+        zones = zones or Config.FIELD_ZONES or {"default": (0, 0, self.width, self.height)}
+        self.zone_names = list(zones)
+        masks = []
+        for name in self.zone_names:
+            x0, y0, x1, y1 = zones[name]
+            mask = ((self.cells[:, 0] >= x0) & (self.cells[:, 0] < x1) &
+                    (self.cells[:, 1] >= y0) & (self.cells[:, 1] < y1)).astype(float)
+            if not mask.any():
+                raise ValueError(f"Zone '{name}' contains no grid cells")
+            masks.append(mask / mask.sum())
+        self.zone_matrix = np.array(masks)             # zones x cells
+
+        self._weights = OrderedDict()                   # layout -> (W, zone weights)
+        self.stats = {'refreshes': 0, 'weight_builds': 0}
+
+    @classmethod
+    def from_sensors(cls, sensors, **kwargs):
+        """Mapper over the sensor specs that carry x/y coordinates, or None"""
+        coordinates = {sensor["sensor_id"]: (sensor["x"], sensor["y"])
+                       for sensor in sensors if "x" in sensor and "y" in sensor}
+        return cls(coordinates, **kwargs) if coordinates else None
+
+    def _idw_weights(self, points):
+        distances = np.linalg.norm(self.cells[:, None, :] - points[None, :, :], axis=2)
+        exact = distances < 1e-9
+        with np.errstate(divide="ignore"):
+            weights = 1.0 / distances ** self.power
+        hit = exact.any(axis=1)
+        weights[hit] = exact[hit]
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def _kriging_weights(self, points):
+        n = len(points)
+        params = (self.variogram["model"], self.variogram["sill"], self.variogram["range"],
+                  self.variogram["nugget"])
+        between = np.linalg.norm(points[:, None, :] - points[None, :, :], axis=2)
+        system = np.ones((n + 1, n + 1))
+        system[:n, :n] = _variogram(between, *params)
+        system[n, n] = 0.0
+        to_cells = np.linalg.norm(points[:, None, :] - self.cells[None, :, :], axis=2)
+        rhs = np.ones((n + 1, len(self.cells)))
+        rhs[:n] = _variogram(to_cells, *params)
+        try:
+            solution = np.linalg.solve(system, rhs)
+        except np.linalg.LinAlgError:
+            # Coincident probes make the system singular
+            solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+        return solution[:n].T
+
+    def weights(self, sensor_ids):
+        """(cell weights, zone weights) for this probe layout, built once and cached"""
+        layout = tuple(sensor_ids)
+        cached = self._weights.get(layout)
+        if cached is not None:
+            self._weights.move_to_end(layout)
+            return cached
+        points = np.array([self.coordinates[sensor_id] for sensor_id in layout])
+        if len(layout) == 1:
+            cell_weights = np.ones((len(self.cells), 1))
+        elif self.method == "kriging":
+            cell_weights = self._kriging_weights(points)
+        else:
+            cell_weights = self._idw_weights(points)
+        cached = (cell_weights, self.zone_matrix @ cell_weights)
+        self._weights[layout] = cached
+        self.stats['weight_builds'] += 1
+        while len(self._weights) > self.cache_size:
+            self._weights.popitem(last=False)
+        return cached
+
+    def refresh(self, readings):
+        """Interpolate {sensor_id: moisture}; returns {'grid', 'zones', 'sensor_count'}"""
+        sensor_ids = sorted(sensor_id for sensor_id in readings if sensor_id in self.coordinates)
+        if not sensor_ids:
+            return {"grid": None, "zones": {}, "sensor_count": 0}
+        cell_weights, zone_weights = self.weights(sensor_ids)
+        values = np.array([readings[sensor_id] for sensor_id in sensor_ids], dtype=float)
+        grid = (cell_weights @ values).reshape(self.rows, self.cols)
+        self.stats['refreshes'] += 1
+        return {
+            "grid": grid,
+            "zones": {name: round(float(value), 2) for name, value in zip(self.zone_names, zone_weights @ values)},
+            "sensor_count": len(sensor_ids)
+        }
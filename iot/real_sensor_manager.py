@@ -1,20 +1,59 @@
-import time
-from datetime import datetime
-import threading
-import random
+from types import MappingProxyType
+import numpy as np
+from iot.async_collector import AsyncSensorCollector
+from iot.field_mapping import FieldMapper
+from iot.running_stats import RunningStats
+
+def _variability_level(std_dev):
+    return "high" if std_dev > 10 else "medium" if std_dev > 5 else "low"
+
+
+def _thaw(value):
+    """Plain dicts/lists copy of a frozen snapshot value"""
+    if isinstance(value, MappingProxyType):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
 
 class RealSensorManager:
-    def __init__(self):
+    """Field sensor cache fed by an AsyncSensorCollector.
+
+    Each finished cycle is frozen (read-only mappings and tuples) together
+    with its precomputed field statistics and published by replacing one
+    reference, so readers take no lock, never see a half-applied cycle and
+    answer average/variability queries in O(1). The frozen snapshot stays
+    internal: get_latest_sensor_data() hands out plain-dict copies. Per field
+    section the collection thread also keeps Welford running moisture
+    statistics over every fresh reading since start, and, for probes with
+    coordinates, interpolates the latest readings into a moisture map with
+    zone averages.
+    """
+
+    def __init__(self, collector=None, field_mapper=None):
         print("Initializing Real IoT Sensor Manager...")
         
-        # Sensor data cache
-        self.sensor_data = {
-            "soil_moisture": [],
-            "weather": {},
-            "last_update": None
-        }
+        # Latest published snapshot (immutable, replaced wholesale)
+        self._snapshot = MappingProxyType({
+            "soil_moisture": (),
+            "weather": MappingProxyType({}),
+            "last_update": None,
+            "field": MappingProxyType({"variability": "unknown"}),
+            "average_soil_moisture": None,
+            "sections": MappingProxyType({}),
+            "moisture_map": None,
+            "zones": MappingProxyType({})
+        })
+        # Written only by the collection thread
+        self.section_stats = {}
         
         # Data collection settings
+        self.collector = collector or AsyncSensorCollector()
+        self.collector.sink = self._publish
+        self.field_mapper = field_mapper or FieldMapper.from_sensors(self.collector.sensors)
         self.is_collecting = False
         self.collection_thread = None
         
@@ -26,81 +65,103 @@ class RealSensorManager:
             return
         
         self.is_collecting = True
-        self.collection_thread = threading.Thread(target=self._collection_loop, daemon=True)
-        self.collection_thread.start()
+        self.collector.start()
+        self.collection_thread = self.collector.thread
         print("IoT data collection started")
     
     def stop_data_collection(self):
         """Stop sensor data collection"""
         self.is_collecting = False
+        self.collector.stop()
         print("IoT data collection stopped")
     
-    def _collection_loop(self):
-        """Main data collection loop"""
-        while self.is_collecting:
-            try:
-                # Simulate data collection
-                sensor_data = self._get_simulated_sensor_data()
-                
-                # Update cache
-                self.sensor_data.update(sensor_data)
-                self.sensor_data["last_update"] = datetime.now()
-                
-                print(f"Sensor data updated: {len(self.sensor_data["soil_moisture"])} soil sensors")
-                
-            except Exception as e:
-                print(f"Data collection error: {e}")
-            
-            time.sleep(10)  # Update every 10 seconds for testing
+    def _publish(self, sensor_data):
+        """Freeze a finished collection cycle with its statistics and swap it in"""
+        readings = tuple(MappingProxyType(dict(reading)) for reading in sensor_data["soil_moisture"])
+        fresh = [reading for reading in readings if not reading.get("stale")]
+        
+        for reading in fresh:
+            section = reading.get("location") or reading["sensor_id"]
+            stats = self.section_stats.get(section)
+            if stats is None:
+                stats = self.section_stats[section] = RunningStats()
+            stats.update(reading["moisture_percentage"])
+        
+        # Spatial spread of this cycle (all probes if every one is stale)
+        field = RunningStats()
+        for reading in fresh or readings:
+            field.update(reading["moisture_percentage"])
+        if field.count:
+            field_summary = {
+                "average_moisture": round(field.mean, 2),
+                "standard_deviation": round(field.std, 2),
+                "variability_level": _variability_level(field.std),
+                "sensor_count": field.count
+            }
+        else:
+            field_summary = {"variability": "unknown"}
+        
+        snapshot = dict(sensor_data)
+        snapshot["soil_moisture"] = readings
+        snapshot["weather"] = MappingProxyType(dict(sensor_data.get("weather", {})))
+        snapshot["collection"] = MappingProxyType(dict(sensor_data.get("collection", {})))
+        snapshot["field"] = MappingProxyType(field_summary)
+        snapshot["average_soil_moisture"] = field.mean if field.count else None
+        snapshot["sections"] = MappingProxyType({
+            section: MappingProxyType(stats.summary()) for section, stats in self.section_stats.items()
+        })
+        snapshot["moisture_map"] = None
+        snapshot["zones"] = MappingProxyType({})
+        if self.field_mapper and readings:
+            # Stale probes keep their last good value so the layout (and its
+            # cached weights) only changes when a probe appears or disappears
+            field_map = self.field_mapper.refresh({r["sensor_id"]: r["moisture_percentage"] for r in readings})
+            if field_map["grid"] is not None:
+                field_map["grid"].flags.writeable = False
+                snapshot["moisture_map"] = field_map["grid"]
+                snapshot["zones"] = MappingProxyType(field_map["zones"])
+        self._snapshot = MappingProxyType(snapshot)
+        
+        stats = snapshot["collection"]
+        print(f"Sensor data updated: {len(readings)} soil sensors "
+              f"({stats.get('stale', 0)} stale, {stats.get('duration_sec', 0) * 1000:.0f} ms)")
+    
+    def to_dict(self):
+        """Latest cycle as a new plain dict (lists for readings and the moisture map)"""
+        return _thaw(self._snapshot)
     
     def get_latest_sensor_data(self):
-        """Get the latest collected sensor data"""
-        return self.sensor_data.copy()
+        """Get the latest collected sensor data.
+
+        Returns a fresh mutable copy of plain dicts and lists, safe to change
+        or json.dumps (except 'last_update', a datetime as before).
+        """
+        return self.to_dict()
     
     def get_average_soil_moisture(self):
         """Get average soil moisture across all sensors"""
-        if not self.sensor_data["soil_moisture"]:
-            return 50.0  # Default value
-        
-        moistures = [sensor["moisture_percentage"] for sensor in self.sensor_data["soil_moisture"]]
-        return sum(moistures) / len(moistures)
+        average = self._snapshot["average_soil_moisture"]
+        return 50.0 if average is None else average  # Default value
     
     def get_field_variability(self):
         """Analyze field variability across sensors"""
-        if not self.sensor_data["soil_moisture"]:
-            return {"variability": "unknown"}
-        
-        moistures = [sensor["moisture_percentage"] for sensor in self.sensor_data["soil_moisture"]]
-        avg_moisture = sum(moistures) / len(moistures)
-        variance = sum((m - avg_moisture) ** 2 for m in moistures) / len(moistures)
-        std_dev = variance ** 0.5
-        
-        return {
-            "average_moisture": round(avg_moisture, 2),
-            "standard_deviation": round(std_dev, 2),
-            "variability_level": "high" if std_dev > 10 else "medium" if std_dev > 5 else "low",
-            "sensor_count": len(moistures)
-        }
+        return dict(self._snapshot["field"])
     
-    def _get_simulated_sensor_data(self):
-        """Generate simulated sensor data"""
-        return {
-            "soil_moisture": [
-                {
-                    "sensor_id": f"soil_{i+1}",
-                    "location": f"field_section_{i+1}",
-                    "moisture_percentage": round(random.uniform(20, 80), 1),
-                    "temperature": round(random.uniform(18, 32), 1),
-                    "timestamp": datetime.now().isoformat()
-                }
-                for i in range(4)
-            ],
-            "weather": {
-                "temperature": round(random.uniform(20, 35), 1),
-                "humidity": round(random.uniform(40, 90), 1),
-                "timestamp": datetime.now().isoformat()
-            }
-        }
+    def get_zone_moisture(self, zone=None):
+        """Interpolated average moisture per zone (or of one zone, None if unmapped)"""
+        zones = self._snapshot["zones"]
+        return dict(zones) if zone is None else zones.get(zone)
+    
+    def get_moisture_map(self):
+        """Latest interpolated moisture raster (rows x cols, read-only), or None"""
+        return self._snapshot["moisture_map"]
+    
+    def get_section_statistics(self, section=None):
+        """Running moisture statistics for one field section, or all of them"""
+        sections = self._snapshot["sections"]
+        if section is None:
+            return {name: dict(stats) for name, stats in sections.items()}
+        return dict(sections.get(section, {"count": 0}))
 
 class HardwareInterface:
     def __init__(self):
@@ -1,3 +1,4 @@
 from .system_logger import SystemLogger
+from .state_journal import StateJournal, get_state_journal
 
-__all__ = ['SystemLogger']
+__all__ = ['SystemLogger', 'StateJournal', 'get_state_journal']
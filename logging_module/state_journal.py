@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+import time
+from config.config import Config
+
+
+def _empty_state():
+    return {'relays': {}, 'controller': {}, 'timers': {}, 'events': []}
+
+
+class StateJournal:
+    """Write-ahead journal of controller and actuator state with snapshot compaction.
+
+    Every change is appended to journal.log as one JSON line
+    ({seq, t, type, data}) and fsynced before append() returns; the same
+    change is applied to an in-memory state:
+
+        relays      {bank name: applied bitmask}
+        controller  {field: value} (last_irrigation, auto_mode, override_active)
+        timers      {name: wall-clock deadline}, None once cancelled or fired
+        events      last STATE_JOURNAL_EVENT_HISTORY irrigation events
+
+    Every `compact_every` appends the state is written to snapshot.json
+    (tmp file + fsync + rename) and the journal is truncated, so recovery
+    reads one small snapshot and a bounded tail of entries. A torn last line
+    from a crash mid-append is dropped.
+    """
+
+    SNAPSHOT_FILE = 'snapshot.json'
+    JOURNAL_FILE = 'journal.log'
+
+    def __init__(self, directory=None, compact_every=None, fsync=None):
+        self.directory = directory or Config.STATE_JOURNAL_DIR
+        self.compact_every = compact_every or Config.STATE_JOURNAL_COMPACT_EVERY
+        self.fsync = Config.STATE_JOURNAL_FSYNC if fsync is None else fsync
+        self.snapshot_path = os.path.join(self.directory, self.SNAPSHOT_FILE)
+        self.journal_path = os.path.join(self.directory, self.JOURNAL_FILE)
+        self._lock = threading.Lock()
+        self.state = _empty_state()
+        self.seq = 0
+        self._since_compaction = 0
+        self.stats = {'appends': 0, 'compactions': 0, 'recovered_entries': 0, 'recovery_ms': 0.0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._load()
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+
+    def _load(self):
+        started = time.perf_counter()
+        if os.path.exists(self.snapshot_path):
+            try:
+                with open(self.snapshot_path, encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                self.seq = snapshot['seq']
+                self.state.update(snapshot['state'])
+            except (OSError, ValueError, KeyError) as e:
+                print(f"State snapshot unreadable, replaying journal only: {e}")
+
+        replayed = 0
+        if os.path.exists(self.journal_path):
+            good_bytes = 0
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        print("State journal: dropping torn entry left by a crash")
+                        break
+                    good_bytes += len(line)
+                    if entry['seq'] <= self.seq:
+                        continue    # already in the snapshot
+                    self._apply(entry['type'], entry['data'])
+                    self.seq = entry['seq']
+                    replayed += 1
+            if good_bytes < os.path.getsize(self.journal_path):
+                with open(self.journal_path, 'r+b') as f:
+                    f.truncate(good_bytes)
+        self._since_compaction = replayed
+
+        self.stats['recovered_entries'] = replayed
+        self.stats['recovery_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        print(f"State journal recovered in {self.stats['recovery_ms']:.1f} ms "
+              f"(snapshot + {replayed} entries)")
+
+    def _apply(self, kind, data):
+        state = self.state
+        if kind == 'relay':
+            state['relays'][data['bank']] = data['mask']
+        elif kind == 'controller':
+            state['controller'].update(data)
+        elif kind == 'timer':
+            if data['deadline'] is None:
+                state['timers'].pop(data['name'], None)
+            else:
+                state['timers'][data['name']] = data['deadline']
+        elif kind == 'event':
+            state['events'].append(data)
+            del state['events'][:-Config.STATE_JOURNAL_EVENT_HISTORY]
+
+    def append(self, kind, data):
+        """Durably record one change ('relay', 'controller', 'timer' or 'event')"""
+        with self._lock:
+            self.seq += 1
+            line = json.dumps({'seq': self.seq, 't': time.time(), 'type': kind, 'data': data},
+                              default=str, ensure_ascii=False)
+            self._file.write(line + '\n')
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            # Keep memory in line with what a replay of the file would give
+            self._apply(kind, json.loads(line)['data'])
+            self.stats['appends'] += 1
+            self._since_compaction += 1
+            if self._since_compaction >= self.compact_every:
+                self._compact_locked()
+
+    def compact(self):
+        with self._lock:
+            self._compact_locked()
+
+    def _compact_locked(self):
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'seq': self.seq, 'state': self.state}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # A crash before this truncate is harmless: entries <= seq are skipped on load
+        self._file.close()
+        self._file = open(self.journal_path, 'w', encoding='utf-8')
+        self._since_compaction = 0
+        self.stats['compactions'] += 1
+
+    def get(self, section):
+        """Copy of one recovered state section"""
+        with self._lock:
+            return json.loads(json.dumps(self.state[section]))
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['seq'] = self.seq
+            stats['pending_entries'] = self._since_compaction
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._compact_locked()
+            self._file.close()
+
+
+_default_journal = None
+_default_journal_lock = threading.Lock()
+
+
+def get_state_journal():
+    """Process-wide journal, or None when STATE_JOURNAL_ENABLED is off"""
+    global _default_journal
+    if not Config.STATE_JOURNAL_ENABLED:
+        return None
+    with _default_journal_lock:
+        if _default_journal is None:
+            _default_journal = StateJournal()
+        return _default_journal
@@ -1,4 +1,5 @@
 from .smart_controller import SmartIrrigationController
 from .command_fusion import CommandFusionProcessor
+from .fusion_engine import FusionEngine, build_fusion_engine
 
-__all__ = ['SmartIrrigationController', 'CommandFusionProcessor']
+__all__ = ['SmartIrrigationController', 'CommandFusionProcessor', 'FusionEngine', 'build_fusion_engine']
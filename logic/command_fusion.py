@@ -1,5 +1,7 @@
 import time
+from collections import deque
 from datetime import datetime
+from itertools import islice
 from config.config import Config
 
 class CommandFusionProcessor:
@@ -9,7 +11,11 @@ class CommandFusionProcessor:
         self.gesture_processor = gesture_processor
         self.smart_controller = smart_controller
         
-        self.command_history = []
+        self.command_history = deque(maxlen=self.config.COMMAND_HISTORY_SIZE)
+        # Running counts over command_history, updated on append/evict
+        self.source_counts = {}
+        self.action_counts = {}
+        self.successful_commands = 0
         self.last_voice_command = None
         self.last_gesture_command = None
         self.pending_confirmation = None
@@ -23,6 +29,14 @@ class CommandFusionProcessor:
         action_taken = None
         source = None
         confidence = 0.0
+        # Multi-stream voice commands carry the zone/stream they were heard on
+        zone = voice_command.get('zone') if isinstance(voice_command, dict) else None
+        stream_id = voice_command.get('stream_id') if isinstance(voice_command, dict) else None
+        # Multi-camera gestures carry the camera and zone they were seen in
+        if isinstance(gesture_command, dict) and not voice_command:
+            zone = gesture_command.get('zone')
+            stream_id = gesture_command.get('camera_id')
+            gesture_command = gesture_command.get('gesture')
         
         # Priority system: Voice > Gesture > Smart Logic
         
@@ -48,17 +62,27 @@ class CommandFusionProcessor:
                     source = "SMART_LOGIC"
                     confidence = 0.8
         
+        return self.record_action(action_taken, source, confidence, voice_command, gesture_command,
+                                  zone, stream_id, timestamp)
+    
+    def record_action(self, action_taken, source, confidence, voice_command=None, gesture_command=None,
+                      zone=None, stream_id=None, timestamp=None):
+        """Apply confirmation rules to an action, log it and return the fusion result"""
+        timestamp = timestamp or datetime.now()
         # Handle confirmations and conflicts
         if action_taken:
             action_taken = self._handle_confirmations(action_taken, source)
             
         # Log the command
-        self._log_command(voice_command, gesture_command, action_taken, source, confidence, timestamp)
+        self._log_command(voice_command, gesture_command, action_taken, source, confidence, timestamp,
+                          zone, stream_id)
         
         return {
             'action': action_taken,
             'source': source,
             'confidence': confidence,
+            'zone': zone,
+            'stream_id': stream_id,
             'timestamp': timestamp,
             'requires_confirmation': self.pending_confirmation is not None
         }
@@ -121,7 +145,8 @@ class CommandFusionProcessor:
         
         return action
     
-    def _log_command(self, voice_cmd, gesture_cmd, action, source, confidence, timestamp):
+    def _log_command(self, voice_cmd, gesture_cmd, action, source, confidence, timestamp,
+                     zone=None, stream_id=None):
         """Log all commands and actions"""
         log_entry = {
             'timestamp': timestamp.isoformat(),
@@ -130,40 +155,49 @@ class CommandFusionProcessor:
             'action_taken': action,
             'source': source,
             'confidence': confidence,
-            'system_status': self.smart_controller.get_system_status()
+            'zone': zone,
+            'stream_id': stream_id,
+            # Reference a recent status snapshot instead of re-reading sensors/weather per command
+            'status_snapshot_id': self.smart_controller.current_status_snapshot_id()
         }
         
+        if len(self.command_history) == self.command_history.maxlen:
+            self._count_entry(self.command_history[0], -1)
         self.command_history.append(log_entry)
-        
-        # Keep only last 100 entries
-        if len(self.command_history) > 100:
-            self.command_history = self.command_history[-100:]
+        self._count_entry(log_entry, 1)
+    
+    def _count_entry(self, entry, delta):
+        source = entry['source']
+        self.source_counts[source] = self.source_counts.get(source, 0) + delta
+        if not self.source_counts[source]:
+            del self.source_counts[source]
+        action = entry['action_taken']
+        if action:
+            self.action_counts[action] = self.action_counts.get(action, 0) + delta
+            if not self.action_counts[action]:
+                del self.action_counts[action]
+            self.successful_commands += delta
     
     def get_recent_commands(self, count=10):
         """Get recent command history"""
-        return self.command_history[-count:] if self.command_history else []
+        recent = list(islice(reversed(self.command_history), count))
+        recent.reverse()
+        return recent
+    
+    def get_command_status(self, entry):
+        """The system status snapshot a logged command refers to (None if aged out)"""
+        return self.smart_controller.get_status_snapshot(entry.get('status_snapshot_id'))
     
     def get_command_statistics(self):
         """Get command usage statistics"""
         if not self.command_history:
             return {}
         
-        sources = {}
-        actions = {}
-        
-        for entry in self.command_history:
-            source = entry.get('source', 'UNKNOWN')
-            action = entry.get('action_taken', 'NONE')
-            
-            sources[source] = sources.get(source, 0) + 1
-            if action:
-                actions[action] = actions.get(action, 0) + 1
-        
         return {
             'total_commands': len(self.command_history),
-            'sources': sources,
-            'actions': actions,
-            'success_rate': len([e for e in self.command_history if e.get('action_taken')]) / len(self.command_history)
+            'sources': dict(self.source_counts),
+            'actions': dict(self.action_counts),
+            'success_rate': self.successful_commands / len(self.command_history)
         }
     
     def reset_pending_confirmation(self):
@@ -0,0 +1,299 @@
+import queue
+import threading
+import time
+from collections import deque
+from config.config import Config
+from voice.intent_matcher import get_intent_matcher
+
+
+# Which way an action moves the irrigation; stops are never suppressed
+START_ACTIONS = {'IRRIGATION_START', 'AUTO_IRRIGATION_START', 'IRRIGATION_TIMED', 'OVERRIDE_START'}
+STOP_ACTIONS = {'IRRIGATION_STOP', 'EMERGENCY_STOP'}
+GESTURE_ACTIONS = {'swipe_right': 'IRRIGATION_START', 'swipe_left': 'IRRIGATION_STOP',
+                   'peace_sign': 'EMERGENCY_STOP'}
+VOICE_INTENT_ACTIONS = {'start': 'IRRIGATION_START', 'stop': 'IRRIGATION_STOP'}
+
+
+def _direction(action):
+    if action in START_ACTIONS:
+        return 'start'
+    if action in STOP_ACTIONS:
+        return 'stop'
+    return None
+
+
+def _percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else None
+
+
+class FusionEngine:
+    """Event-driven fusion of any number of command streams.
+
+    Each input stream (voice, gesture, API, auto logic, ...) is consumed by
+    its own feeder thread and funnelled into one inbox; a single dispatcher
+    turns events into actions as they arrive, so a command never waits for
+    another stream's poll. Recent actions are kept for FUSION_WINDOW_SEC:
+
+    - a start from a lower-priority stream is suppressed when a
+      higher-priority stream stopped the same zone inside the window
+      (conflict). Handlers act on the actuator, so the decision uses each
+      stream's `classify` prediction of the action before the handler runs;
+    - stop and emergency-stop events are never suppressed, and events whose
+      action can't be predicted (status, confirm, ...) are not either;
+    - while a critical action awaits confirmation nothing is suppressed, so
+      a thumbs-up a second after "emergency stop" confirms it through
+      CommandFusionProcessor's confirmation rules.
+
+    Results (the CommandFusionProcessor result dict plus event timings) go to
+    get_action() and to an optional on_action callback.
+    """
+
+    def __init__(self, fusion_processor, window_sec=None, on_action=None):
+        self.fusion = fusion_processor
+        self.window_sec = Config.FUSION_WINDOW_SEC if window_sec is None else window_sec
+        self.on_action = on_action
+        self.sources = {}
+        self.inbox = queue.Queue()
+        self.action_queue = queue.Queue()
+        self.recent = deque()
+        self.running = False
+        self.threads = []
+
+        self.decision_times = deque(maxlen=1000)    # monotonic time of each decision
+        self.queue_waits = deque(maxlen=500)
+        self.decision_latency = deque(maxlen=500)
+        self.counts = {'events': 0, 'actions': 0, 'suppressed': 0, 'errors': 0}
+
+    def add_source(self, name, source, handler, priority=None, confidence=None, kind=None, interval=0.02,
+                   classify=None):
+        """Register an input stream.
+
+        source: a queue-like object (get(timeout=...)) or a callable returning
+                the next item or None, polled every `interval` s while idle;
+                None for push-only streams fed through submit().
+        handler: item -> action name or None (e.g. a processor method).
+        classify: item -> the action the handler would take, without side
+                  effects; used for conflict suppression (None: never suppressed).
+        """
+        kind = kind or name
+        self.sources[name] = {
+            'source': source,
+            'handler': handler,
+            'classify': classify,
+            'kind': kind,
+            'priority': Config.FUSION_PRIORITIES.get(kind, 0) if priority is None else priority,
+            'confidence': Config.FUSION_CONFIDENCE.get(kind, 0.5) if confidence is None else confidence,
+            'interval': interval,
+            'events': 0,
+            'actions': 0,
+            'suppressed': 0
+        }
+        if self.running and source is not None:
+            self._start_feeder(name)
+
+    def submit(self, name, item):
+        """Push an event for a registered stream (API requests, tests)"""
+        self.inbox.put((name, item, time.monotonic()))
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        for name, spec in self.sources.items():
+            if spec['source'] is not None:
+                self._start_feeder(name)
+        dispatcher = threading.Thread(target=self._dispatch_loop, daemon=True)
+        dispatcher.start()
+        self.threads.append(dispatcher)
+        print(f"Fusion engine started with {len(self.sources)} input streams")
+
+    def _start_feeder(self, name):
+        thread = threading.Thread(target=self._feed, args=(name,), daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def _feed(self, name):
+        spec = self.sources[name]
+        source = spec['source']
+        blocking = hasattr(source, 'get')
+        while self.running:
+            try:
+                if blocking:
+                    try:
+                        item = source.get(timeout=0.5)
+                    except queue.Empty:
+                        continue
+                else:
+                    item = source()
+                    if item is None:
+                        time.sleep(spec['interval'])
+                        continue
+                self.inbox.put((name, item, time.monotonic()))
+            except Exception as e:
+                print(f"Fusion source '{name}' error: {e}")
+                time.sleep(0.5)
+
+    def _dispatch_loop(self):
+        while self.running:
+            try:
+                name, item, enqueued_at = self.inbox.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._dispatch(name, item, enqueued_at)
+
+    def _suppressed_by(self, spec, item, zone, now):
+        """The recent higher-priority action this event conflicts with, if any"""
+        while self.recent and now - self.recent[0]['at'] > self.window_sec:
+            self.recent.popleft()
+        if self.fusion.pending_confirmation or not spec['classify']:
+            return None
+        try:
+            direction = _direction(spec['classify'](item))
+        except Exception:
+            return None
+        if direction != 'start':
+            return None
+        zone = zone or 'default'
+        for recent in reversed(self.recent):
+            if (recent['priority'] > spec['priority'] and (recent['zone'] or 'default') == zone
+                    and _direction(recent['action']) == 'stop'):
+                return recent
+        return None
+
+    def _dispatch(self, name, item, enqueued_at):
+        started = time.monotonic()
+        spec = self.sources.get(name)
+        if spec is None:
+            return None
+        self.queue_waits.append(started - enqueued_at)
+        self.counts['events'] += 1
+        spec['events'] += 1
+
+        zone = stream_id = None
+        if isinstance(item, dict):
+            zone = item.get('zone')
+            stream_id = item.get('stream_id') or item.get('camera_id')
+
+        blocking = self._suppressed_by(spec, item, zone, started)
+        if blocking:
+            self.counts['suppressed'] += 1
+            spec['suppressed'] += 1
+            print(f"Fusion: {name} event suppressed by {blocking['source']} action {blocking['action']}")
+            result = None
+        else:
+            try:
+                action = spec['handler'](item)
+            except Exception as e:
+                print(f"Fusion handler '{name}' error: {e}")
+                self.counts['errors'] += 1
+                action = None
+            result = self.fusion.record_action(
+                action, name.upper(), spec['confidence'],
+                voice_command=item if spec['kind'] == 'voice' else None,
+                gesture_command=item if spec['kind'] == 'gesture' else None,
+                zone=zone, stream_id=stream_id
+            )
+            if result['action']:
+                self.counts['actions'] += 1
+                spec['actions'] += 1
+                self.recent.append({'at': started, 'source': name, 'priority': spec['priority'],
+                                    'zone': zone, 'action': result['action']})
+
+        finished = time.monotonic()
+        self.decision_times.append(finished)
+        self.decision_latency.append(finished - started)
+        if result and result['action']:
+            result['queue_wait_ms'] = round((started - enqueued_at) * 1000, 2)
+            result['decision_ms'] = round((finished - started) * 1000, 2)
+            self.action_queue.put(result)
+            if self.on_action:
+                self.on_action(result)
+        return result
+
+    def get_action(self, timeout=None):
+        """Next emitted action result, or None"""
+        try:
+            return self.action_queue.get(timeout=timeout) if timeout else self.action_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    def get_stats(self, window=10.0):
+        """Decisions per second (over the last `window` s), queue wait and decision latency"""
+        now = time.monotonic()
+        recent = sum(1 for t in self.decision_times if now - t <= window)
+        waits = list(self.queue_waits)
+        latency = list(self.decision_latency)
+        stats = dict(self.counts)
+        stats['decisions_per_sec'] = round(recent / window, 2)
+        stats['inbox_depth'] = self.inbox.qsize()
+        if waits:
+            stats['queue_wait_mean_ms'] = round(sum(waits) / len(waits) * 1000, 2)
+            stats['queue_wait_p95_ms'] = round(_percentile(waits, 0.95) * 1000, 2)
+        if latency:
+            stats['decision_mean_ms'] = round(sum(latency) / len(latency) * 1000, 2)
+            stats['decision_p95_ms'] = round(_percentile(latency, 0.95) * 1000, 2)
+        stats['sources'] = {
+            name: {key: spec[key] for key in ('kind', 'priority', 'events', 'actions', 'suppressed')}
+            for name, spec in self.sources.items()
+        }
+        return stats
+
+    def stop(self):
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout=1.0)
+        self.threads = []
+        print("Fusion engine stopped")
+
+
+def build_fusion_engine(fusion_processor, voice_source=None, gesture_source=None, auto_interval=None,
+                        on_action=None):
+    """FusionEngine wired with the standard voice, gesture, API and auto-logic streams.
+
+    voice_source / gesture_source: anything add_source() accepts, e.g. a
+    recognizer's command_queue / gesture_queue or a service's get_* method.
+    """
+    engine = FusionEngine(fusion_processor, on_action=on_action)
+    voice_processor = fusion_processor.voice_processor
+    gesture_processor = fusion_processor.gesture_processor
+    smart_controller = fusion_processor.smart_controller
+
+    def gesture_name(item):
+        return item.get('gesture') if isinstance(item, dict) else item
+
+    def handle_gesture(item):
+        return gesture_processor.process_gesture(gesture_name(item))
+
+    def classify_gesture(item):
+        return GESTURE_ACTIONS.get(gesture_name(item))
+
+    def classify_voice(item):
+        match = get_intent_matcher().match(item['text'], item.get('language')) if item else None
+        return VOICE_INTENT_ACTIONS.get(match.intent) if match else None
+
+    def handle_api(item):
+        return item.get('action') if isinstance(item, dict) else item
+
+    auto_interval = auto_interval or Config.FUSION_AUTO_INTERVAL_SEC
+    next_auto_check = [0.0]
+
+    def poll_auto():
+        now = time.monotonic()
+        if not smart_controller.auto_mode or now < next_auto_check[0]:
+            return None
+        next_auto_check[0] = now + auto_interval
+        return True
+
+    def handle_auto(_):
+        return "AUTO_IRRIGATION_START" if smart_controller.start_automatic_irrigation() else None
+
+    if voice_source is not None:
+        engine.add_source('voice', voice_source, voice_processor.process_multilingual_command,
+                          classify=classify_voice)
+    if gesture_source is not None:
+        engine.add_source('gesture', gesture_source, handle_gesture, classify=classify_gesture)
+    engine.add_source('api', None, handle_api, classify=handle_api)
+    engine.add_source('smart_logic', poll_auto, handle_auto, interval=0.5,
+                      classify=lambda _: 'AUTO_IRRIGATION_START')
+    return engine
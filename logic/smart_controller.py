@@ -1,10 +1,15 @@
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, time as dtime
 from config.config import Config
+from logging_module.state_journal import get_state_journal
 import threading
 
+SAFETY_TIMER = 'max_irrigation_duration'
+
 class SmartIrrigationController:
-    def __init__(self, soil_sensor, weather_sensor, actuator, flow_sensor=None, pressure_sensor=None):
+    def __init__(self, soil_sensor, weather_sensor, actuator, flow_sensor=None, pressure_sensor=None,
+                 journal=None):
         self.config = Config()
         self.soil_sensor = soil_sensor
         self.weather_sensor = weather_sensor
@@ -12,14 +17,81 @@ class SmartIrrigationController:
         self.flow_sensor = flow_sensor  # Optional, for future hardware
         self.pressure_sensor = pressure_sensor  # Optional, for future hardware
         
+        self.journal = journal if journal is not None else get_state_journal()
         self.last_irrigation = None
         self.irrigation_history = []
-        self.override_active = False
+        self._override_active = False
         self.auto_mode = True
         self.irrigation_timer = None
         
+        # get_system_status() results, by snapshot id
+        self.status_snapshots = OrderedDict()
+        self._snapshot_seq = 0
+        self._latest_snapshot_at = None
+        self._snapshot_lock = threading.Lock()
+        
+        if self.journal:
+            self._recover()
         print("Smart irrigation controller initialized")
     
+    @property
+    def override_active(self):
+        return self._override_active
+    
+    @override_active.setter
+    def override_active(self, value):
+        if value != self._override_active:
+            self._override_active = value
+            self._journal('controller', {'override_active': value})
+    
+    def _journal(self, kind, data):
+        if self.journal:
+            try:
+                self.journal.append(kind, data)
+            except Exception as e:
+                print(f"State journal write failed: {e}")
+    
+    def _recover(self):
+        """Restore flags, history and the safety timer from the state journal"""
+        state = self.journal.get('controller')
+        if state.get('last_irrigation'):
+            self.last_irrigation = datetime.fromisoformat(state['last_irrigation'])
+        self._override_active = state.get('override_active', False)
+        self.auto_mode = state.get('auto_mode', True)
+        for event in self.journal.get('events'):
+            event['timestamp'] = datetime.fromisoformat(event['timestamp'])
+            self.irrigation_history.append(event)
+        
+        deadline = self.journal.get('timers').get(SAFETY_TIMER)
+        if deadline is not None:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                print("Recovered safety timer already expired, stopping irrigation")
+                self._auto_stop_due_to_timeout()
+            else:
+                print(f"Recovered safety timer: {remaining / 60:.1f} min remaining")
+                self._arm_safety_timer(remaining)
+    
+    def _arm_safety_timer(self, seconds=None):
+        """(Re)start the max irrigation duration timer and journal its deadline"""
+        if seconds is None:
+            max_duration = self._seasonal_adjust('MAX_IRRIGATION_DURATION_MIN', self.config.MAX_IRRIGATION_DURATION_MIN)
+            if not isinstance(max_duration, (int, float)) or max_duration is None:
+                max_duration = int(self.config.MAX_IRRIGATION_DURATION_MIN)
+            seconds = max_duration * 60
+        if self.irrigation_timer:
+            self.irrigation_timer.cancel()
+        self.irrigation_timer = threading.Timer(seconds, self._auto_stop_due_to_timeout)
+        self.irrigation_timer.daemon = True
+        self.irrigation_timer.start()
+        self._journal('timer', {'name': SAFETY_TIMER, 'deadline': time.time() + seconds})
+    
+    def _cancel_safety_timer(self):
+        if self.irrigation_timer:
+            self.irrigation_timer.cancel()
+            self.irrigation_timer = None
+        self._journal('timer', {'name': SAFETY_TIMER, 'deadline': None})
+    
     def _get_season(self):
         """Determine current season (simple: May-Sep=summer, Nov-Feb=winter, else default)"""
         month = datetime.now().month
@@ -124,17 +196,11 @@ class SmartIrrigationController:
         should_irrigate, reason = self.should_irrigate_automatically()
         if should_irrigate:
             if self.actuator.turn_on():
-                self.last_irrigation = datetime.now()
+                self._set_last_irrigation(datetime.now())
                 self._log_irrigation_event("AUTO_START", reason)
                 print(f"Auto irrigation started: {reason}")
                 # --- Max duration safety timer ---
-                max_duration = self._seasonal_adjust('MAX_IRRIGATION_DURATION_MIN', self.config.MAX_IRRIGATION_DURATION_MIN)
-                if not isinstance(max_duration, (int, float)) or max_duration is None:
-                    max_duration = int(self.config.MAX_IRRIGATION_DURATION_MIN)
-                if self.irrigation_timer:
-                    self.irrigation_timer.cancel()
-                self.irrigation_timer = threading.Timer(max_duration*60, self._auto_stop_due_to_timeout)
-                self.irrigation_timer.start()
+                self._arm_safety_timer()
                 return True
         else:
             print(f"Auto irrigation skipped: {reason}")
@@ -161,10 +227,15 @@ class SmartIrrigationController:
         
         if len(self.irrigation_history) > 100:
             self.irrigation_history = self.irrigation_history[-100:]
+        self._journal('event', dict(event, timestamp=event['timestamp'].isoformat()))
+    
+    def _set_last_irrigation(self, when):
+        self.last_irrigation = when
+        self._journal('controller', {'last_irrigation': when.isoformat()})
     
     def get_system_status(self):
-        """Get comprehensive system status"""
-        return {
+        """Get comprehensive system status (also stored as a numbered snapshot)"""
+        status = {
             'irrigation_active': self.actuator.is_on(),
             'auto_mode': self.auto_mode,
             'override_active': self.override_active,
@@ -176,13 +247,38 @@ class SmartIrrigationController:
             'actuator_status': self.actuator.get_status(),
             'recent_events': self.irrigation_history[-5:] if self.irrigation_history else []
         }
+        with self._snapshot_lock:
+            self._snapshot_seq += 1
+            status['snapshot_id'] = self._snapshot_seq
+            status['snapshot_time'] = datetime.now().isoformat()
+            self.status_snapshots[self._snapshot_seq] = status
+            self._latest_snapshot_at = time.monotonic()
+            while len(self.status_snapshots) > self.config.STATUS_SNAPSHOT_HISTORY:
+                self.status_snapshots.popitem(last=False)
+        return status
+    
+    def current_status_snapshot_id(self, max_age=None):
+        """Id of a status snapshot at most max_age seconds old; reads sensors only if none is"""
+        max_age = self.config.STATUS_SNAPSHOT_MAX_AGE_SEC if max_age is None else max_age
+        with self._snapshot_lock:
+            if self._latest_snapshot_at is not None and time.monotonic() - self._latest_snapshot_at <= max_age:
+                return self._snapshot_seq
+        return self.get_system_status()['snapshot_id']
+    
+    def get_status_snapshot(self, snapshot_id):
+        """A stored status snapshot, or None once it has aged out"""
+        with self._snapshot_lock:
+            return self.status_snapshots.get(snapshot_id)
     
     def set_auto_mode(self, enabled):
         """Enable or disable automatic mode"""
         self.auto_mode = enabled
+        self._journal('controller', {'auto_mode': enabled})
         print(f"Auto mode: {'enabled' if enabled else 'disabled'}")
 
     def _auto_stop_due_to_timeout(self):
+        self.irrigation_timer = None
+        self._journal('timer', {'name': SAFETY_TIMER, 'deadline': None})
         if self.actuator.is_on():
             self.actuator.turn_off()
             self._log_irrigation_event("TIMEOUT_STOP", "Max irrigation duration reached (safety timeout)")
@@ -192,7 +288,7 @@ class SmartIrrigationController:
         """Unconditionally start irrigation (manual override, idempotent)"""
         if not self.actuator.is_on():
             self.actuator.turn_on()
-            self.last_irrigation = datetime.now()
+            self._set_last_irrigation(datetime.now())
             self._log_irrigation_event("MANUAL_START", reason)
             print(f"Manual irrigation started: {reason}")
         else:
@@ -200,13 +296,7 @@ class SmartIrrigationController:
             self._log_irrigation_event("MANUAL_START", reason + " (already running)")
             print(f"Manual irrigation started: {reason} (already running)")
         # Start max duration safety timer
-        max_duration = self._seasonal_adjust('MAX_IRRIGATION_DURATION_MIN', self.config.MAX_IRRIGATION_DURATION_MIN)
-        if not isinstance(max_duration, (int, float)) or max_duration is None:
-            max_duration = int(self.config.MAX_IRRIGATION_DURATION_MIN)
-        if self.irrigation_timer:
-            self.irrigation_timer.cancel()
-        self.irrigation_timer = threading.Timer(max_duration*60, self._auto_stop_due_to_timeout)
-        self.irrigation_timer.start()
+        self._arm_safety_timer()
         return True
 
     def manual_stop_irrigation(self, reason="Manual stop override"):
@@ -219,6 +309,5 @@ class SmartIrrigationController:
             # Still log and print for clarity
             self._log_irrigation_event("MANUAL_STOP", reason + " (already stopped)")
             print(f"Manual irrigation stopped: {reason} (already stopped)")
-        if self.irrigation_timer:
-            self.irrigation_timer.cancel()
+        self._cancel_safety_timer()
         return True
\ No newline at end of file
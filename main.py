@@ -16,6 +16,8 @@ from datetime import datetime, timedelta
 from sensor.soil_sensor import SoilMoistureSensor
 from sensor.weather_sensor import WeatherSensor
 from actuator.relay_actuator import RelayActuator
+from actuator.relay_bank import get_default_relay_bank
+from actuator.command_queue import ActuatorCommandQueue
 from gesture.gesture_recognizer import GestureRecognizer
 
 import joblib
@@ -330,6 +332,8 @@ try:
     from config.config import Config
     from voice.state_reset_recognizer import StateResetMultiLanguageRecognizer
     from voice.multi_language_processor import MultiLanguageVoiceProcessor
+    from voice.intent_matcher import get_intent_matcher
+    from voice.model_registry import model_registry
     from gesture.gesture_processor import GestureCommandProcessor
     from logic.smart_controller import SmartIrrigationController
     from logic.command_fusion import CommandFusionProcessor
@@ -359,12 +363,18 @@ class ZeroUISmartFarmingSystem:
         
         # Initialize hardware components
         print("🔧 Initializing hardware components...")
-        self.soil_sensor = SoilMoistureSensor()
+        # Every voice, gesture, API and timer command goes through one queue
+        # (deduplicated, switch-interval limited, verified by readback)
+        self.relay_bank = get_default_relay_bank()
+        self.actuator_queue = ActuatorCommandQueue(self.relay_bank)
+        self.relay_actuator = RelayActuator(bank=self.relay_bank, command_queue=self.actuator_queue)
+        self.soil_sensor = SoilMoistureSensor(relay=self.relay_actuator)
         self.weather_sensor = WeatherSensor()
-        self.relay_actuator = RelayActuator()
         
         # Initialize recognition systems
         print("🎤 Initializing voice recognition...")
+        # Load Config.VOICE_MODEL_PRELOAD models before any recognizer needs them
+        model_registry.preload()
         self.voice_recognizer = StateResetMultiLanguageRecognizer()
         
         print("👋 Initializing gesture recognition...")
@@ -405,6 +415,7 @@ class ZeroUISmartFarmingSystem:
         self.running = False
         self.main_thread = None
         self.test_mode = False
+        self._early_restore = None      # (relay on, override) before an unconfirmed early command
         
         # Setup signal handlers
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -432,19 +443,14 @@ class ZeroUISmartFarmingSystem:
             self.logger.log_system_event('STARTUP', 'System initialized successfully')
 
     def handle_command(self, command):
-        command_clean = command.strip().lower()
-        # Core action and object words
-        start_words = ["start", "on", "चालू", "शुरू", "પ્રારંભ", "चालू करो", "चालू करें", "चालू कर", "चालू"]
-        stop_words = ["stop", "off", "बंद", "બંધ", "आपू", "નિલંબિત"]
-        irrigation_words = ["irrigation", "पानी", "પાણી", "सिंचाई", "sichai", "నీరు"]
-
-        # Start if any start_word and any irrigation_word are present
-        if any(sw in command_clean for sw in start_words) and any(iw in command_clean for iw in irrigation_words):
+        match = get_intent_matcher().match(command)
+        if not match:
+            return
+        if match.intent == 'start':
             self.smart_controller.override_active = True
             self.relay_actuator.turn_on()
             print("✅ Manual override: Irrigation started by farmer command or gesture.")
-        # Stop if any stop_word and any irrigation_word are present
-        elif any(sw in command_clean for sw in stop_words) and any(iw in command_clean for iw in irrigation_words):
+        elif match.intent == 'stop':
             self.smart_controller.override_active = False
             self.relay_actuator.turn_off()
             print("✅ Manual override: Irrigation stopped by farmer command or gesture.")
@@ -552,18 +558,48 @@ class ZeroUISmartFarmingSystem:
         try:
             self.voice_recognizer.start_listening()
             print("🎤 Voice recognition active (Hindi, Gujarati, Telugu)")
+            next_eviction = time.monotonic() + Config.VOICE_MODEL_IDLE_EVICT_SEC
             while self.running:
+                if time.monotonic() >= next_eviction:
+                    # Free models no recognizer has used for VOICE_MODEL_IDLE_EVICT_SEC
+                    model_registry.evict_unused()
+                    next_eviction = time.monotonic() + Config.VOICE_MODEL_IDLE_EVICT_SEC
                 command_obj = self.voice_recognizer.get_command()
                 if command_obj:
                     command = command_obj['text']
-                    print(f"🗣️ Recognized command: {command} ({command_obj['language']})")
-                    print(f"DEBUG: Recognized text: '{command}' (language: {command_obj['language']})")
-                    self.handle_command(command)
+                    if command_obj.get('early'):
+                        # Acted on now; remember what to restore if the final result disagrees
+                        self._early_restore = (self.relay_actuator.is_on(), self.smart_controller.override_active)
+                        self.handle_command(command)
+                    elif command_obj.get('early_confirmed'):
+                        # Already acted on when the partial result fired
+                        self._early_restore = None
+                        print(f"✅ Early command confirmed ({command_obj['early_lead_ms']:.0f} ms ahead): {command}")
+                    else:
+                        if command_obj.get('early_emitted'):
+                            self._revert_early_command(command_obj['early_intent'])
+                        print(f"🗣️ Recognized command: {command} ({command_obj['language']})")
+                        print(f"DEBUG: Recognized text: '{command}' (language: {command_obj['language']})")
+                        self.handle_command(command)
                 time.sleep(0.1)
         except Exception as e:
             print(f"❌ Listen error: {e}")
             traceback.print_exc()
 
+    def _revert_early_command(self, intent):
+        """Undo an early start the final recognition result did not confirm"""
+        restore, self._early_restore = self._early_restore, None
+        if restore is None:
+            return
+        was_on, override_active = restore
+        if was_on:
+            # Never re-energize the pump on an ambiguous result; a stop stays a stop
+            print(f"↩️ Early '{intent}' retracted: irrigation left {self.relay_actuator.get_status()}")
+            return
+        self.smart_controller.override_active = override_active
+        self.relay_actuator.turn_off()
+        print(f"↩️ Early '{intent}' retracted: irrigation restored to OFF")
+
     def _gesture_loop(self):
         self.gesture_recognizer.start_detection()
         print("🖐️ Gesture recognition active")
@@ -578,6 +614,7 @@ class ZeroUISmartFarmingSystem:
         self.running = False
         self.voice_recognizer.stop_listening()
         self.gesture_recognizer.stop_detection()
+        self.actuator_queue.stop()
         print("🛑 Stopping Zero-UI Smart Farming System...")
 
     # Add any additional methods for dashboard, multi-farm, analytics, etc. here as needed
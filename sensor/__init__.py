@@ -1,4 +1,5 @@
 from .soil_sensor import SoilMoistureSensor
+from .soil_driver import SimulatedSoilADC, SoilSensorDriver
 from .weather_sensor import WeatherSensor
 
-__all__ = ['SoilMoistureSensor', 'WeatherSensor']
+__all__ = ['SoilMoistureSensor', 'SimulatedSoilADC', 'SoilSensorDriver', 'WeatherSensor']
@@ -0,0 +1,151 @@
+import time
+import numpy as np
+from config.config import Config
+
+
+class SimulatedSoilADC:
+    """Multi-channel soil probe ADC with simple soil water dynamics.
+
+    Each probe's volumetric moisture (%) dries exponentially towards its
+    residual level and, while `relay.is_on()`, wets towards saturation at a
+    much higher rate. Probes differ in rates and in their raw dry/wet counts
+    (capacitive probes read lower counts when wetter). Samples carry Gaussian
+    noise and occasional EMI spikes. `time_scale` speeds the soil clock up
+    for benchmarks (60 = one simulated minute per second).
+    """
+
+    def __init__(self, channels=None, bits=None, relay=None, initial_moisture=45.0, time_scale=1.0,
+                 noise_counts=8.0, spike_probability=0.01, seed=None):
+        self.channels = channels or Config.SOIL_CHANNELS
+        self.bits = bits or Config.SOIL_ADC_BITS
+        self.full_scale = (1 << self.bits) - 1
+        self.relay = relay
+        self.time_scale = time_scale
+        self.noise_counts = noise_counts
+        self.spike_probability = spike_probability
+        self.rng = np.random.default_rng(seed)
+
+        n = self.channels
+        self.moisture = np.full(n, float(initial_moisture)) + self.rng.normal(0, 2.0, n)
+        self.residual = np.full(n, 8.0)
+        self.saturation = np.full(n, 85.0)
+        self.dry_rate = self.rng.uniform(0.03, 0.06, n) / 3600.0     # 1/s towards residual
+        self.wet_rate = self.rng.uniform(1.0, 1.6, n) / 3600.0       # 1/s towards saturation
+        scale = self.full_scale / 4095.0
+        self.dry_counts = self.rng.normal(3000, 60, n) * scale
+        self.wet_counts = self.rng.normal(1300, 40, n) * scale
+        self._last_step = time.monotonic()
+
+    def _step(self):
+        now = time.monotonic()
+        dt = (now - self._last_step) * self.time_scale
+        self._last_step = now
+        if dt <= 0:
+            return
+        self.moisture = self.residual + (self.moisture - self.residual) * np.exp(-self.dry_rate * dt)
+        if self.relay is not None and self.relay.is_on():
+            self.moisture = self.saturation - (self.saturation - self.moisture) * np.exp(-self.wet_rate * dt)
+
+    def read_block(self, samples):
+        """One bulk transaction: (samples, channels) array of raw counts"""
+        self._step()
+        fraction = self.moisture / 100.0
+        ideal = self.dry_counts - (self.dry_counts - self.wet_counts) * fraction
+        raw = ideal + self.rng.normal(0, self.noise_counts, (samples, self.channels))
+        spikes = self.rng.random((samples, self.channels)) < self.spike_probability
+        raw[spikes] = self.rng.choice([0, self.full_scale], spikes.sum())
+        return np.clip(np.rint(raw), 0, self.full_scale).astype(np.uint16)
+
+    def reference_calibration(self):
+        """Exact per-probe curves (what a bench calibration would measure)"""
+        return [{'raw': [float(self.wet_counts[i]), float(self.dry_counts[i])], 'moisture': [100.0, 0.0]}
+                for i in range(self.channels)]
+
+
+class SoilSensorDriver:
+    """Oversampled, filtered, calibrated readings from a multi-channel soil ADC.
+
+    A backend is anything with `channels` and read_block(samples) returning a
+    (samples, channels) array. Each read() is one backend transaction of
+    `oversample` samples per channel; the pipeline is then vectorized over
+    channels:
+
+        median across the oversamples   (drops EMI spikes)
+        per-probe calibration curve     (raw counts -> % moisture)
+        median of the last median_window readings
+        EMA with ema_alpha
+
+    Readings are cached for SOIL_READ_INTERVAL_SEC so a status report that
+    asks several times hits the ADC once.
+    """
+
+    def __init__(self, backend=None, oversample=None, median_window=None, ema_alpha=None,
+                 calibration=None, read_interval=None):
+        self.backend = backend or SimulatedSoilADC()
+        self.channels = self.backend.channels
+        self.oversample = oversample or Config.SOIL_OVERSAMPLE
+        self.median_window = median_window or Config.SOIL_MEDIAN_WINDOW
+        self.ema_alpha = Config.SOIL_EMA_ALPHA if ema_alpha is None else ema_alpha
+        self.read_interval = Config.SOIL_READ_INTERVAL_SEC if read_interval is None else read_interval
+        self.set_calibration(calibration)
+
+        self._history = np.zeros((self.median_window, self.channels))
+        self._count = 0
+        self._ema = None
+        self._last_read = None
+        self.stats = {'transactions': 0, 'samples': 0, 'cached_reads': 0}
+
+    def set_calibration(self, calibration=None):
+        """Per-probe curves [{'raw': [...], 'moisture': [...]}, ...] (one, or one per channel)"""
+        calibration = calibration or Config.SOIL_CALIBRATION
+        if calibration is None and hasattr(self.backend, 'reference_calibration'):
+            calibration = self.backend.reference_calibration()
+        if calibration is None:
+            calibration = [{'raw': [1300.0, 3000.0], 'moisture': [100.0, 0.0]}]
+        if len(calibration) == 1:
+            calibration = calibration * self.channels
+        if len(calibration) != self.channels:
+            raise ValueError(f"Need 1 or {self.channels} calibration curves, got {len(calibration)}")
+        self.curves = []
+        for curve in calibration:
+            raw = np.asarray(curve['raw'], dtype=float)
+            moisture = np.asarray(curve['moisture'], dtype=float)
+            order = np.argsort(raw)
+            self.curves.append((raw[order], moisture[order]))
+        self._linear = all(len(raw) == 2 for raw, _ in self.curves)
+        if self._linear:
+            raw = np.array([c[0] for c in self.curves])
+            moisture = np.array([c[1] for c in self.curves])
+            self._slope = (moisture[:, 1] - moisture[:, 0]) / (raw[:, 1] - raw[:, 0])
+            self._intercept = moisture[:, 0] - self._slope * raw[:, 0]
+
+    def _calibrate(self, raw):
+        if self._linear:
+            return np.clip(raw * self._slope + self._intercept, 0.0, 100.0)
+        return np.array([np.interp(raw[i], xs, ys) for i, (xs, ys) in enumerate(self.curves)])
+
+    def read(self):
+        """Filtered moisture (%) per channel as an array"""
+        now = time.monotonic()
+        if self._last_read is not None and now - self._last_read < self.read_interval:
+            self.stats['cached_reads'] += 1
+            return self._ema.copy()
+        block = self.backend.read_block(self.oversample)
+        self.stats['transactions'] += 1
+        self.stats['samples'] += block.size
+
+        moisture = self._calibrate(np.median(block, axis=0))
+        self._history[self._count % self.median_window] = moisture
+        self._count += 1
+        filtered = np.median(self._history[:min(self._count, self.median_window)], axis=0)
+        if self._ema is None:
+            self._ema = filtered
+        else:
+            self._ema = self._ema + self.ema_alpha * (filtered - self._ema)
+        self._last_read = now
+        return self._ema.copy()
+
+    def reset(self):
+        self._count = 0
+        self._ema = None
+        self._last_read = None
@@ -1,12 +1,28 @@
-import random
+from sensor.soil_driver import SimulatedSoilADC, SoilSensorDriver
+
 
 class SoilMoistureSensor:
-    def __init__(self):
-        print("Soil moisture sensor initialized (simulated)")
+    """Field soil moisture from a SoilSensorDriver (simulated ADC by default).
+
+    `relay` drives the simulated soil's wetting; `channel` selects one probe,
+    otherwise get_value() is the mean over all probes.
+    """
+
+    def __init__(self, driver=None, channel=None, relay=None):
+        self.driver = driver or SoilSensorDriver(SimulatedSoilADC(relay=relay))
+        self.channel = channel
+        source = "simulated" if isinstance(self.driver.backend, SimulatedSoilADC) else "ADC"
+        print(f"Soil moisture sensor initialized ({source}, {self.driver.channels} probes)")
+
+    def get_values(self):
+        """Filtered moisture (%) of every probe"""
+        return [float(value) for value in self.driver.read()]
 
     def get_value(self):
-        # Simulate real-time changing value
-        return random.uniform(20, 80)
+        values = self.driver.read()
+        if self.channel is not None:
+            return float(values[self.channel])
+        return float(values.mean())
 
     def get_status(self):
         value = self.get_value()
@@ -15,4 +31,4 @@ class SoilMoistureSensor:
         elif value > 70:
             return "wet"
         else:
-            return "optimal"
\ No newline at end of file
+            return "optimal"
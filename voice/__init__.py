@@ -1,4 +1,12 @@
 from .voice_recognizer import VoiceRecognizer
 from .voice_processor import VoiceCommandProcessor
+from .model_registry import VoskModelRegistry, model_registry, get_model_registry
+from .audio_source import (AudioSource, AudioRingBuffer, MicrophoneSource, WavFileSource,
+                           PipeSource, SyntheticSource, create_audio_source)
+from .recognition_service import MultiStreamRecognitionService
+from .keyword_spotter import KeywordSpotter, KeywordGatedSource
 
-__all__ = ['VoiceRecognizer', 'VoiceCommandProcessor']
+__all__ = ['VoiceRecognizer', 'VoiceCommandProcessor', 'VoskModelRegistry', 'model_registry', 'get_model_registry',
+           'AudioSource', 'AudioRingBuffer', 'MicrophoneSource', 'WavFileSource',
+           'PipeSource', 'SyntheticSource', 'create_audio_source',
+           'MultiStreamRecognitionService', 'KeywordSpotter', 'KeywordGatedSource']
@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Audio sources for the voice recognizers.
+
+Every source delivers 16-bit mono PCM frames of Config.VOICE_CHUNK_SIZE
+samples as int16 NumPy views. Live sources (microphone, pipe, synthetic)
+write into a preallocated AudioRingBuffer and read() hands out a view of the
+slot rather than a fresh bytes object. A view stays valid until the ring
+wraps around (Config.AUDIO_RING_CAPACITY frames later), so consumers that
+keep audio must copy it. WAV files are loaded once and frames are slices
+of that array.
+
+Backends:
+    MicrophoneSource  - PyAudio input device
+    WavFileSource     - WAV file, paced in real time or as fast as possible
+    PipeSource        - raw PCM from stdin or any binary stream
+    SyntheticSource   - silence, tone or noise for tests and benchmarks
+"""
+import sys
+import threading
+import time
+import wave
+import numpy as np
+from config.config import Config
+
+
+def as_waveform(frame):
+    """Bytes for Vosk's AcceptWaveform, which only takes bytes-like PCM"""
+    return frame.tobytes() if isinstance(frame, np.ndarray) else bytes(frame)
+
+
+class AudioRingBuffer:
+    """Fixed-capacity ring of int16 frames; oldest frames are dropped on overrun"""
+
+    def __init__(self, frame_samples, capacity=None):
+        self.frame_samples = frame_samples
+        self.capacity = capacity or Config.AUDIO_RING_CAPACITY
+        self._frames = np.zeros((self.capacity, frame_samples), dtype=np.int16)
+        self._lengths = np.zeros(self.capacity, dtype=np.int32)
+        self._read_index = 0
+        self._write_index = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped_frames = 0
+
+    def slot(self):
+        """Writable view of the next slot (for readinto-style producers)"""
+        return self._frames[self._write_index % self.capacity]
+
+    def commit(self, length):
+        """Publish the slot returned by slot() holding `length` samples"""
+        with self._cond:
+            self._lengths[self._write_index % self.capacity] = length
+            self._write_index += 1
+            if self._write_index - self._read_index > self.capacity:
+                self._read_index = self._write_index - self.capacity
+                self.dropped_frames += 1
+            self._cond.notify()
+
+    def write(self, data):
+        """Copy PCM (bytes or int16 array) into as many slots as it needs"""
+        samples = np.frombuffer(data, dtype=np.int16) if not isinstance(data, np.ndarray) else data
+        for offset in range(0, len(samples), self.frame_samples):
+            piece = samples[offset:offset + self.frame_samples]
+            self.slot()[:len(piece)] = piece
+            self.commit(len(piece))
+
+    def read(self, timeout=None):
+        """View of the oldest unread frame, or None on timeout/close"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._read_index < self._write_index or self._closed, timeout):
+                return None
+            if self._read_index >= self._write_index:
+                return None
+            index = self._read_index % self.capacity
+            self._read_index += 1
+            return self._frames[index, :self._lengths[index]]
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reopen(self):
+        with self._cond:
+            self._closed = False
+            self._read_index = self._write_index
+
+
+class AudioSource:
+    """Base class: start(), read(timeout) -> int16 frame view or None, stop(), close()"""
+
+    def __init__(self, sample_rate=None, frame_samples=None):
+        self.sample_rate = sample_rate or Config.VOICE_SAMPLE_RATE
+        self.frame_samples = frame_samples or Config.VOICE_CHUNK_SIZE
+        self.exhausted = False
+
+    def start(self):
+        pass
+
+    def read(self, timeout=None):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+    def close(self):
+        self.stop()
+
+    def get_stats(self):
+        return {'exhausted': self.exhausted}
+
+
+class _RingSource(AudioSource):
+    """Shared plumbing for sources that fill a ring buffer from another thread"""
+
+    def __init__(self, sample_rate=None, frame_samples=None, capacity=None):
+        super().__init__(sample_rate, frame_samples)
+        self.ring = AudioRingBuffer(self.frame_samples, capacity)
+
+    def read(self, timeout=None):
+        return self.ring.read(timeout)
+
+    def get_stats(self):
+        return {'exhausted': self.exhausted, 'dropped_frames': self.ring.dropped_frames}
+
+
+class MicrophoneSource(_RingSource):
+    """PyAudio input device; the stream callback copies straight into the ring"""
+
+    def __init__(self, sample_rate=None, frame_samples=None, device_index=None):
+        super().__init__(sample_rate, frame_samples)
+        import pyaudio
+        self._pyaudio = pyaudio
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=device_index,
+            frames_per_buffer=self.frame_samples,
+            stream_callback=self._audio_callback
+        )
+
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        self.ring.write(in_data)
+        return (None, self._pyaudio.paContinue)
+
+    def start(self):
+        self.ring.reopen()
+        self.stream.start_stream()
+
+    def stop(self):
+        if self.stream and self.stream.is_active():
+            self.stream.stop_stream()
+
+    def close(self):
+        self.stop()
+        self.ring.close()
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        self.audio.terminate()
+
+
+class WavFileSource(AudioSource):
+    """16-bit mono WAV file; frames are slices of the loaded samples.
+
+    With realtime=False frames are returned as fast as the consumer reads
+    them, so recorded field audio can be decoded faster than real time.
+    """
+
+    def __init__(self, path, realtime=False, loop=False, frame_samples=None):
+        with wave.open(path, 'rb') as wf:
+            if wf.getnchannels() != 1 or wf.getsampwidth() != 2:
+                raise ValueError(f"{path}: expected 16-bit mono audio")
+            super().__init__(wf.getframerate(), frame_samples)
+            self.samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+        self.duration = len(self.samples) / float(self.sample_rate)
+        self._position = 0
+        self._started_at = None
+
+    def start(self):
+        self._started_at = time.monotonic()
+
+    def read(self, timeout=None):
+        if self._position >= len(self.samples):
+            if not self.loop or not len(self.samples):
+                self.exhausted = True
+                return None
+            self._position = 0
+            self._started_at = time.monotonic()
+        if self.realtime:
+            if self._started_at is None:
+                self.start()
+            due = self._started_at + self._position / float(self.sample_rate)
+            delay = due - time.monotonic()
+            if delay > 0:
+                if timeout is not None and delay > timeout:
+                    time.sleep(timeout)
+                    return None
+                time.sleep(delay)
+        frame = self.samples[self._position:self._position + self.frame_samples]
+        self._position += self.frame_samples
+        return frame
+
+
+class PipeSource(_RingSource):
+    """Raw 16-bit mono PCM from stdin or any binary stream (e.g. arecord | python ...)"""
+
+    def __init__(self, stream=None, sample_rate=None, frame_samples=None):
+        super().__init__(sample_rate, frame_samples)
+        self.stream = stream or sys.stdin.buffer
+        self._thread = None
+        self._running = False
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._reader_loop, daemon=True)
+        self._thread.start()
+
+    def _reader_loop(self):
+        while self._running:
+            slot = self.ring.slot()
+            view = memoryview(slot).cast('B')
+            filled = 0
+            while filled < len(view):
+                count = self.stream.readinto(view[filled:])
+                if not count:
+                    break
+                filled += count
+            if filled >= 2:
+                self.ring.commit(filled // 2)
+            if filled < len(view):
+                self.exhausted = True
+                self.ring.close()
+                break
+
+    def stop(self):
+        self._running = False
+
+
+class SyntheticSource(_RingSource):
+    """Generated audio: 'silence', 'tone' or 'noise', paced or as fast as possible"""
+
+    def __init__(self, kind='tone', frequency=440.0, amplitude=0.3, duration=None,
+                 realtime=False, sample_rate=None, frame_samples=None):
+        super().__init__(sample_rate, frame_samples)
+        self.kind = kind
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.duration = duration
+        self.realtime = realtime
+        self._generated = 0
+        self._rng = np.random.default_rng(0)
+        self._started_at = None
+
+    def start(self):
+        self._started_at = time.monotonic()
+
+    def _fill(self, slot):
+        if self.kind == 'silence':
+            slot[:] = 0
+        elif self.kind == 'noise':
+            slot[:] = (self._rng.standard_normal(len(slot)) * self.amplitude * 32767).clip(-32768, 32767)
+        else:
+            t = (self._generated + np.arange(len(slot))) / float(self.sample_rate)
+            slot[:] = np.sin(2 * np.pi * self.frequency * t) * self.amplitude * 32767
+
+    def read(self, timeout=None):
+        if self.duration is not None and self._generated >= self.duration * self.sample_rate:
+            self.exhausted = True
+            return None
+        if self.realtime:
+            if self._started_at is None:
+                self.start()
+            delay = self._started_at + self._generated / float(self.sample_rate) - time.monotonic()
+            if delay > 0:
+                time.sleep(delay if timeout is None else min(delay, timeout))
+        slot = self.ring.slot()
+        self._fill(slot)
+        self.ring.commit(len(slot))
+        self._generated += len(slot)
+        return self.ring.read(0)
+
+
+def create_audio_source(spec=None):
+    """Build a source from a spec: None/'mic', 'mic:<device index>', 'stdin', 'synthetic', or a .wav path"""
+    if spec is None or spec == 'mic':
+        return MicrophoneSource()
+    if isinstance(spec, AudioSource):
+        return spec
+    if str(spec).startswith('mic:'):
+        return MicrophoneSource(device_index=int(spec.split(':', 1)[1]))
+    if spec == 'stdin':
+        return PipeSource()
+    if spec == 'synthetic':
+        return SyntheticSource()
+    if str(spec).lower().endswith('.wav'):
+        return WavFileSource(spec)
+    raise ValueError(f"Unknown audio source: {spec}")
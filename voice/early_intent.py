@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import deque
+from config.config import Config
+from voice.intent_matcher import get_intent_matcher
+
+
+class EarlyIntentDetector:
+    """Fires safety-critical commands from partial hypotheses.
+
+    Vosk only finalizes an utterance after trailing silence. For intents in
+    Config.EARLY_INTENT_INTENTS the detector runs the intent matcher on each
+    partial hypothesis and emits an early event once the same intent has been
+    seen in Config.EARLY_INTENT_STABLE_PARTIALS consecutive partials of one
+    language. Feed one partial per decoded chunk: an unchanged partial is the
+    decoder holding its hypothesis, so it counts towards the streak. The
+    final result later confirms or retracts the event (the caller reverts a
+    retracted command), and the time between the two is recorded as latency
+    gained.
+    """
+
+    def __init__(self, intents=None, stable_partials=None, matcher=None):
+        self.intents = set(intents if intents is not None else Config.EARLY_INTENT_INTENTS)
+        self.stable_partials = stable_partials or Config.EARLY_INTENT_STABLE_PARTIALS
+        self.matcher = matcher or get_intent_matcher()
+        self._lock = threading.Lock()
+        self._streaks = {}
+        self._emitted = None
+        self.lead_times = deque(maxlen=200)
+        self.stats = {'emitted': 0, 'confirmed': 0, 'retracted': 0}
+
+    def feed_partial(self, language, partial_text, timestamp=None):
+        """Feed one partial hypothesis; returns an early command event or None"""
+        if not partial_text:
+            return None
+        timestamp = timestamp or time.time()
+        with self._lock:
+            if self._emitted:
+                return None
+
+            match = self.matcher.match(partial_text, language)
+            if not match or match.intent not in self.intents:
+                self._streaks.pop(language, None)
+                return None
+
+            intent, count = self._streaks.get(language, (None, 0))
+            count = count + 1 if intent == match.intent else 1
+            self._streaks[language] = (match.intent, count)
+            if count < self.stable_partials:
+                return None
+
+            self._emitted = {
+                'text': partial_text,
+                'language': language,
+                'intent': match.intent,
+                'confidence': match.confidence,
+                'timestamp': timestamp,
+                'early': True
+            }
+            self.stats['emitted'] += 1
+            return dict(self._emitted)
+
+    def finalize(self, language, final_text, timestamp=None):
+        """Close the utterance with its final result.
+
+        Returns confirmation fields to merge into the final command event:
+        whether an early command was emitted, whether the final intent agrees,
+        and how many milliseconds earlier the early command fired.
+        """
+        timestamp = timestamp or time.time()
+        with self._lock:
+            early = self._emitted
+            self._reset_locked()
+        if not early:
+            return {'early_emitted': False}
+
+        match = self.matcher.match(final_text, language)
+        confirmed = bool(match and match.intent == early['intent'])
+        lead_ms = (timestamp - early['timestamp']) * 1000.0
+        with self._lock:
+            if confirmed:
+                self.stats['confirmed'] += 1
+                self.lead_times.append(lead_ms)
+            else:
+                self.stats['retracted'] += 1
+        if not confirmed:
+            print(f"⚠️ Early '{early['intent']}' not confirmed by final result: '{final_text}'")
+        return {
+            'early_emitted': True,
+            'early_intent': early['intent'],
+            'early_confirmed': confirmed,
+            'early_lead_ms': round(lead_ms, 1)
+        }
+
+    def reset(self):
+        with self._lock:
+            self._reset_locked()
+
+    def _reset_locked(self):
+        self._streaks.clear()
+        self._emitted = None
+
+    def get_latency_stats(self):
+        """Latency gained by early commands versus waiting for the final result"""
+        with self._lock:
+            leads = sorted(self.lead_times)
+            stats = dict(self.stats)
+        if leads:
+            stats['mean_lead_ms'] = round(sum(leads) / len(leads), 1)
+            stats['p50_lead_ms'] = round(leads[len(leads) // 2], 1)
+            stats['p90_lead_ms'] = round(leads[min(len(leads) - 1, int(len(leads) * 0.9))], 1)
+        return stats
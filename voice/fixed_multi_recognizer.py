@@ -4,20 +4,20 @@ import queue
 import threading
 import time
 import os
-import pyaudio
 import vosk
 from config.config import Config
+from voice.model_registry import model_registry
+from voice.audio_source import MicrophoneSource, as_waveform
 
 class FixedMultiLanguageRecognizer:
-    def __init__(self):
+    def __init__(self, audio_source=None):
         self.config = Config()
         self.models = {}
         self.recognizers = {}
-        self.audio_queue = queue.Queue()
         self.command_queue = queue.Queue()
         self.is_listening = False
         self.listen_thread = None
-        self.microphone = None
+        self.audio_source = audio_source
         
         # Fixed language detection
         self.languages = []
@@ -38,7 +38,7 @@ class FixedMultiLanguageRecognizer:
             if os.path.exists(model_path):
                 try:
                     print(f"📊 Loading {lang.title()} model...")
-                    self.models[lang] = vosk.Model(model_path)
+                    self.models[lang] = model_registry.acquire(model_path)
                     self.recognizers[lang] = vosk.KaldiRecognizer(
                         self.models[lang], 
                         Config.VOICE_SAMPLE_RATE
@@ -52,34 +52,23 @@ class FixedMultiLanguageRecognizer:
     
     def _initialize_audio(self):
         """Initialize audio"""
+        if self.audio_source is not None:
+            return
         try:
-            self.audio = pyaudio.PyAudio()
-            self.microphone = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=Config.VOICE_SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=Config.VOICE_CHUNK_SIZE,
-                stream_callback=self._audio_callback
-            )
+            self.audio_source = MicrophoneSource()
             print("✅ Fixed multi-language microphone ready")
         except Exception as e:
             print(f"❌ Audio init failed: {e}")
             raise
     
-    def _audio_callback(self, in_data, frame_count, time_info, status):
-        """Audio callback"""
-        self.audio_queue.put(in_data)
-        return (None, pyaudio.paContinue)
-    
     def start_listening(self):
         """Start listening"""
         if self.is_listening:
             return
             
         self.is_listening = True
-        if self.microphone is not None:
-            self.microphone.start_stream()
+        if self.audio_source is not None:
+            self.audio_source.start()
         self.listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
         self.listen_thread.start()
         print("🎤 Fixed multi-language listening started")
@@ -89,53 +78,55 @@ class FixedMultiLanguageRecognizer:
         """Fixed listening loop - no unnecessary switching"""
         while self.is_listening:
             try:
-                if not self.audio_queue.empty():
-                    audio_data = self.audio_queue.get()
-                    
-                    # Try current language first
-                    recognizer = self.recognizers[self.current_language]
+                frame = self.audio_source.read(timeout=0.1)
+                if frame is None:
+                    if self.audio_source.exhausted:
+                        self.is_listening = False
+                    continue
+                audio_data = as_waveform(frame)
+                
+                # Try current language first
+                recognizer = self.recognizers[self.current_language]
+                
+                if recognizer.AcceptWaveform(audio_data):
+                    result = json.loads(recognizer.Result())
+                    text = result.get('text', '').strip()
                     
-                    if recognizer.AcceptWaveform(audio_data):
-                        result = json.loads(recognizer.Result())
-                        text = result.get('text', '').strip()
-                        
-                        if text:
-                            print(f"DEBUG: Recognized text: '{text}' (language: {self.current_language})")
-                            # Check if it's a valid command
-                            if self._is_valid_command(text, self.current_language):
-                                # SUCCESS - stick with this language
-                                print(f"🎯 Heard ({self.current_language}): '{text}'")
+                    if text:
+                        print(f"DEBUG: Recognized text: '{text}' (language: {self.current_language})")
+                        # Check if it's a valid command
+                        if self._is_valid_command(text, self.current_language):
+                            # SUCCESS - stick with this language
+                            print(f"🎯 Heard ({self.current_language}): '{text}'")
+                            self.command_queue.put({
+                                'text': text,
+                                'language': self.current_language,
+                                'timestamp': time.time()
+                            })
+                            self.last_successful_language = self.current_language
+                            self.silence_counter = 0
+                        else:
+                            # Text doesn't match current language commands
+                            # Try other languages
+                            detected_lang = self._detect_language_from_text(text)
+                            if detected_lang and detected_lang != self.current_language:
+                                self._switch_to_language(detected_lang)
+                                print(f"🎯 Heard ({detected_lang}): '{text}'")
                                 self.command_queue.put({
                                     'text': text,
-                                    'language': self.current_language,
+                                    'language': detected_lang,
                                     'timestamp': time.time()
                                 })
-                                self.last_successful_language = self.current_language
-                                self.silence_counter = 0
                             else:
-                                # Text doesn't match current language commands
-                                # Try other languages
-                                detected_lang = self._detect_language_from_text(text)
-                                if detected_lang and detected_lang != self.current_language:
-                                    self._switch_to_language(detected_lang)
-                                    print(f"🎯 Heard ({detected_lang}): '{text}'")
-                                    self.command_queue.put({
-                                        'text': text,
-                                        'language': detected_lang,
-                                        'timestamp': time.time()
-                                    })
-                                else:
-                                    # Unrecognized text - increment counter
-                                    self.silence_counter += 1
-                                    if self.silence_counter >= self.switch_threshold:
-                                        self._try_next_language()
-                    else:
-                        partial_result = recognizer.PartialResult()
-                        partial_text = json.loads(partial_result).get('partial', '')
-                        if partial_text:
-                            print(f"DEBUG: Partial: '{partial_text}' (language: {self.current_language})")
-                
-                time.sleep(0.01)
+                                # Unrecognized text - increment counter
+                                self.silence_counter += 1
+                                if self.silence_counter >= self.switch_threshold:
+                                    self._try_next_language()
+                else:
+                    partial_result = recognizer.PartialResult()
+                    partial_text = json.loads(partial_result).get('partial', '')
+                    if partial_text:
+                        print(f"DEBUG: Partial: '{partial_text}' (language: {self.current_language})")
                 
             except Exception as e:
                 print(f"❌ Listen error: {e}")
@@ -210,12 +201,20 @@ class FixedMultiLanguageRecognizer:
     def stop_listening(self):
         """Stop listening"""
         self.is_listening = False
-        if self.microphone:
-            self.microphone.stop_stream()
+        if self.audio_source:
+            self.audio_source.stop()
         print("🛑 Fixed recognition stopped")
     
     def get_available_languages(self):
         return self.languages
+
+    def release_models(self):
+        """Hand the shared models back to the registry"""
+        for lang in list(self.models):
+            model_registry.release(Config.VOICE_MODEL_PATHS[lang])
+        self.models.clear()
+        self.recognizers.clear()
+        self.languages = []
     
     def get_current_language(self):
         return self.current_language
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+import heapq
+import re
+from collections import Counter, namedtuple
+from itertools import chain
+from config.config import Config
+from voice.intent_matcher import IntentMatch, normalize_text
+
+# One vocabulary item: a full command phrase or a single keyword
+VocabEntry = namedtuple('VocabEntry', ['kind', 'role', 'language', 'text', 'normalized', 'skeleton'])
+
+# Devanagari, Gujarati and Telugu share the ISCII-derived layout, so a letter
+# sits at the same offset inside each Unicode block. One table keyed by
+# offset romanizes all three scripts.
+_INDIC_BLOCKS = (0x0900, 0x0A80, 0x0C00)
+_OFFSET_TO_LATIN = {
+    0x01: 'n', 0x02: 'n', 0x03: 'h',
+    0x05: 'a', 0x06: 'a', 0x07: 'i', 0x08: 'i', 0x09: 'u', 0x0A: 'u', 0x0B: 'ri',
+    0x0E: 'e', 0x0F: 'e', 0x10: 'ai', 0x12: 'o', 0x13: 'o', 0x14: 'au',
+    0x15: 'k', 0x16: 'kh', 0x17: 'g', 0x18: 'gh', 0x19: 'n',
+    0x1A: 'ch', 0x1B: 'ch', 0x1C: 'j', 0x1D: 'jh', 0x1E: 'n',
+    0x1F: 't', 0x20: 'th', 0x21: 'd', 0x22: 'dh', 0x23: 'n',
+    0x24: 't', 0x25: 'th', 0x26: 'd', 0x27: 'dh', 0x28: 'n', 0x29: 'n',
+    0x2A: 'p', 0x2B: 'ph', 0x2C: 'b', 0x2D: 'bh', 0x2E: 'm',
+    0x2F: 'y', 0x30: 'r', 0x31: 'r', 0x32: 'l', 0x33: 'l', 0x34: 'l', 0x35: 'v',
+    0x36: 'sh', 0x37: 'sh', 0x38: 's', 0x39: 'h',
+    0x3E: 'a', 0x3F: 'i', 0x40: 'i', 0x41: 'u', 0x42: 'u', 0x43: 'ri',
+    0x46: 'e', 0x47: 'e', 0x48: 'ai', 0x4A: 'o', 0x4B: 'o', 0x4C: 'au'
+}
+_LATIN_FOLDS = (('aa', 'a'), ('ee', 'i'), ('oo', 'u'), ('w', 'v'), ('z', 'j'), ('q', 'k'), ('y', 'i'))
+_ASPIRATE = re.compile(r'([bcdgjkpst])h')
+_REPEAT = re.compile(r'(.)\1+')
+_TOKEN = re.compile(r'\S+')
+
+
+def romanize(text):
+    """Romanize Devanagari/Gujarati/Telugu text; other characters pass through"""
+    out = []
+    for ch in text:
+        code = ord(ch)
+        for block in _INDIC_BLOCKS:
+            if block <= code < block + 0x80:
+                out.append(_OFFSET_TO_LATIN.get(code - block, ''))
+                break
+        else:
+            out.append(ch)
+    return ''.join(out)
+
+
+def phonetic_skeleton(text):
+    """Script-independent key that ignores matra length, aspiration and the vowel 'a'.
+
+    'नीरू', 'నీరు' and 'neeru' all reduce to 'niru'; 'पानी' and 'paani' to 'pni'.
+    """
+    skeleton = romanize(normalize_text(text))
+    for src, dst in _LATIN_FOLDS:
+        skeleton = skeleton.replace(src, dst)
+    skeleton = _ASPIRATE.sub(r'\1', skeleton)
+    skeleton = skeleton.replace('a', '')
+    skeleton = _REPEAT.sub(r'\1', skeleton)
+    return ''.join(ch for ch in skeleton if ch.isalnum() or ch == ' ')
+
+
+def bounded_edit_distance(a, b, max_distance):
+    """Levenshtein distance capped at max_distance + 1.
+
+    Uses Myers' bit-parallel algorithm, so each call costs one pass over b
+    regardless of the length of a.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if not a or not b:
+        return min(max(len(a), len(b)), max_distance + 1)
+
+    peq = {}
+    for i, ch in enumerate(a):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    mask = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = mask, 0, len(a)
+    for ch in b:
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh = mh << 1
+        pv = (mh | ~(xv | ph)) & mask
+        mv = ph & xv & mask
+    return min(score, max_distance + 1)
+
+
+def _ngrams(text, n):
+    padded = f"^{text}$"
+    return {padded[i:i + n] for i in range(max(1, len(padded) - n + 1))}
+
+
+class FuzzyCommandMatcher:
+    """ASR-error tolerant matcher over the command vocabulary.
+
+    Candidates are shortlisted from a character n-gram inverted index over
+    phonetic skeletons, then verified with bounded edit distance on both the
+    normalized text and the transliteration-independent skeleton. Latin-script
+    words of up to `short_word_length` letters must match exactly or by
+    skeleton: one edit there turns ordinary English into a command word
+    ("later" -> "water").
+    """
+
+    def __init__(self, language_commands=None, intent_keywords=None, ngram_size=3,
+                 max_distance_ratio=0.34, max_candidates=8, short_word_length=5):
+        language_commands = Config.LANGUAGE_COMMANDS if language_commands is None else language_commands
+        intent_keywords = Config.INTENT_KEYWORDS if intent_keywords is None else intent_keywords
+        self.ngram_size = ngram_size
+        self.max_distance_ratio = max_distance_ratio
+        self.max_candidates = max_candidates
+        self.short_word_length = short_word_length
+        self.entries = []
+        self.index = {}
+
+        for language, commands in language_commands.items():
+            for intent, phrases in commands.items():
+                for phrase in phrases:
+                    self.add('phrase', intent, language, phrase)
+        for language, groups in intent_keywords.items():
+            for role, words in groups.items():
+                for word in words:
+                    self.add('keyword', role, language, word)
+
+        self.phrase_lengths = sorted({
+            len(e.normalized.split()) for e in self.entries if e.kind == 'phrase'
+        })
+
+    def add(self, kind, role, language, text):
+        normalized = normalize_text(text)
+        entry = VocabEntry(kind, role, language, text, normalized, phonetic_skeleton(normalized))
+        entry_id = len(self.entries)
+        self.entries.append(entry)
+        index = self.index.setdefault(kind, {})
+        for gram in _ngrams(entry.skeleton, self.ngram_size):
+            index.setdefault(gram, []).append(entry_id)
+
+    def lookup(self, term, kind=None, limit=3):
+        """Closest vocabulary entries to a term as [(entry, distance, confidence)], best first"""
+        normalized = normalize_text(term)
+        skeleton = phonetic_skeleton(normalized)
+        max_distance = max(1, int(len(skeleton) * self.max_distance_ratio))
+
+        # Strings within k edits share at least |grams| - n*k n-grams
+        grams = _ngrams(skeleton, self.ngram_size)
+        min_shared = max(1, len(grams) - self.ngram_size * max_distance)
+        indexes = [self.index.get(kind, {})] if kind else list(self.index.values())
+        shared = Counter(chain.from_iterable(
+            index.get(gram, ()) for index in indexes for gram in grams
+        ))
+
+        # Verify only the best-overlapping candidates of plausible length
+        candidates = heapq.nlargest(self.max_candidates, (
+            entry_id for entry_id, count in shared.items()
+            if count >= min_shared
+            and abs(len(self.entries[entry_id].skeleton) - len(skeleton)) <= max_distance
+        ), key=shared.__getitem__)
+
+        latin = normalized.isascii()
+        results = []
+        for entry_id in candidates:
+            entry = self.entries[entry_id]
+            confidence = 0.0
+            best_distance = None
+            short = latin and min(len(normalized), len(entry.normalized)) <= self.short_word_length
+            for query, target in ((skeleton, entry.skeleton), (normalized, entry.normalized)):
+                if short:
+                    limit_distance = 0
+                else:
+                    limit_distance = max(1, int(max(len(query), len(target)) * self.max_distance_ratio))
+                distance = bounded_edit_distance(query, target, limit_distance)
+                if distance <= limit_distance:
+                    score = 1.0 - distance / max(len(query), len(target), 1)
+                    if score > confidence:
+                        confidence = score
+                        best_distance = distance
+                if confidence == 1.0:
+                    break
+            if best_distance is not None:
+                results.append((entry, best_distance, confidence))
+
+        results.sort(key=lambda r: -r[2])
+        return results[:limit]
+
+    def match(self, text, language=None, min_confidence=None):
+        """Best fuzzy IntentMatch (with confidence) for an utterance, or None"""
+        if min_confidence is None:
+            min_confidence = Config.FUZZY_MATCH_MIN_CONFIDENCE
+        if not text:
+            return None
+        normalized = normalize_text(text)
+        tokens = [(m.start(), m.end()) for m in _TOKEN.finditer(normalized)]
+
+        # Whole phrases against token windows of the same length
+        best = None
+        for size in self.phrase_lengths:
+            for i in range(len(tokens) - size + 1):
+                start, end = tokens[i][0], tokens[i + size - 1][1]
+                for entry, _, confidence in self.lookup(normalized[start:end], kind='phrase', limit=1):
+                    rank = (confidence, entry.language == language)
+                    if confidence >= min_confidence and (best is None or rank > best[0]):
+                        best = (rank, IntentMatch(entry.role, entry.language, (start, end),
+                                                  entry.text, 'phrase', round(confidence, 3)))
+        if best:
+            return best[1]
+
+        # Otherwise an action keyword plus an object keyword, stop winning ties
+        actions = {}
+        object_hit = None
+        for start, end in tokens:
+            for entry, _, confidence in self.lookup(normalized[start:end], kind='keyword', limit=1):
+                if confidence < min_confidence:
+                    continue
+                if entry.role == 'object':
+                    if object_hit is None or confidence > object_hit[2]:
+                        object_hit = (start, end, confidence)
+                elif entry.role not in actions or confidence > actions[entry.role][2]:
+                    actions[entry.role] = (start, end, confidence, entry)
+        if not actions or object_hit is None:
+            return None
+
+        intent = 'stop' if 'stop' in actions else max(actions, key=lambda r: actions[r][2])
+        start, end, confidence, entry = actions[intent]
+        span = (min(start, object_hit[0]), max(end, object_hit[1]))
+        return IntentMatch(intent, language or entry.language, span, entry.text, 'keyword',
+                           round(min(confidence, object_hit[2]), 3))
+
+
+# (utterance, expected intent or None); run with python -m voice.fuzzy_matcher
+SELF_CHECK_CASES = [
+    ("start irigation", "start"),
+    ("stop irrigaton", "stop"),
+    ("paani band", "stop"),
+    ("niru aapu", "stop"),
+    ("पाणी चालू करो", "start"),
+    ("i will start later", None),
+    ("start it later", None),
+    ("start the latter", None),
+    ("ask the waiter to start", None),
+]
+
+
+def run_self_check(matcher=None):
+    """Match SELF_CHECK_CASES; returns the list of failures"""
+    matcher = matcher or FuzzyCommandMatcher()
+    failures = []
+    for text, expected in SELF_CHECK_CASES:
+        match = matcher.match(text)
+        intent = match.intent if match else None
+        status = "✅" if intent == expected else "❌"
+        print(f"{status} {text!r}: {intent} (expected {expected})")
+        if intent != expected:
+            failures.append((text, expected, match))
+    return failures
+
+
+if __name__ == '__main__':
+    raise SystemExit(1 if run_self_check() else 0)
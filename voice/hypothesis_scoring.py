@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Scoring used to pick the best hypothesis when several language models decode the same audio"""
+
+IRRIGATION_KEYWORDS = [
+    'पानी', 'सिंचाई', 'जल',  # Hindi
+    'પાણી', 'સિંચાઈ',        # Gujarati
+    'నీరు', 'ప్రారంభించు', 'ఆపు',  # Telugu
+    'band', 'shuru', 'aapu', 'neeru'
+]
+
+
+def is_irrigation_command(text):
+    text_lower = text.lower()
+    return any(keyword in text_lower for keyword in IRRIGATION_KEYWORDS)
+
+
+def score_hypothesis(text, language):
+    """Confidence score for a final hypothesis decoded by the given language model"""
+    confidence = len(text) * 0.1
+    if is_irrigation_command(text):
+        confidence += 2.0
+    text_lower = text.lower()
+    if language == 'te':
+        if 'neeru aapu' in text_lower or 'నీరు ఆపు' in text:
+            confidence += 5.0
+        elif 'neeru' in text_lower and 'aapu' in text_lower:
+            confidence += 3.0
+        if any(word in text_lower for word in ['neeru', 'aapu', 'నీరు', 'ఆపు']):
+            confidence += 3.0
+        if 'neeru' in text_lower and 'aapu' in text_lower:
+            confidence += 2.0
+    elif language == 'gu':
+        if any(word in text_lower for word in ['neeru', 'aapu']):
+            confidence -= 2.0
+        if any(word in text_lower for word in ['pani', 'band', 'પાણી', 'બંધ']):
+            confidence += 1.5
+    elif language == 'hi':
+        if any(word in text_lower for word in ['neeru', 'aapu']):
+            confidence -= 2.0
+        if any(word in text_lower for word in ['pani', 'band', 'पानी', 'बंद']):
+            confidence += 1.5
+    return confidence
+
+
+def select_best_hypothesis(hypotheses):
+    """Pick (text, language, confidence) with the highest score from (language, text) pairs"""
+    best = (None, None, 0)
+    for language, text in hypotheses:
+        if not text:
+            continue
+        confidence = score_hypothesis(text, language)
+        if confidence > best[2]:
+            best = (text, language, confidence)
+    return best
@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+import threading
+import unicodedata
+from collections import deque, namedtuple
+from config.config import Config
+
+# span is (start, end) in the normalized text; kind is 'phrase' or 'keyword';
+# confidence is 1.0 for exact matches and lower for fuzzy ones
+IntentMatch = namedtuple('IntentMatch', ['intent', 'language', 'span', 'matched', 'kind', 'confidence'],
+                         defaults=(1.0,))
+
+# Voice intents mapped to processor action names
+INTENT_ACTIONS = {
+    'start': 'start_irrigation',
+    'stop': 'stop_irrigation'
+}
+
+
+def normalize_text(text):
+    """NFC-normalize and lowercase so every caller compares the same form"""
+    return unicodedata.normalize('NFC', text).lower()
+
+
+def _is_boundary(text, index):
+    return index < 0 or index >= len(text) or not text[index].isalnum()
+
+
+class AhoCorasick:
+    """Multi-pattern automaton: finds every pattern occurrence in one pass"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self._built = False
+
+    def add(self, pattern, payload):
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(pattern), payload))
+        self._built = False
+
+    def build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+        self._built = True
+
+    def iter_matches(self, text):
+        """Yield (start, end, payload) for every pattern occurrence"""
+        if not self._built:
+            self.build()
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, payload in self._output[state]:
+                yield i + 1 - length, i + 1, payload
+
+
+class IntentMatcher:
+    """Compiled matcher for voice command intents across all languages.
+
+    Built once from Config.LANGUAGE_COMMANDS (full phrases) and
+    Config.INTENT_KEYWORDS (action + object keywords). A single scan of the
+    normalized text returns the intent, the language it was spoken in and the
+    matched span. With fuzzy=True, utterances with no exact match fall back
+    to FuzzyCommandMatcher to tolerate ASR spelling errors.
+    """
+
+    def __init__(self, language_commands=None, intent_keywords=None, fuzzy=False):
+        language_commands = Config.LANGUAGE_COMMANDS if language_commands is None else language_commands
+        intent_keywords = Config.INTENT_KEYWORDS if intent_keywords is None else intent_keywords
+        self.automaton = AhoCorasick()
+        self.intents = set()
+
+        for language, commands in language_commands.items():
+            for intent, phrases in commands.items():
+                self.intents.add(intent)
+                for phrase in phrases:
+                    self.automaton.add(normalize_text(phrase), ('phrase', intent, language, phrase))
+
+        for language, groups in intent_keywords.items():
+            for role, words in groups.items():
+                if role != 'object':
+                    self.intents.add(role)
+                for word in words:
+                    self.automaton.add(normalize_text(word), ('keyword', role, language, word))
+
+        self.automaton.build()
+
+        self.fuzzy_matcher = None
+        if fuzzy:
+            from voice.fuzzy_matcher import FuzzyCommandMatcher
+            self.fuzzy_matcher = FuzzyCommandMatcher(language_commands, intent_keywords)
+
+    def find_all(self, text):
+        """Every phrase/keyword occurrence in the text as (start, end, payload)"""
+        normalized = normalize_text(text)
+        matches = []
+        for start, end, payload in self.automaton.iter_matches(normalized):
+            # Latin keywords such as "on" must be whole words ("irrigation" is not "on")
+            if payload[0] == 'keyword' and payload[3].isascii():
+                if not (_is_boundary(normalized, start - 1) and _is_boundary(normalized, end)):
+                    continue
+            matches.append((start, end, payload))
+        return matches
+
+    def match(self, text, language=None):
+        """Best IntentMatch for the text, or None.
+
+        A full command phrase wins over keywords; among phrases the longest
+        wins, preferring the hinted language. Keyword commands need an action
+        word and an object word; if both start and stop words are present,
+        stop wins.
+        """
+        if not text:
+            return None
+
+        best_phrase = None
+        actions = {}
+        object_span = None
+        for start, end, (kind, role, lang, matched) in self.find_all(text):
+            if kind == 'phrase':
+                rank = (end - start, lang == language)
+                if best_phrase is None or rank > best_phrase[0]:
+                    best_phrase = (rank, IntentMatch(role, lang, (start, end), matched, 'phrase'))
+            elif role == 'object':
+                if object_span is None:
+                    object_span = (start, end)
+            elif role not in actions:
+                actions[role] = (start, end, lang, matched)
+
+        if best_phrase:
+            return best_phrase[1]
+        if object_span is None or not actions:
+            if self.fuzzy_matcher:
+                return self.fuzzy_matcher.match(text, language)
+            return None
+
+        intent = 'stop' if 'stop' in actions else next(iter(actions))
+        start, end, lang, matched = actions[intent]
+        span = (min(start, object_span[0]), max(end, object_span[1]))
+        return IntentMatch(intent, language or lang, span, matched, 'keyword')
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_intent_matcher():
+    """Shared matcher compiled from Config on first use"""
+    global _matcher
+    if _matcher is None:
+        with _matcher_lock:
+            if _matcher is None:
+                _matcher = IntentMatcher(fuzzy=Config.FUZZY_MATCHING_ENABLED)
+    return _matcher
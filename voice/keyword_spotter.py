@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Keyword-spotting front stage for two-stage voice recognition.
+
+KeywordSpotter runs one grammar-restricted Vosk recognizer per language
+over a handful of command words (पानी, પાણી, నీరు, ...), skipping frames
+below an energy floor entirely. KeywordGatedSource wraps any AudioSource:
+while idle it only feeds the spotter and keeps a pre-roll ring; after a hit
+it replays the pre-roll and passes live audio through to the full
+recognizers for Config.KEYWORD_ACTIVE_WINDOW_SEC (extend_window() keeps it
+open while speech is still being decoded).
+"""
+import json
+import os
+import time
+import numpy as np
+from config.config import Config
+from voice.audio_source import AudioSource, AudioRingBuffer, as_waveform
+from voice.intent_matcher import normalize_text
+from voice.model_registry import model_registry
+
+
+def frame_energy_db(frame):
+    """RMS level of an int16 frame in dBFS"""
+    if len(frame) == 0:
+        return -120.0
+    samples = np.asarray(frame, dtype=np.float32) / 32768.0
+    return 10.0 * np.log10(float(np.mean(samples * samples)) + 1e-12)
+
+
+class KeywordSpotter:
+    """Cheap always-on detector for command words"""
+
+    def __init__(self, keywords=None, model_paths=None, energy_floor_db=None):
+        import vosk
+
+        if keywords is None:
+            keywords = Config.KEYWORD_SPOTTER_KEYWORDS or {
+                lang: groups.get('object', []) for lang, groups in Config.INTENT_KEYWORDS.items()
+            }
+        model_paths = Config.KEYWORD_SPOTTER_MODEL_PATHS if model_paths is None else model_paths
+        self.energy_floor_db = Config.KEYWORD_ENERGY_FLOOR_DB if energy_floor_db is None else energy_floor_db
+        self.recognizers = {}
+        self.keyword_sets = {}
+        self.model_paths = {}
+
+        for lang, words in keywords.items():
+            path = model_paths.get(lang)
+            if not words:
+                continue
+            if not path or not os.path.exists(path):
+                print(f"⚠️ No keyword spotter model for {lang} - not spotting: {', '.join(words)}")
+                continue
+            try:
+                model = model_registry.acquire(path)
+                grammar = json.dumps(list(words) + ['[unk]'], ensure_ascii=False)
+                self.recognizers[lang] = vosk.KaldiRecognizer(model, Config.VOICE_SAMPLE_RATE, grammar)
+                self.keyword_sets[lang] = {normalize_text(w) for w in words}
+                self.model_paths[lang] = path
+            except Exception as e:
+                print(f"❌ Keyword spotter for {lang} failed: {e}")
+        if self.recognizers:
+            print(f"👂 Keyword spotter listening for: " +
+                  ', '.join(f"{lang} ({len(words)})" for lang, words in self.keyword_sets.items()))
+
+    def accept(self, frame):
+        """Feed one int16 frame; returns (language, keyword) on a hit, else None"""
+        if frame_energy_db(frame) < self.energy_floor_db:
+            return None
+        audio_data = as_waveform(frame)
+        for lang, recognizer in self.recognizers.items():
+            if recognizer.AcceptWaveform(audio_data):
+                text = json.loads(recognizer.Result()).get('text', '')
+            else:
+                text = json.loads(recognizer.PartialResult()).get('partial', '')
+            for word in normalize_text(text).split():
+                if word in self.keyword_sets[lang]:
+                    recognizer.Reset()
+                    return lang, word
+        return None
+
+    def release(self):
+        for path in self.model_paths.values():
+            model_registry.release(path)
+        self.recognizers.clear()
+        self.model_paths.clear()
+
+
+class KeywordGatedSource(AudioSource):
+    """Passes audio to the full recognizers only around spotted keywords.
+
+    on_close is called (from the reader's thread) when an active window
+    ends, so the recognizer can reset any half-decoded utterance.
+    """
+
+    def __init__(self, source, spotter=None, window_sec=None, preroll_sec=None, on_close=None):
+        self.sample_rate = source.sample_rate
+        self.frame_samples = source.frame_samples
+        self.source = source
+        self.spotter = spotter or KeywordSpotter()
+        if not self.spotter.recognizers:
+            print("⚠️ No keyword spotter models available - passing all audio to full recognition")
+        self.window_sec = window_sec or Config.KEYWORD_ACTIVE_WINDOW_SEC
+        preroll_sec = Config.KEYWORD_PREROLL_SEC if preroll_sec is None else preroll_sec
+        self.preroll = AudioRingBuffer(
+            self.frame_samples,
+            max(1, int(round(preroll_sec * self.sample_rate / self.frame_samples)))
+        )
+        self.on_close = on_close
+        self.active_until = 0.0
+        self._pending = []
+        self._audio_clock = 0.0
+        self._downstream_started = None
+        self.stats = {
+            'hits': 0, 'audio_seconds': 0.0, 'active_seconds': 0.0,
+            'spotter_cpu_seconds': 0.0, 'asr_cpu_seconds': 0.0
+        }
+        self.last_hit = None
+
+    @property
+    def exhausted(self):
+        return self.source.exhausted and not self._pending
+
+    def start(self):
+        self.source.start()
+
+    def stop(self):
+        self.source.stop()
+
+    def close(self):
+        self.source.close()
+        self.spotter.release()
+
+    @property
+    def is_active(self):
+        return self._audio_clock < self.active_until or bool(self._pending)
+
+    def _account_downstream(self):
+        # Time between handing out a frame and the next read() is the full
+        # recognizers' decoding of that frame (same thread)
+        if self._downstream_started is not None:
+            self.stats['asr_cpu_seconds'] += time.thread_time() - self._downstream_started
+            self._downstream_started = None
+
+    def _hand_out(self, frame):
+        self.stats['active_seconds'] += len(frame) / float(self.sample_rate)
+        self._downstream_started = time.thread_time()
+        return frame
+
+    def read(self, timeout=None):
+        self._account_downstream()
+        if self._pending:
+            return self._hand_out(self._pending.pop(0))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            frame = self.source.read(remaining)
+            if frame is None:
+                return None
+            duration = len(frame) / float(self.sample_rate)
+            self._audio_clock += duration
+            self.stats['audio_seconds'] += duration
+
+            if self._audio_clock < self.active_until or not self.spotter.recognizers:
+                return self._hand_out(frame)
+            if self.active_until:
+                self.active_until = 0.0
+                if self.on_close:
+                    self.on_close()
+
+            # Idle: keep pre-roll and look for a keyword
+            self.preroll.write(frame)
+            spot_start = time.thread_time()
+            hit = self.spotter.accept(frame)
+            self.stats['spotter_cpu_seconds'] += time.thread_time() - spot_start
+            if hit:
+                self.stats['hits'] += 1
+                self.last_hit = {'language': hit[0], 'keyword': hit[1], 'timestamp': time.time()}
+                print(f"👂 Keyword '{hit[1]}' ({hit[0]}) - waking full recognition")
+                self.active_until = self._audio_clock + self.window_sec
+                # Pre-roll views stay valid: nothing writes to it while active
+                while True:
+                    buffered = self.preroll.read(0)
+                    if buffered is None:
+                        break
+                    self._pending.append(buffered)
+                return self._hand_out(self._pending.pop(0))
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+
+    def extend_window(self):
+        """Keep the full recognizers awake (e.g. while a command is being confirmed)"""
+        if self.active_until:
+            self.active_until = self._audio_clock + self.window_sec
+
+    def get_duty_cycle_stats(self):
+        """How much audio reached full ASR and CPU seconds per second of audio"""
+        stats = dict(self.stats)
+        audio = stats['audio_seconds']
+        if audio:
+            stats['active_ratio'] = round(stats['active_seconds'] / audio, 3)
+            stats['spotter_cpu_duty'] = round(stats['spotter_cpu_seconds'] / audio, 3)
+            stats['asr_cpu_duty'] = round(stats['asr_cpu_seconds'] / audio, 3)
+            stats['cpu_duty_cycle'] = round((stats['spotter_cpu_seconds'] + stats['asr_cpu_seconds']) / audio, 3)
+        for key in ('audio_seconds', 'active_seconds', 'spotter_cpu_seconds', 'asr_cpu_seconds'):
+            stats[key] = round(stats[key], 2)
+        return stats
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight spoken-language identification on MFCC features.
+
+A diagonal Gaussian per language over frame-level MFCC + delta features
+picks which Vosk model should decode an utterance, so the full decoders
+don't all run on every chunk. Train it from a labelled WAV corpus (the
+offline evaluator's manifest.jsonl with a "language" field):
+
+    python -m voice.language_id <corpus_dir> --output models/language_id.npz
+"""
+import argparse
+import os
+import wave
+import numpy as np
+from config.config import Config
+
+_filterbank_cache = {}
+
+
+def _mel(hz):
+    return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+
+def _mel_to_hz(mel):
+    return 700.0 * (10 ** (mel / 2595.0) - 1.0)
+
+
+def _filterbank(sample_rate, n_fft, n_mels, n_mfcc):
+    key = (sample_rate, n_fft, n_mels, n_mfcc)
+    if key not in _filterbank_cache:
+        mel_points = np.linspace(_mel(0.0), _mel(sample_rate / 2.0), n_mels + 2)
+        bins = np.floor((n_fft + 1) * _mel_to_hz(mel_points) / sample_rate).astype(int)
+        fbank = np.zeros((n_mels, n_fft // 2 + 1))
+        for m in range(1, n_mels + 1):
+            left, center, right = bins[m - 1], bins[m], bins[m + 1]
+            if center > left:
+                fbank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+            if right > center:
+                fbank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+        # DCT-II matrix, orthonormal
+        k = np.arange(n_mfcc)[:, None]
+        n = np.arange(n_mels)[None, :]
+        dct = np.sqrt(2.0 / n_mels) * np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels))
+        dct[0] /= np.sqrt(2.0)
+        _filterbank_cache[key] = (fbank.T, dct.T)
+    return _filterbank_cache[key]
+
+
+def mfcc_features(samples, sample_rate=None, n_mfcc=13, n_mels=26, frame_ms=25, hop_ms=10,
+                  energy_floor_db=None):
+    """MFCC + delta features for voiced frames of int16 (or float) mono audio.
+
+    Returns an (n_frames, 2 * n_mfcc) float array; frames quieter than
+    energy_floor_db (dBFS) are dropped so silence does not vote.
+    """
+    sample_rate = sample_rate or Config.VOICE_SAMPLE_RATE
+    if energy_floor_db is None:
+        energy_floor_db = Config.LANGUAGE_ID_ENERGY_FLOOR_DB
+    samples = np.asarray(samples)
+    signal = samples.astype(np.float32)
+    if np.issubdtype(samples.dtype, np.integer):
+        signal /= 32768.0
+
+    frame_len = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    if len(signal) < frame_len:
+        return np.empty((0, 2 * n_mfcc), dtype=np.float32)
+
+    emphasized = np.append(signal[0], signal[1:] - 0.97 * signal[:-1])
+    n_frames = 1 + (len(emphasized) - frame_len) // hop
+    frames = np.lib.stride_tricks.as_strided(
+        emphasized,
+        shape=(n_frames, frame_len),
+        strides=(emphasized.strides[0] * hop, emphasized.strides[0])
+    ) * np.hamming(frame_len).astype(np.float32)
+
+    energy_db = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+    frames = frames[energy_db > energy_floor_db]
+    if len(frames) == 0:
+        return np.empty((0, 2 * n_mfcc), dtype=np.float32)
+
+    n_fft = 1 << (frame_len - 1).bit_length()
+    power = np.abs(np.fft.rfft(frames, n_fft)) ** 2 / n_fft
+    fbank, dct = _filterbank(sample_rate, n_fft, n_mels, n_mfcc)
+    coeffs = np.log(power @ fbank + 1e-10) @ dct
+    deltas = np.gradient(coeffs, axis=0) if len(coeffs) > 1 else np.zeros_like(coeffs)
+    return np.hstack([coeffs, deltas]).astype(np.float32)
+
+
+class LanguageIdentifier:
+    """Diagonal-Gaussian language classifier with a sticky prior"""
+
+    def __init__(self, languages, means, variances, feature_mean, feature_std):
+        self.languages = list(languages)
+        self.means = np.asarray(means, dtype=np.float32)
+        self.variances = np.asarray(variances, dtype=np.float32)
+        self.feature_mean = np.asarray(feature_mean, dtype=np.float32)
+        self.feature_std = np.asarray(feature_std, dtype=np.float32)
+        self._log_norm = -0.5 * np.sum(np.log(2 * np.pi * self.variances), axis=1)
+        self._inv_var = 1.0 / self.variances
+
+    @classmethod
+    def fit(cls, samples_by_language, sample_rate=None):
+        """Train from {language: [int16 arrays]}"""
+        features = {
+            lang: np.vstack([mfcc_features(s, sample_rate) for s in clips])
+            for lang, clips in samples_by_language.items() if clips
+        }
+        stacked = np.vstack(list(features.values()))
+        feature_mean = stacked.mean(axis=0)
+        feature_std = stacked.std(axis=0) + 1e-6
+        languages = sorted(features)
+        means, variances = [], []
+        for lang in languages:
+            normalized = (features[lang] - feature_mean) / feature_std
+            means.append(normalized.mean(axis=0))
+            variances.append(normalized.var(axis=0) + 1e-3)
+        return cls(languages, means, variances, feature_mean, feature_std)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls([str(l) for l in data['languages']], data['means'], data['variances'],
+                   data['feature_mean'], data['feature_std'])
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez(path, languages=np.array(self.languages), means=self.means, variances=self.variances,
+                 feature_mean=self.feature_mean, feature_std=self.feature_std)
+
+    def frame_log_likelihoods(self, features):
+        """(n_frames, n_languages) log-likelihood of each frame under each language"""
+        x = (features - self.feature_mean) / self.feature_std
+        diff = x[:, None, :] - self.means[None, :, :]
+        return self._log_norm[None, :] - 0.5 * np.sum(diff * diff * self._inv_var[None, :, :], axis=2)
+
+    def posteriors(self, summed_log_likelihood, n_frames, sticky_language=None):
+        """Language posteriors from accumulated per-language log-likelihoods"""
+        if n_frames == 0:
+            logits = np.zeros(len(self.languages))
+        else:
+            logits = summed_log_likelihood / n_frames / Config.LANGUAGE_ID_TEMPERATURE
+        if sticky_language in self.languages and len(self.languages) > 1:
+            sticky = Config.LANGUAGE_ID_STICKY_PRIOR
+            prior = np.full(len(self.languages), (1.0 - sticky) / (len(self.languages) - 1))
+            prior[self.languages.index(sticky_language)] = sticky
+            logits = logits + np.log(prior)
+        logits = logits - logits.max()
+        probs = np.exp(logits)
+        return probs / probs.sum()
+
+
+class UtteranceLanguageTracker:
+    """Accumulates language evidence chunk by chunk for the current utterance"""
+
+    def __init__(self, identifier, sample_rate=None):
+        self.identifier = identifier
+        self.sample_rate = sample_rate or Config.VOICE_SAMPLE_RATE
+        self.reset()
+
+    def reset(self):
+        self.summed = np.zeros(len(self.identifier.languages))
+        self.n_frames = 0
+
+    def update(self, audio_chunk):
+        """Add one chunk of 16-bit PCM (bytes, memoryview or int16 array)"""
+        samples = np.frombuffer(audio_chunk, dtype=np.int16) if not isinstance(audio_chunk, np.ndarray) else audio_chunk
+        features = mfcc_features(samples, self.sample_rate)
+        if len(features):
+            self.summed += self.identifier.frame_log_likelihoods(features).sum(axis=0)
+            self.n_frames += len(features)
+
+    def ranking(self, sticky_language=None):
+        """[(language, probability)] best first"""
+        probs = self.identifier.posteriors(self.summed, self.n_frames, sticky_language)
+        order = np.argsort(-probs)
+        return [(self.identifier.languages[i], float(probs[i])) for i in order]
+
+
+def load_language_identifier(path=None):
+    """The trained identifier from Config.LANGUAGE_ID_MODEL_PATH, or None if absent"""
+    path = path or Config.LANGUAGE_ID_MODEL_PATH
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        identifier = LanguageIdentifier.load(path)
+        print(f"✅ Language ID model loaded ({', '.join(l.title() for l in identifier.languages)})")
+        return identifier
+    except Exception as e:
+        print(f"❌ Failed to load language ID model: {e}")
+        return None
+
+
+def main():
+    from voice.offline_evaluator import load_corpus
+
+    parser = argparse.ArgumentParser(description="Train the spoken-language identifier from a WAV corpus")
+    parser.add_argument('corpus_dir')
+    parser.add_argument('--output', default=Config.LANGUAGE_ID_MODEL_PATH)
+    args = parser.parse_args()
+
+    samples = {}
+    for wav_path, reference in load_corpus(args.corpus_dir):
+        if not reference or 'language' not in reference:
+            continue
+        with wave.open(wav_path, 'rb') as wf:
+            samples.setdefault(reference['language'], []).append(
+                np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+            )
+    identifier = LanguageIdentifier.fit(samples)
+    identifier.save(args.output)
+    print(f"✅ Language ID model trained on {sum(len(v) for v in samples.values())} clips → {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+import os
+import threading
+import time
+import vosk
+from config.config import Config
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+class VoskModelRegistry:
+    """Process-wide cache of Vosk models keyed by model path.
+
+    Every recognizer in a process shares the same loaded model for a path.
+    Models are loaded lazily on first acquire, reference counted, and can be
+    evicted once nothing holds them any more.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._entries = {}
+
+    def _key(self, model_path):
+        return os.path.abspath(model_path)
+
+    def _load_lock(self, key):
+        with self._lock:
+            if key not in self._load_locks:
+                self._load_locks[key] = threading.Lock()
+            return self._load_locks[key]
+
+    def acquire(self, model_path):
+        """Return the shared model for a path, loading it on first use"""
+        key = self._key(model_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                entry['refcount'] += 1
+                entry['last_used'] = time.time()
+                return entry['model']
+
+        # Only one thread loads a given path; others wait and reuse it
+        with self._load_lock(key):
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry:
+                    entry['refcount'] += 1
+                    entry['last_used'] = time.time()
+                    return entry['model']
+            entry = self._load(key)
+            entry['refcount'] = 1
+            with self._lock:
+                self._entries[key] = entry
+            return entry['model']
+
+    def release(self, model_path):
+        """Drop one reference to a model (the model stays cached until evicted)"""
+        key = self._key(model_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return
+            entry['refcount'] = max(0, entry['refcount'] - 1)
+            entry['last_used'] = time.time()
+
+    def preload(self, model_paths=None):
+        """Load models ahead of time without holding a reference to them"""
+        if model_paths is None:
+            model_paths = [Config.VOICE_MODEL_PATHS[lang] for lang in Config.VOICE_MODEL_PRELOAD]
+        loaded = []
+        for model_path in model_paths:
+            if not os.path.exists(model_path):
+                print(f"❌ Cannot preload missing model: {model_path}")
+                continue
+            try:
+                self.acquire(model_path)
+                self.release(model_path)
+                loaded.append(model_path)
+            except Exception as e:
+                print(f"❌ Failed to preload {model_path}: {e}")
+        return loaded
+
+    def evict_unused(self, idle_seconds=None):
+        """Free models nobody references that have been idle long enough"""
+        if idle_seconds is None:
+            idle_seconds = Config.VOICE_MODEL_IDLE_EVICT_SEC
+        now = time.time()
+        evicted = []
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if entry['refcount'] == 0 and now - entry['last_used'] >= idle_seconds:
+                    del self._entries[key]
+                    evicted.append(key)
+        for key in evicted:
+            print(f"🧹 Evicted unused voice model: {os.path.basename(key)}")
+        return evicted
+
+    def is_loaded(self, model_path):
+        with self._lock:
+            return self._key(model_path) in self._entries
+
+    def get_memory_report(self):
+        """Resident memory and usage per loaded model"""
+        with self._lock:
+            models = {
+                key: {
+                    'refcount': entry['refcount'],
+                    'resident_bytes': entry['resident_bytes'],
+                    'resident_mb': round(entry['resident_bytes'] / (1024 * 1024), 1),
+                    'memory_source': entry['memory_source'],
+                    'load_seconds': round(entry['load_seconds'], 3),
+                    'idle_seconds': round(time.time() - entry['last_used'], 1)
+                }
+                for key, entry in self._entries.items()
+            }
+        return {
+            'models': models,
+            'total_resident_mb': round(sum(m['resident_bytes'] for m in models.values()) / (1024 * 1024), 1)
+        }
+
+    def _load(self, key):
+        print(f"📊 Loading voice model {os.path.basename(key)}...")
+        rss_before = self._process_rss()
+        start = time.perf_counter()
+        model = vosk.Model(key)
+        load_seconds = time.perf_counter() - start
+        rss_after = self._process_rss()
+
+        # RSS growth across the load is the model's resident cost. It can be
+        # skewed by concurrent loads, so fall back to the on-disk size.
+        if rss_before is not None and rss_after is not None and rss_after > rss_before:
+            resident_bytes = rss_after - rss_before
+            memory_source = 'rss_delta'
+        else:
+            resident_bytes = self._directory_size(key)
+            memory_source = 'disk_size'
+
+        print(f"✅ Voice model loaded in {load_seconds:.1f}s (~{resident_bytes / (1024 * 1024):.0f} MB)")
+        return {
+            'model': model,
+            'refcount': 0,
+            'resident_bytes': resident_bytes,
+            'memory_source': memory_source,
+            'load_seconds': load_seconds,
+            'last_used': time.time()
+        }
+
+    def _process_rss(self):
+        if psutil is None:
+            return None
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            return None
+
+    def _directory_size(self, path):
+        total = 0
+        for root, _, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+
+# Shared by every recognizer in the process
+model_registry = VoskModelRegistry()
+
+
+def get_model_registry():
+    return model_registry
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 import threading
 from config.config import Config
+from voice.intent_matcher import get_intent_matcher, INTENT_ACTIONS
 
 class MultiLanguageVoiceProcessor:
     def __init__(self, actuator):
@@ -14,18 +15,14 @@ class MultiLanguageVoiceProcessor:
             return None
         
         text = command_data['text']
-        language = command_data['language']
+        language = command_data.get('language')
         
-        # Get language-specific commands
-        commands = Config.LANGUAGE_COMMANDS.get(language, {})
-        
-        # Check each command type
-        for action, phrases in commands.items():
-            for phrase in phrases:
-                if phrase.lower() in text.lower():
-                    return self._execute_action(action, text, language)
+        match = get_intent_matcher().match(text, language)
+        if not match:
+            return None
         
-        return None
+        action = INTENT_ACTIONS.get(match.intent, match.intent)
+        return self._execute_action(action, text, language or match.language)
     
     def _execute_action(self, action, original_command, language):
         """Execute the recognized action"""
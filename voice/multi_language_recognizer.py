@@ -3,20 +3,20 @@ import queue
 import threading
 import time
 import os
-import pyaudio
 import vosk
 from config.config import Config
+from voice.model_registry import model_registry
+from voice.audio_source import MicrophoneSource, as_waveform
 
 class FixedMultiLanguageRecognizer:
-    def __init__(self):
+    def __init__(self, audio_source=None):
         self.config = Config()
         self.models = {}
         self.recognizers = {}
-        self.audio_queue = queue.Queue()
         self.command_queue = queue.Queue()
         self.is_listening = False
         self.listen_thread = None
-        self.microphone = None
+        self.audio_source = audio_source
 
         self.languages = []
         self.current_language = 'hi'
@@ -34,7 +34,7 @@ class FixedMultiLanguageRecognizer:
             if os.path.exists(model_path):
                 try:
                     print(f"📊 Loading {lang.title()} model...")
-                    self.models[lang] = vosk.Model(model_path)
+                    self.models[lang] = model_registry.acquire(model_path)
                     self.recognizers[lang] = vosk.KaldiRecognizer(
                         self.models[lang],
                         Config.VOICE_SAMPLE_RATE
@@ -47,31 +47,21 @@ class FixedMultiLanguageRecognizer:
         print(f"🔊 Starting with: {self.current_language.title()}")
 
     def _initialize_audio(self):
+        if self.audio_source is not None:
+            return
         try:
-            self.audio = pyaudio.PyAudio()
-            self.microphone = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=Config.VOICE_SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=Config.VOICE_CHUNK_SIZE,
-                stream_callback=self._audio_callback
-            )
+            self.audio_source = MicrophoneSource()
             print("✅ Fixed multi-language microphone ready")
         except Exception as e:
             print(f"❌ Audio init failed: {e}")
             raise
 
-    def _audio_callback(self, in_data, frame_count, time_info, status):
-        self.audio_queue.put(in_data)
-        return (None, pyaudio.paContinue)
-
     def start_listening(self):
         if self.is_listening:
             return
         self.is_listening = True
-        if self.microphone is not None:
-            self.microphone.start_stream()
+        if self.audio_source is not None:
+            self.audio_source.start()
         self.listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
         self.listen_thread.start()
         print("🎤 Fixed multi-language listening started")
@@ -80,55 +70,58 @@ class FixedMultiLanguageRecognizer:
     def _listen_loop(self):
         while self.is_listening:
             try:
-                if not self.audio_queue.empty():
-                    audio_data = self.audio_queue.get()
-                    results = []
-                    for lang, recognizer in self.recognizers.items():
-                        rec = recognizer
-                        if rec.AcceptWaveform(audio_data):
-                            result = json.loads(rec.Result())
-                            text = result.get('text', '').strip()
-                            confidence = result.get('confidence', 1.0)
-                            if text:
-                                is_valid = self._is_valid_command(text, lang)
-                                results.append({
-                                    'text': text,
-                                    'language': lang,
-                                    'confidence': confidence,
-                                    'is_valid': is_valid
-                                })
-                                print(f"DEBUG: Recognized text: '{text}' (language: {lang})")
-                        else:
-                            partial_result = rec.PartialResult()
-                            partial_text = json.loads(partial_result).get('partial', '')
-                            if partial_text:
-                                print(f"DEBUG: Partial: '{partial_text}' (language: {lang})")
-                    best = None
-                    for r in results:
-                        if r['language'] == 'te' and r['is_valid']:
-                            best = r
-                            break
-                    if not best:
-                        valid_results = [r for r in results if r['is_valid']]
-                        if valid_results:
-                            best = max(valid_results, key=lambda x: x.get('confidence', 1.0))
-                    if not best and results:
-                        best = results[0]
-                    if best:
-                        print(f"🗣️ Heard ({best['language']}): '{best['text']}' (confidence: {best['confidence']:.2f})")
-                        self.command_queue.put({
-                            'text': best['text'],
-                            'language': best['language'],
-                            'timestamp': time.time()
-                        })
-                        self.last_successful_language = best['language']
-                        self.current_language = best['language']
-                        self.silence_counter = 0
+                frame = self.audio_source.read(timeout=0.1)
+                if frame is None:
+                    if self.audio_source.exhausted:
+                        self.is_listening = False
+                    continue
+                audio_data = as_waveform(frame)
+                results = []
+                for lang, recognizer in self.recognizers.items():
+                    rec = recognizer
+                    if rec.AcceptWaveform(audio_data):
+                        result = json.loads(rec.Result())
+                        text = result.get('text', '').strip()
+                        confidence = result.get('confidence', 1.0)
+                        if text:
+                            is_valid = self._is_valid_command(text, lang)
+                            results.append({
+                                'text': text,
+                                'language': lang,
+                                'confidence': confidence,
+                                'is_valid': is_valid
+                            })
+                            print(f"DEBUG: Recognized text: '{text}' (language: {lang})")
                     else:
-                        self.silence_counter += 1
-                        if self.silence_counter >= self.switch_threshold:
-                            self._try_next_language()
-                time.sleep(0.01)
+                        partial_result = rec.PartialResult()
+                        partial_text = json.loads(partial_result).get('partial', '')
+                        if partial_text:
+                            print(f"DEBUG: Partial: '{partial_text}' (language: {lang})")
+                best = None
+                for r in results:
+                    if r['language'] == 'te' and r['is_valid']:
+                        best = r
+                        break
+                if not best:
+                    valid_results = [r for r in results if r['is_valid']]
+                    if valid_results:
+                        best = max(valid_results, key=lambda x: x.get('confidence', 1.0))
+                if not best and results:
+                    best = results[0]
+                if best:
+                    print(f"🗣️ Heard ({best['language']}): '{best['text']}' (confidence: {best['confidence']:.2f})")
+                    self.command_queue.put({
+                        'text': best['text'],
+                        'language': best['language'],
+                        'timestamp': time.time()
+                    })
+                    self.last_successful_language = best['language']
+                    self.current_language = best['language']
+                    self.silence_counter = 0
+                else:
+                    self.silence_counter += 1
+                    if self.silence_counter >= self.switch_threshold:
+                        self._try_next_language()
             except Exception as e:
                 print(f"❌ Listen error: {e}")
                 time.sleep(0.1)
@@ -174,12 +167,20 @@ class FixedMultiLanguageRecognizer:
 
     def stop_listening(self):
         self.is_listening = False
-        if self.microphone:
-            self.microphone.stop_stream()
+        if self.audio_source:
+            self.audio_source.stop()
         print("🛑 Fixed recognition stopped")
 
     def get_available_languages(self):
         return self.languages
 
+    def release_models(self):
+        """Hand the shared models back to the registry"""
+        for lang in list(self.models):
+            model_registry.release(Config.VOICE_MODEL_PATHS[lang])
+        self.models.clear()
+        self.recognizers.clear()
+        self.languages = []
+
     def get_current_language(self):
         return self.current_language
\ No newline at end of file
@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Offline batch transcription and evaluation over a directory of WAV files.
+
+Runs every file through the same multi-language decoding and hypothesis
+scoring as StateResetMultiLanguageRecognizer, without any audio device, and
+reports word error rate, intent accuracy and real-time factor.
+
+Corpus layout: a directory of 16-bit mono WAV files plus a manifest.jsonl
+with one object per file:
+
+    {"audio": "clip01.wav", "text": "पानी चालू करो", "intent": "start", "language": "hi"}
+
+Files without a manifest entry are still decoded but only count towards RTF.
+
+Usage: python -m voice.offline_evaluator <corpus_dir> [--workers N] [--output report.json]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config.config import Config
+from voice.audio_source import WavFileSource, as_waveform
+from voice.hypothesis_scoring import select_best_hypothesis
+from voice.intent_matcher import get_intent_matcher
+
+MANIFEST_NAME = 'manifest.jsonl'
+
+# Per-process models, loaded once by the pool initializer
+_worker_models = {}
+
+
+def load_corpus(corpus_dir):
+    """List (wav_path, reference) pairs for a corpus directory"""
+    references = {}
+    manifest_path = os.path.join(corpus_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    references[entry['audio']] = entry
+
+    items = []
+    for name in sorted(os.listdir(corpus_dir)):
+        if name.lower().endswith('.wav'):
+            items.append((os.path.join(corpus_dir, name), references.get(name)))
+    return items
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance between two transcripts"""
+    ref = reference.split()
+    hyp = hypothesis.split()
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1], len(ref)
+
+
+def detect_intent(text):
+    """Map a transcript to a command intent ('start'/'stop') across all languages"""
+    match = get_intent_matcher().match(text)
+    return match.intent if match else None
+
+
+def _init_worker(languages):
+    import vosk
+    from voice.model_registry import model_registry
+    vosk.SetLogLevel(-1)
+    for lang in languages:
+        _worker_models[lang] = model_registry.acquire(Config.VOICE_MODEL_PATHS[lang])
+
+
+def decode_file(wav_path):
+    """Decode one WAV file the way the state-reset recognizer decodes live audio"""
+    import vosk
+
+    source = WavFileSource(wav_path, realtime=False)
+    sample_rate = source.sample_rate
+    duration = source.duration
+    recognizers = {
+        lang: vosk.KaldiRecognizer(model, sample_rate)
+        for lang, model in _worker_models.items()
+    }
+
+    segments = []
+    start = time.perf_counter()
+    while True:
+        frame = source.read()
+        if frame is None:
+            break
+        audio_data = as_waveform(frame)
+        finals = []
+        for lang, recognizer in recognizers.items():
+            if recognizer.AcceptWaveform(audio_data):
+                finals.append((lang, json.loads(recognizer.Result()).get('text', '').strip()))
+        text, lang, confidence = select_best_hypothesis(finals)
+        if text:
+            segments.append({'text': text, 'language': lang, 'confidence': confidence})
+            recognizers[lang] = vosk.KaldiRecognizer(_worker_models[lang], sample_rate)
+
+    # Flush whatever is left at end of file
+    finals = [
+        (lang, json.loads(recognizer.FinalResult()).get('text', '').strip())
+        for lang, recognizer in recognizers.items()
+    ]
+    text, lang, confidence = select_best_hypothesis(finals)
+    if text:
+        segments.append({'text': text, 'language': lang, 'confidence': confidence})
+    decode_seconds = time.perf_counter() - start
+
+    return {
+        'audio': os.path.basename(wav_path),
+        'hypothesis': ' '.join(s['text'] for s in segments),
+        'segments': segments,
+        'duration': duration,
+        'decode_seconds': decode_seconds,
+        'rtf': decode_seconds / duration if duration else 0.0
+    }
+
+
+class OfflineEvaluator:
+    def __init__(self, languages=None, workers=None):
+        self.languages = [
+            lang for lang in (languages or Config.SUPPORTED_LANGUAGES)
+            if os.path.exists(Config.VOICE_MODEL_PATHS[lang])
+        ]
+        self.workers = workers or os.cpu_count() or 1
+
+    def transcribe(self, wav_paths):
+        """Decode WAV files across a process pool, preserving input order"""
+        if not self.languages:
+            raise RuntimeError("No voice models available for offline evaluation")
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.languages,)
+        ) as pool:
+            return list(pool.map(decode_file, wav_paths))
+
+    def evaluate(self, corpus_dir):
+        """Transcribe a corpus and score it against its manifest"""
+        corpus = load_corpus(corpus_dir)
+        print(f"🎧 Evaluating {len(corpus)} files with {self.workers} workers "
+              f"({', '.join(l.title() for l in self.languages)})")
+        wall_start = time.perf_counter()
+        results = self.transcribe([path for path, _ in corpus])
+        wall_seconds = time.perf_counter() - wall_start
+
+        total_errors = total_words = 0
+        intent_total = intent_correct = 0
+        per_language = {}
+        for result, (_, reference) in zip(results, corpus):
+            result['predicted_intent'] = detect_intent(result['hypothesis'])
+            if not reference:
+                continue
+            result['reference'] = reference.get('text', '')
+            errors, words = word_errors(result['reference'], result['hypothesis'])
+            result['word_errors'] = errors
+            total_errors += errors
+            total_words += words
+
+            lang_stats = per_language.setdefault(reference.get('language', 'unknown'),
+                                                 {'errors': 0, 'words': 0, 'files': 0})
+            lang_stats['errors'] += errors
+            lang_stats['words'] += words
+            lang_stats['files'] += 1
+
+            if 'intent' in reference:
+                intent_total += 1
+                result['intent_correct'] = result['predicted_intent'] == reference['intent']
+                intent_correct += result['intent_correct']
+
+        audio_seconds = sum(r['duration'] for r in results)
+        decode_seconds = sum(r['decode_seconds'] for r in results)
+        return {
+            'files': len(results),
+            'wer': total_errors / total_words if total_words else None,
+            'intent_accuracy': intent_correct / intent_total if intent_total else None,
+            'audio_seconds': round(audio_seconds, 2),
+            'decode_seconds': round(decode_seconds, 2),
+            'rtf': decode_seconds / audio_seconds if audio_seconds else None,
+            'wall_seconds': round(wall_seconds, 2),
+            'throughput_rtf': wall_seconds / audio_seconds if audio_seconds else None,
+            'per_language_wer': {
+                lang: stats['errors'] / stats['words'] if stats['words'] else None
+                for lang, stats in per_language.items()
+            },
+            'results': results
+        }
+
+
+def _print_report(report):
+    print("=" * 60)
+    print("📊 OFFLINE VOICE EVALUATION")
+    print("=" * 60)
+    print(f"Files: {report['files']}  Audio: {report['audio_seconds']}s  Wall: {report['wall_seconds']}s")
+    if report['wer'] is not None:
+        print(f"WER: {report['wer']:.2%}")
+    if report['intent_accuracy'] is not None:
+        print(f"Intent accuracy: {report['intent_accuracy']:.2%}")
+    if report['rtf'] is not None:
+        print(f"RTF (per worker): {report['rtf']:.3f}  RTF (wall): {report['throughput_rtf']:.3f}")
+    for lang, wer in report['per_language_wer'].items():
+        if wer is not None:
+            print(f"  {lang.title()} WER: {wer:.2%}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline WAV corpus evaluation for the voice recognizers")
+    parser.add_argument('corpus_dir')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--languages', nargs='*', default=None)
+    parser.add_argument('--output', default=None, help="Write the full JSON report here")
+    args = parser.parse_args()
+
+    evaluator = OfflineEvaluator(languages=args.languages, workers=args.workers)
+    report = evaluator.evaluate(args.corpus_dir)
+    _print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Report written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-stream voice recognition across a pool of worker processes.
+
+Each worker process loads the Vosk models once (through the model
+registry, so every stream in that worker shares them) and runs one
+StateResetMultiLanguageRecognizer per assigned stream. Streams are placed
+on the least-loaded worker by their configured weight. Commands come back
+tagged with stream_id, zone and worker_id, ready for CommandFusionProcessor.
+
+Stream specs (Config.VOICE_STREAMS):
+
+    {"stream_id": "pump_house", "zone": "north", "source": "mic:1", "weight": 1.0}
+"""
+import heapq
+import multiprocessing
+import queue
+import time
+from collections import deque
+from config.config import Config
+
+
+def assign_streams(streams, workers):
+    """Greedy least-loaded placement: [[stream spec, ...] per worker]"""
+    workers = max(1, min(workers, len(streams)))
+    loads = [(0.0, worker_id) for worker_id in range(workers)]
+    assignment = [[] for _ in range(workers)]
+    for spec in sorted(streams, key=lambda s: -s.get('weight', 1.0)):
+        load, worker_id = heapq.heappop(loads)
+        assignment[worker_id].append(spec)
+        heapq.heappush(loads, (load + spec.get('weight', 1.0), worker_id))
+    return assignment
+
+
+def _thread_cpu_seconds(thread):
+    """CPU time consumed by one thread (Linux/Unix), or None if unavailable"""
+    try:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+    except (AttributeError, OSError, TypeError):
+        return None
+
+
+def _recognition_worker(worker_id, stream_specs, command_queue, stats_queue, stop_event, stats_interval):
+    """Worker process: run the assigned streams and forward tagged commands"""
+    import vosk
+    from voice.audio_source import create_audio_source
+    from voice.state_reset_recognizer import StateResetMultiLanguageRecognizer
+
+    vosk.SetLogLevel(-1)
+
+    streams = {}
+    for spec in stream_specs:
+        try:
+            recognizer = StateResetMultiLanguageRecognizer(audio_source=create_audio_source(spec.get('source')))
+            recognizer.start_listening()
+            streams[spec['stream_id']] = (spec, recognizer)
+            print(f"🎙️ Worker {worker_id}: stream '{spec['stream_id']}' ({spec.get('zone')}) started")
+        except Exception as e:
+            print(f"❌ Worker {worker_id}: stream '{spec['stream_id']}' failed to start: {e}")
+
+    def report():
+        streams_stats = {}
+        for stream_id, (spec, recognizer) in streams.items():
+            streams_stats[stream_id] = {
+                'zone': spec.get('zone'),
+                'listening': recognizer.is_listening,
+                'cpu_seconds': _thread_cpu_seconds(recognizer.listen_thread),
+                'processing': recognizer.get_processing_stats(),
+                'recognitions': recognizer.get_recognition_count()
+            }
+        stats_queue.put({
+            'worker_id': worker_id,
+            'timestamp': time.time(),
+            'process_cpu_seconds': time.process_time(),
+            'streams': streams_stats
+        })
+
+    last_report = time.monotonic()
+    while not stop_event.is_set():
+        forwarded = False
+        for stream_id, (spec, recognizer) in streams.items():
+            try:
+                command = recognizer.command_queue.get_nowait()
+            except queue.Empty:
+                continue
+            command.update({'stream_id': stream_id, 'zone': spec.get('zone'), 'worker_id': worker_id})
+            command_queue.put(command)
+            forwarded = True
+        if time.monotonic() - last_report >= stats_interval:
+            report()
+            last_report = time.monotonic()
+        if not forwarded:
+            time.sleep(0.02)
+
+    report()
+    for spec, recognizer in streams.values():
+        recognizer.stop_listening()
+        recognizer.release_models()
+
+
+class MultiStreamRecognitionService:
+    """Runs N audio streams across a fixed pool of recognizer processes"""
+
+    def __init__(self, streams=None, workers=None, stats_interval=None):
+        self.streams = list(streams if streams is not None else Config.VOICE_STREAMS)
+        self.workers = workers or Config.RECOGNITION_WORKERS
+        self.stats_interval = stats_interval or Config.RECOGNITION_STATS_INTERVAL_SEC
+        self.assignment = assign_streams(self.streams, self.workers) if self.streams else []
+
+        self.command_queue = multiprocessing.Queue()
+        self.stats_queue = multiprocessing.Queue()
+        self.stop_event = multiprocessing.Event()
+        self.processes = []
+        self.is_running = False
+
+        self.delivery_latency = {spec['stream_id']: deque(maxlen=200) for spec in self.streams}
+        self.command_counts = {spec['stream_id']: 0 for spec in self.streams}
+        self.worker_stats = {}
+        self._previous_cpu = {}
+        self.stream_stats = {}
+
+    def start(self):
+        if self.is_running:
+            return
+        self.stop_event.clear()
+        for worker_id, specs in enumerate(self.assignment):
+            process = multiprocessing.Process(
+                target=_recognition_worker,
+                args=(worker_id, specs, self.command_queue, self.stats_queue, self.stop_event, self.stats_interval),
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+        self.is_running = True
+        print(f"🎤 Recognition service started: {len(self.streams)} streams on {len(self.processes)} workers")
+
+    def get_command(self, timeout=None):
+        """Next tagged command dict from any stream, or None"""
+        self._drain_stats()
+        try:
+            command = self.command_queue.get(timeout=timeout) if timeout else self.command_queue.get_nowait()
+        except queue.Empty:
+            return None
+        stream_id = command.get('stream_id')
+        delivery_ms = (time.time() - command.get('timestamp', time.time())) * 1000.0
+        command['delivery_ms'] = round(delivery_ms, 1)
+        if stream_id in self.delivery_latency:
+            self.delivery_latency[stream_id].append(delivery_ms)
+            self.command_counts[stream_id] += 1
+        return command
+
+    def _drain_stats(self):
+        while True:
+            try:
+                report = self.stats_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.worker_stats[report['worker_id']] = report
+            for stream_id, stats in report['streams'].items():
+                stats = dict(stats)
+                # CPU share of one core since the previous report
+                previous = self._previous_cpu.get(stream_id)
+                if stats['cpu_seconds'] is not None and previous:
+                    elapsed = report['timestamp'] - previous[1]
+                    if elapsed > 0:
+                        stats['cpu_percent'] = round(100.0 * (stats['cpu_seconds'] - previous[0]) / elapsed, 1)
+                if stats['cpu_seconds'] is not None:
+                    self._previous_cpu[stream_id] = (stats['cpu_seconds'], report['timestamp'])
+                stats['worker_id'] = report['worker_id']
+                self.stream_stats[stream_id] = stats
+
+    def get_stream_stats(self):
+        """Per-stream decode latency, delivery latency and CPU for hardware sizing"""
+        self._drain_stats()
+        report = {}
+        for spec in self.streams:
+            stream_id = spec['stream_id']
+            stats = dict(self.stream_stats.get(stream_id, {'zone': spec.get('zone')}))
+            latencies = sorted(self.delivery_latency[stream_id])
+            stats['commands'] = self.command_counts[stream_id]
+            if latencies:
+                stats['delivery_mean_ms'] = round(sum(latencies) / len(latencies), 1)
+                stats['delivery_p95_ms'] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1)
+            report[stream_id] = stats
+        return report
+
+    def get_worker_stats(self):
+        self._drain_stats()
+        return {
+            worker_id: {
+                'streams': [spec['stream_id'] for spec in self.assignment[worker_id]],
+                'process_cpu_seconds': round(stats['process_cpu_seconds'], 2),
+                'alive': self.processes[worker_id].is_alive() if worker_id < len(self.processes) else False
+            }
+            for worker_id, stats in self.worker_stats.items()
+        }
+
+    def stop(self, timeout=5):
+        if not self.is_running:
+            return
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._drain_stats()
+        self.processes = []
+        self.is_running = False
+        print("🛑 Recognition service stopped")
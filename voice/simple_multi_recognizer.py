@@ -4,20 +4,20 @@ import queue
 import threading
 import time
 import os
-import pyaudio
 import vosk
 from config.config import Config
+from voice.model_registry import model_registry
+from voice.audio_source import MicrophoneSource, as_waveform
 
 class SimpleMultiLanguageRecognizer:
-    def __init__(self):
+    def __init__(self, audio_source=None):
         self.config = Config()
         self.models = {}
         self.recognizers = {}
-        self.audio_queue = queue.Queue()
         self.command_queue = queue.Queue()
         self.is_listening = False
         self.listen_thread = None
-        self.microphone = None
+        self.audio_source = audio_source
         
         # Use round-robin approach
         self.languages = []
@@ -35,7 +35,7 @@ class SimpleMultiLanguageRecognizer:
             if os.path.exists(model_path):
                 try:
                     print(f"📊 Loading {lang.title()} model...")
-                    self.models[lang] = vosk.Model(model_path)
+                    self.models[lang] = model_registry.acquire(model_path)
                     self.recognizers[lang] = vosk.KaldiRecognizer(
                         self.models[lang], 
                         Config.VOICE_SAMPLE_RATE
@@ -48,33 +48,22 @@ class SimpleMultiLanguageRecognizer:
     
     def _initialize_audio(self):
         """Initialize audio"""
+        if self.audio_source is not None:
+            return
         try:
-            self.audio = pyaudio.PyAudio()
-            self.microphone = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=Config.VOICE_SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=Config.VOICE_CHUNK_SIZE,
-                stream_callback=self._audio_callback
-            )
+            self.audio_source = MicrophoneSource()
             print("✅ Simple multi-language microphone ready")
         except Exception as e:
             print(f"❌ Audio init failed: {e}")
             raise
     
-    def _audio_callback(self, in_data, frame_count, time_info, status):
-        """Audio callback"""
-        self.audio_queue.put(in_data)
-        return (None, pyaudio.paContinue)
-    
     def start_listening(self):
         """Start listening"""
         if self.is_listening:
             return
         self.is_listening = True
-        if self.microphone is not None:
-            self.microphone.start_stream()
+        if self.audio_source is not None:
+            self.audio_source.start()
         self.listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
         self.listen_thread.start()
         print("Simple multi-language listening started")
@@ -83,38 +72,40 @@ class SimpleMultiLanguageRecognizer:
         """Simple listening loop"""
         while self.is_listening:
             try:
-                if not self.audio_queue.empty():
-                    audio_data = self.audio_queue.get()
-                    
-                    # Try current language
-                    current_lang = self.languages[self.current_index]
-                    recognizer = self.recognizers[current_lang]
-                    
-                    if recognizer.AcceptWaveform(audio_data):
-                        result = json.loads(recognizer.Result())
-                        text = result.get('text', '').strip()
-                        
-                        if text:
-                            print(f"DEBUG: Recognized text: '{text}' (language: {current_lang})")
-                            # Check if it matches commands for this language
-                            if self._matches_language_commands(text, current_lang):
-                                print(f"Heard ({current_lang}): '{text}'")
-                                self.command_queue.put({
-                                    'text': text,
-                                    'language': current_lang,
-                                    'timestamp': time.time()
-                                })
-                            else:
-                                # Try next language
-                                self.current_index = (self.current_index + 1) % len(self.languages)
-                                print(f"🔄 Switching to {self.languages[self.current_index].title()}")
-                    else:
-                        partial_result = recognizer.PartialResult()
-                        partial_text = json.loads(partial_result).get('partial', '')
-                        if partial_text:
-                            print(f"DEBUG: Partial: '{partial_text}' (language: {current_lang})")
+                frame = self.audio_source.read(timeout=0.1)
+                if frame is None:
+                    if self.audio_source.exhausted:
+                        self.is_listening = False
+                    continue
+                audio_data = as_waveform(frame)
                 
-                time.sleep(0.01)
+                # Try current language
+                current_lang = self.languages[self.current_index]
+                recognizer = self.recognizers[current_lang]
+                
+                if recognizer.AcceptWaveform(audio_data):
+                    result = json.loads(recognizer.Result())
+                    text = result.get('text', '').strip()
+                    
+                    if text:
+                        print(f"DEBUG: Recognized text: '{text}' (language: {current_lang})")
+                        # Check if it matches commands for this language
+                        if self._matches_language_commands(text, current_lang):
+                            print(f"Heard ({current_lang}): '{text}'")
+                            self.command_queue.put({
+                                'text': text,
+                                'language': current_lang,
+                                'timestamp': time.time()
+                            })
+                        else:
+                            # Try next language
+                            self.current_index = (self.current_index + 1) % len(self.languages)
+                            print(f"🔄 Switching to {self.languages[self.current_index].title()}")
+                else:
+                    partial_result = recognizer.PartialResult()
+                    partial_text = json.loads(partial_result).get('partial', '')
+                    if partial_text:
+                        print(f"DEBUG: Partial: '{partial_text}' (language: {current_lang})")
                 
             except Exception as e:
                 print(f"❌ Listen error: {e}")
@@ -148,9 +139,17 @@ class SimpleMultiLanguageRecognizer:
     def stop_listening(self):
         """Stop listening"""
         self.is_listening = False
-        if self.microphone:
-            self.microphone.stop_stream()
+        if self.audio_source:
+            self.audio_source.stop()
         print("Simple recognition stopped")
     
     def get_available_languages(self):
         return self.languages
+
+    def release_models(self):
+        """Hand the shared models back to the registry"""
+        for lang in list(self.models):
+            model_registry.release(Config.VOICE_MODEL_PATHS[lang])
+        self.models.clear()
+        self.recognizers.clear()
+        self.languages = []
@@ -5,26 +5,46 @@ import queue
 import threading
 import time
 import os
-import pyaudio
+from collections import deque
 import vosk
 from config.config import Config
+from voice.model_registry import model_registry
+from voice.hypothesis_scoring import score_hypothesis, is_irrigation_command
+from voice.early_intent import EarlyIntentDetector
+from voice.language_id import load_language_identifier, UtteranceLanguageTracker
+from voice.audio_source import MicrophoneSource, as_waveform
 
 class StateResetMultiLanguageRecognizer:
-    def __init__(self):
+    def __init__(self, audio_source=None):
         self.config = Config()
         self.models = {}
         self.recognizers = {}
-        self.audio_queue = queue.Queue()
         self.command_queue = queue.Queue()
         self.is_listening = False
         self.listen_thread = None
-        self.microphone = None
+        self.audio_source = audio_source
 
         # Language management
         self.languages = []
         self.current_language = 'hi'
         self.recognition_count = 0
 
+        # Early commands from partial hypotheses (e.g. "stop" before end of speech)
+        self.early_intent = EarlyIntentDetector() if Config.EARLY_INTENT_ENABLED else None
+
+        # Language-ID gating: decode only the likely language, replaying the
+        # buffered utterance into other decoders when confidence is low
+        self.language_tracker = None
+        self.active_decoders = set()
+        self.utterance_audio = []
+        self.max_utterance_chunks = max(1, int(
+            Config.LANGUAGE_ID_MAX_BUFFER_SEC * Config.VOICE_SAMPLE_RATE / Config.VOICE_CHUNK_SIZE
+        ))
+        self.language_id_stats = {'chunks': 0, 'decoder_runs': 0, 'fallback_activations': 0}
+
+        # Wall-clock seconds spent decoding each chunk, for latency/RTF reporting
+        self.chunk_timings = deque(maxlen=500)
+
         self._initialize_models()
         self._initialize_audio()
 
@@ -35,7 +55,7 @@ class StateResetMultiLanguageRecognizer:
             if os.path.exists(model_path):
                 try:
                     print(f"📊 Loading {lang.title()} model...")
-                    self.models[lang] = vosk.Model(model_path)
+                    self.models[lang] = model_registry.acquire(model_path)
                     self.recognizers[lang] = vosk.KaldiRecognizer(
                         self.models[lang],
                         Config.VOICE_SAMPLE_RATE
@@ -46,25 +66,35 @@ class StateResetMultiLanguageRecognizer:
                     print(f"❌ Failed to load {lang}: {e}")
         print(f"🎯 Languages available: {', '.join([l.title() for l in self.languages])}")
 
+        identifier = load_language_identifier() if len(self.languages) > 1 else None
+        if identifier:
+            self.language_tracker = UtteranceLanguageTracker(identifier)
+            print("🧭 Language ID enabled: decoding the most likely language first")
+
     def _initialize_audio(self):
-        try:
-            self.audio = pyaudio.PyAudio()
-            self.microphone = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=Config.VOICE_SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=Config.VOICE_CHUNK_SIZE,
-                stream_callback=self._audio_callback
-            )
-            print("✅ State-reset microphone ready")
-        except Exception as e:
-            print(f"❌ Audio init failed: {e}")
-            raise
+        if self.audio_source is not None:
+            print(f"✅ State-reset audio source ready ({type(self.audio_source).__name__})")
+        else:
+            try:
+                self.audio_source = MicrophoneSource()
+                print("✅ State-reset microphone ready")
+            except Exception as e:
+                print(f"❌ Audio init failed: {e}")
+                raise
+        if Config.KEYWORD_SPOTTING_ENABLED:
+            from voice.keyword_spotter import KeywordGatedSource
+            self.audio_source = KeywordGatedSource(self.audio_source, on_close=self._on_keyword_window_closed)
+            print("👂 Two-stage mode: full recognition wakes on command words")
 
-    def _audio_callback(self, in_data, frame_count, time_info, status):
-        self.audio_queue.put(in_data)
-        return (None, pyaudio.paContinue)
+    def _on_keyword_window_closed(self):
+        """Drop any half-decoded utterance when the keyword window ends"""
+        if self.early_intent:
+            self.early_intent.reset()
+        if self.language_tracker:
+            self._end_utterance()
+        else:
+            for lang in self.languages:
+                self._reset_recognizer(lang)
 
     def _reset_recognizer(self, language):
         try:
@@ -80,102 +110,174 @@ class StateResetMultiLanguageRecognizer:
         if self.is_listening:
             print("Already listening.")
             return
-        if self.microphone is None:
-            print("❌ Microphone is not initialized. Cannot start listening.")
+        if self.audio_source is None:
+            print("❌ Audio source is not initialized. Cannot start listening.")
             return
         self.is_listening = True
-        try:
-            self.microphone.start_stream()
-        except AttributeError:
-            print("❌ Microphone object does not have 'start_stream' method or is not initialized.")
-            self.is_listening = False
-            return
+        self.audio_source.start()
         self.listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
         self.listen_thread.start()
         print("🎤 State-reset multi-language listening started")
         print("💡 Recognizer will reset after each command for continuous recognition")
 
+    def _select_decoders(self):
+        """Languages whose full decoder should see this chunk.
+
+        With a language-ID model, only the top candidate decodes while it is
+        confident; otherwise (or without a model) every language decodes.
+        """
+        if not self.language_tracker or len(self.languages) < 2:
+            return self.languages, {}
+        ranking = self.language_tracker.ranking(self.current_language)
+        probabilities = dict(ranking)
+        top_language, top_probability = ranking[0]
+        if top_language in self.languages and top_probability >= Config.LANGUAGE_ID_MIN_CONFIDENCE:
+            return [top_language], probabilities
+        return self.languages, probabilities
+
+    def _activate_decoder(self, lang):
+        """Bring a decoder joining mid-utterance up to date with the buffered audio.
+
+        Returns the text of an utterance that finalized during the replay, or ''.
+        """
+        text = ''
+        recognizer = self.recognizers[lang]
+        for buffered in self.utterance_audio[:-1]:
+            if recognizer.AcceptWaveform(buffered):
+                text = json.loads(recognizer.Result()).get('text', '').strip() or text
+        if self.active_decoders:
+            self.language_id_stats['fallback_activations'] += 1
+        self.active_decoders.add(lang)
+        return text
+
+    def _deactivate_decoders(self, decoders):
+        """Drop decoders that stop receiving audio, so rejoining replays the whole utterance"""
+        for lang in self.active_decoders.difference(decoders):
+            self._reset_recognizer(lang)
+            self.active_decoders.discard(lang)
+
+    def _end_utterance(self):
+        for lang in self.active_decoders:
+            self._reset_recognizer(lang)
+        self.active_decoders = set()
+        self.utterance_audio = []
+        if self.language_tracker:
+            self.language_tracker.reset()
+
+    def _emit_command(self, text, language, confidence):
+        print(f"🗣️ Heard ({language}): '{text}' (confidence: {confidence:.2f})")
+        self.current_language = language
+        command = {
+            'text': text,
+            'language': language,
+            'timestamp': time.time()
+        }
+        if self.early_intent:
+            command.update(self.early_intent.finalize(language, text, command['timestamp']))
+        self.command_queue.put(command)
+        self.recognition_count += 1
+        print(f"✅ Command #{self.recognition_count} recognized in {language}")
+        if self.language_tracker:
+            self._end_utterance()
+        else:
+            self._reset_recognizer(language)
+
+    def _finish_source(self):
+        """Flush the last utterance when a finite source (WAV, pipe) runs out"""
+        decoders = self.active_decoders if self.language_tracker else self.languages
+        best = None
+        for lang in decoders:
+            text = json.loads(self.recognizers[lang].FinalResult()).get('text', '').strip()
+            if text:
+                confidence = score_hypothesis(text, lang)
+                if best is None or confidence > best[2]:
+                    best = (text, lang, confidence)
+        if best:
+            self._emit_command(*best)
+        self.is_listening = False
+        print("📁 Audio source exhausted")
+
     def _listen_loop(self):
         while self.is_listening:
             try:
-                if not self.audio_queue.empty():
-                    audio_data = self.audio_queue.get()
-                    best_result = None
-                    best_language = None
-                    best_confidence = 0
-
-                    for lang in self.languages:
-                        recognizer = self.recognizers[lang]
-                        if recognizer.AcceptWaveform(audio_data):
-                            result = json.loads(recognizer.Result())
-                            text = result.get('text', '').strip()
-                            if text:
-                                print(f"DEBUG: Recognized text: '{text}' (language: {lang})")
-                                confidence = len(text) * 0.1
-                                if self._is_irrigation_command(text):
-                                    confidence += 2.0
-                                if lang == 'te':
-                                    text_lower = text.lower()
-                                    if 'neeru aapu' in text_lower or 'నీరు ఆపు' in text:
-                                        confidence += 5.0
-                                    elif 'neeru' in text_lower and 'aapu' in text_lower:
-                                        confidence += 3.0
-                                    if any(word in text_lower for word in ['neeru', 'aapu', 'నీరు', 'ఆపు']):
-                                        confidence += 3.0
-                                    if 'neeru' in text_lower and 'aapu' in text_lower:
-                                        confidence += 2.0
-                                elif lang == 'gu':
-                                    if any(word in text.lower() for word in ['neeru', 'aapu']):
-                                        confidence -= 2.0
-                                    if any(word in text.lower() for word in ['pani', 'band', 'પાણી', 'બંધ']):
-                                        confidence += 1.5
-                                elif lang == 'hi':
-                                    if any(word in text.lower() for word in ['neeru', 'aapu']):
-                                        confidence -= 2.0
-                                    if any(word in text.lower() for word in ['pani', 'band', 'पानी', 'बंद']):
-                                        confidence += 1.5
-                                if confidence > best_confidence:
-                                    best_confidence = confidence
-                                    best_result = text
-                                    best_language = lang
-                        else:
-                            partial_result = recognizer.PartialResult()
-                            partial_text = json.loads(partial_result).get('partial', '')
-                            if partial_text:
-                                print(f"DEBUG: Partial: '{partial_text}' (language: {lang})")
-
-                    if best_result and best_language:
-                        print(f"🗣️ Heard ({best_language}): '{best_result}' (confidence: {best_confidence:.2f})")
-                        self.current_language = best_language
-                        self.command_queue.put({
-                            'text': best_result,
-                            'language': best_language,
-                            'timestamp': time.time()
-                        })
-                        self.recognition_count += 1
-                        print(f"✅ Command #{self.recognition_count} recognized in {best_language}")
-                        self._reset_recognizer(best_language)
+                frame = self.audio_source.read(timeout=0.1)
+                if frame is None:
+                    if self.audio_source.exhausted:
+                        self._finish_source()
+                    continue
+                chunk_start = time.perf_counter()
+                # Vosk takes bytes; the ring-buffer view itself feeds language ID
+                audio_data = as_waveform(frame)
+                best_result = None
+                best_language = None
+                best_confidence = 0
+                utterance_ended = False
+
+                if self.language_tracker:
+                    self.language_tracker.update(frame)
+                    self.utterance_audio.append(audio_data)
+                    if len(self.utterance_audio) > self.max_utterance_chunks:
+                        self.utterance_audio.pop(0)
+                decoders, language_probabilities = self._select_decoders()
+                self.language_id_stats['chunks'] += 1
+                self.language_id_stats['decoder_runs'] += len(decoders)
+                if self.language_tracker:
+                    self._deactivate_decoders(decoders)
+
+                for lang in decoders:
+                    replayed = ''
+                    if self.language_tracker and lang not in self.active_decoders:
+                        replayed = self._activate_decoder(lang)
+                    recognizer = self.recognizers[lang]
+                    finalized = recognizer.AcceptWaveform(audio_data)
+                    if finalized or replayed:
+                        # An utterance that finalized while catching up counts too
+                        utterance_ended = True
+                        text = json.loads(recognizer.Result()).get('text', '').strip() if finalized else ''
+                        text = text or replayed
+                        if text:
+                            print(f"DEBUG: Recognized text: '{text}' (language: {lang})")
+                            confidence = score_hypothesis(text, lang)
+                            confidence += Config.LANGUAGE_ID_SCORE_WEIGHT * language_probabilities.get(lang, 0.0)
+                            if confidence > best_confidence:
+                                best_confidence = confidence
+                                best_result = text
+                                best_language = lang
                     else:
-                        current_recognizer = self.recognizers[self.current_language]
-                        partial_result = json.loads(current_recognizer.PartialResult())
-                        partial_text = partial_result.get('partial', '')
+                        partial_result = recognizer.PartialResult()
+                        partial_text = json.loads(partial_result).get('partial', '')
                         if partial_text:
-                            print(f"🔊 Listening... '{partial_text}'")
-                time.sleep(0.01)
+                            print(f"DEBUG: Partial: '{partial_text}' (language: {lang})")
+                            if hasattr(self.audio_source, 'extend_window'):
+                                self.audio_source.extend_window()
+                            if self.early_intent:
+                                early_command = self.early_intent.feed_partial(lang, partial_text)
+                                if early_command:
+                                    print(f"⚡ Early {early_command['intent']} ({lang}): '{partial_text}'")
+                                    self.command_queue.put(early_command)
+
+                if best_result and best_language:
+                    self._emit_command(best_result, best_language, best_confidence)
+                else:
+                    if utterance_ended:
+                        # Silence or noise finalized with no text
+                        if self.early_intent:
+                            self.early_intent.reset()
+                        if self.language_tracker:
+                            self._end_utterance()
+                    current_recognizer = self.recognizers[self.current_language]
+                    partial_result = json.loads(current_recognizer.PartialResult())
+                    partial_text = partial_result.get('partial', '')
+                    if partial_text:
+                        print(f"🔊 Listening... '{partial_text}'")
+                self.chunk_timings.append(time.perf_counter() - chunk_start)
             except Exception as e:
                 print(f"❌ Listen error: {e}")
                 self._reset_recognizer(self.current_language)
                 time.sleep(0.1)
 
     def _is_irrigation_command(self, text):
-        text_lower = text.lower()
-        irrigation_keywords = [
-            'पानी', 'सिंचाई', 'जल',  # Hindi
-            'પાણી', 'સિંચાઈ',        # Gujarati
-            'నీరు', 'ప్రారంభించు', 'ఆపు',  # Telugu
-            'band', 'shuru', 'aapu', 'neeru'
-        ]
-        return any(keyword in text_lower for keyword in irrigation_keywords)
+        return is_irrigation_command(text)
 
     def get_command(self):
         try:
@@ -185,18 +287,54 @@ class StateResetMultiLanguageRecognizer:
 
     def stop_listening(self):
         self.is_listening = False
-        if self.microphone:
-            self.microphone.stop_stream()
-            self.microphone.close()
-        if hasattr(self, 'audio'):
-            self.audio.terminate()
+        if self.audio_source:
+            self.audio_source.close()
         print("🛑 State-reset multi-language listening stopped")
 
     def get_available_languages(self):
         return self.languages
 
+    def release_models(self):
+        """Hand the shared models back to the registry"""
+        for lang in list(self.models):
+            model_registry.release(Config.VOICE_MODEL_PATHS[lang])
+        self.models.clear()
+        self.recognizers.clear()
+        self.languages = []
+
     def get_current_language(self):
         return self.current_language
 
     def get_recognition_count(self):
-        return self.recognition_count
\ No newline at end of file
+        return self.recognition_count
+
+    def get_early_intent_stats(self):
+        """Early-command counts and latency gained versus final results"""
+        return self.early_intent.get_latency_stats() if self.early_intent else {}
+
+    def get_processing_stats(self):
+        """Per-chunk decode time and real-time factor over recent chunks"""
+        timings = sorted(self.chunk_timings)
+        if not timings:
+            return {'chunks': 0}
+        chunk_seconds = Config.VOICE_CHUNK_SIZE / float(Config.VOICE_SAMPLE_RATE)
+        mean = sum(timings) / len(timings)
+        return {
+            'chunks': len(timings),
+            'mean_ms': round(mean * 1000, 2),
+            'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 2),
+            'rtf': round(mean / chunk_seconds, 3)
+        }
+
+    def get_keyword_spotting_stats(self):
+        """Two-stage duty cycle (empty when keyword spotting is off)"""
+        if hasattr(self.audio_source, 'get_duty_cycle_stats'):
+            return self.audio_source.get_duty_cycle_stats()
+        return {}
+
+    def get_language_id_stats(self):
+        """Average full decoders run per chunk (1.0 is ideal, N languages is no gating)"""
+        stats = dict(self.language_id_stats)
+        stats['enabled'] = self.language_tracker is not None
+        stats['decoders_per_chunk'] = round(stats['decoder_runs'] / stats['chunks'], 2) if stats['chunks'] else 0.0
+        return stats
\ No newline at end of file
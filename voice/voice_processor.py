@@ -1,5 +1,6 @@
 import threading
 from config.config import Config
+from voice.intent_matcher import get_intent_matcher, INTENT_ACTIONS
 
 class VoiceCommandProcessor:
     def __init__(self, actuator):
@@ -12,19 +13,11 @@ class VoiceCommandProcessor:
         if not command_text:
             return None
         
-        command_lower = command_text.lower()
-        
-        # Check each command type
-        for phrase in self.config.VOICE_COMMANDS:
-            if phrase.lower() in command_lower:
-                return self._execute_action("start_irrigation", command_text)  # or the correct action
-        
-        for action, phrases in Config.LANGUAGE_COMMANDS["hi"].items():  # or loop over all languages if needed
-            for phrase in phrases:
-                if phrase.lower() in command_lower:
-                    return self._execute_action(action, command_text)
+        match = get_intent_matcher().match(command_text)
+        if not match:
+            return None
         
-        return None
+        return self._execute_action(INTENT_ACTIONS.get(match.intent, match.intent), command_text)
     
     def _execute_action(self, action, original_command):
         """Execute the recognized action"""
@@ -2,17 +2,17 @@ import json
 import queue
 import threading
 import time
-import pyaudio
 import vosk
 from config.config import Config
+from voice.model_registry import model_registry
+from voice.audio_source import MicrophoneSource, as_waveform
 
 class VoiceRecognizer:
-    def __init__(self):
+    def __init__(self, audio_source=None):
         self.config = Config()
         self.model = None
         self.recognizer = None
-        self.microphone = None
-        self.audio_queue = queue.Queue()
+        self.audio_source = audio_source
         self.command_queue = queue.Queue()
         self.is_listening = False
         self.listen_thread = None
@@ -24,7 +24,7 @@ class VoiceRecognizer:
         """Initialize Vosk speech recognition model"""
         try:
             print("Initializing voice recognition model...")
-            self.model = vosk.Model(self.config.VOICE_MODEL_PATH)
+            self.model = model_registry.acquire(self.config.VOICE_MODEL_PATH)
             self.recognizer = vosk.KaldiRecognizer(self.model, self.config.VOICE_SAMPLE_RATE)
             print("✅ Voice model loaded successfully")
         except Exception as e:
@@ -32,37 +32,26 @@ class VoiceRecognizer:
             raise
     
     def _initialize_audio(self):
-        """Initialize PyAudio for microphone input"""
+        """Use the given audio source, or open the microphone"""
+        if self.audio_source is not None:
+            return
         try:
-            self.audio = pyaudio.PyAudio()
-            self.microphone = self.audio.open(
-                format=pyaudio.paInt16,
-                channels=1,
-                rate=self.config.VOICE_SAMPLE_RATE,
-                input=True,
-                frames_per_buffer=self.config.VOICE_CHUNK_SIZE,
-                stream_callback=self._audio_callback
-            )
+            self.audio_source = MicrophoneSource()
             print("✅ Microphone initialized")
         except Exception as e:
             print(f"❌ Failed to initialize microphone: {e}")
             raise
     
-    def _audio_callback(self, in_data, frame_count, time_info, status):
-        """Callback function for audio stream"""
-        self.audio_queue.put(in_data)
-        return (None, pyaudio.paContinue)
-    
     def start_listening(self):
         """Start voice recognition in background thread"""
         if self.is_listening:
             return
             
         self.is_listening = True
-        if self.microphone is not None:
-            self.microphone.start_stream()
+        if self.audio_source is not None:
+            self.audio_source.start()
         else:
-            print("❌ Microphone is not initialized.")
+            print("❌ Audio source is not initialized.")
         self.listen_thread = threading.Thread(target=self._listen_loop, daemon=True)
         self.listen_thread.start()
         print(" Voice recognition started")
@@ -71,25 +60,34 @@ class VoiceRecognizer:
         """Main listening loop"""
         while self.is_listening:
             try:
-                # Get audio data
-                if not self.audio_queue.empty():
-                    audio_data = self.audio_queue.get()
-                    
-                    # Process with Vosk
-                    if self.recognizer is not None and self.recognizer.AcceptWaveform(audio_data):
-                        result = json.loads(self.recognizer.Result())
-                        text = result.get('text', '').strip()
-                        
-                        if text:
-                            print(f"DEBUG: Recognized text: '{text}'")
-                            self.command_queue.put(text)
+                # Get audio data (blocks briefly instead of polling)
+                frame = self.audio_source.read(timeout=0.1)
+                if frame is None:
+                    if self.audio_source.exhausted:
+                        self._finish_source()
+                    continue
                 
-                time.sleep(0.01)  # Small delay to prevent CPU overload
+                # Process with Vosk
+                if self.recognizer is not None and self.recognizer.AcceptWaveform(as_waveform(frame)):
+                    result = json.loads(self.recognizer.Result())
+                    text = result.get('text', '').strip()
+                    
+                    if text:
+                        print(f"DEBUG: Recognized text: '{text}'")
+                        self.command_queue.put(text)
                 
             except Exception as e:
                 print(f"❌ Voice recognition error: {e}")
                 time.sleep(0.1)
     
+    def _finish_source(self):
+        """Flush the last utterance when a finite source runs out"""
+        if self.recognizer is not None:
+            text = json.loads(self.recognizer.FinalResult()).get('text', '').strip()
+            if text:
+                self.command_queue.put(text)
+        self.is_listening = False
+    
     def get_command(self):
         """Get the latest voice command"""
         try:
@@ -100,14 +98,20 @@ class VoiceRecognizer:
     def stop_listening(self):
         """Stop voice recognition"""
         self.is_listening = False
-        if self.microphone:
-            self.microphone.stop_stream()
+        if self.audio_source:
+            self.audio_source.stop()
         print(" Voice recognition stopped")
     
+    def release_model(self):
+        """Hand the shared model back to the registry"""
+        if self.model is not None:
+            model_registry.release(self.config.VOICE_MODEL_PATH)
+            self.model = None
+            self.recognizer = None
+    
     def __del__(self):
         """Cleanup resources"""
         self.stop_listening()
-        if self.microphone:
-            self.microphone.close()
-        if hasattr(self, 'audio'):
-            self.audio.terminate()
+        self.release_model()
+        if self.audio_source:
+            self.audio_source.close()